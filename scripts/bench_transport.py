@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wolper_google import http  # noqa: E402
+from wolper_google.concurrency import parallel_map  # noqa: E402
+
+
+def bench(url: str, requests: int, workers: int, token: str) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    parallel_map(lambda _: http.fetch(url, headers), range(requests), max_workers=workers)
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time parallel GETs over HTTP/1.1 or HTTP/2")
+    parser.add_argument("url", help="URL to fetch, e.g. a local h2 stub server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--token", default="bench")
+    parser.add_argument("--http2", action="store_true", help="Use the HTTP/2 transport")
+    parser.add_argument(
+        "--prior-knowledge",
+        action="store_true",
+        help="Speak HTTP/2 without TLS/ALPN (h2c stub servers)",
+    )
+    args = parser.parse_args()
+    if args.http2 and not http.enable_http2(
+        max_streams=args.workers,
+        prior_knowledge=args.prior_knowledge,
+    ):
+        print("HTTP/2 unavailable (install httpx[http2])", file=sys.stderr)
+        return 1
+    http.reset_transfer_stats()
+    elapsed = bench(args.url, args.requests, args.workers, args.token)
+    stats = http.transfer_stats()
+    protocol = "HTTP/2" if http.http2_enabled() else "HTTP/1.1"
+    print(
+        f"{protocol}\t{args.requests} requests\t{elapsed:.3f}s\t"
+        f"{args.requests / elapsed:.1f} req/s\t{stats.wire_bytes} wire bytes"
+    )
+    http.disable_http2()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wolper_google.synthetic import FakeGoogleServer, SyntheticCalendar, SyntheticMailbox  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a synthetic mailbox and calendar over the Google REST paths")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--thread-depth", type=int, default=5)
+    parser.add_argument("--attachment-ratio", type=float, default=0.05)
+    parser.add_argument("--attachment-size", type=int, default=256 * 1024)
+    parser.add_argument("--calendars", type=int, default=3)
+    parser.add_argument("--events", type=int, default=1000, help="Events per calendar")
+    parser.add_argument("--recurring-ratio", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    mailbox = SyntheticMailbox.generate(
+        messages=args.messages,
+        thread_depth=args.thread_depth,
+        attachment_ratio=args.attachment_ratio,
+        attachment_size=args.attachment_size,
+        seed=args.seed,
+    )
+    calendar = SyntheticCalendar.generate(
+        calendars=args.calendars,
+        events=args.events,
+        recurring_ratio=args.recurring_ratio,
+        seed=args.seed,
+    )
+    server = FakeGoogleServer(mailbox, calendar, port=args.port, latency=args.latency)
+    bases = server.api_bases
+    print(f"export WOLPER_GOOGLE_GMAIL_API_BASE={bases['gmail']}", flush=True)
+    print(f"export WOLPER_GOOGLE_CALENDAR_API_BASE={bases['calendar']}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import json
+import re
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SPECS = {
+    "gmail": PROJECT_ROOT / "gmail-api-openapi-spec.yaml",
+    "calendar": PROJECT_ROOT / "google-calendar-api-openapi-spec.yaml",
+}
+OUTPUT = PROJECT_ROOT / "wolper_google" / "endpoint_table.py"
+
+# Gmail quota units per method; anything unlisted falls back to DEFAULT_QUOTA_COST.
+QUOTA_COSTS = {
+    "gmail.users.drafts.create": 10,
+    "gmail.users.drafts.delete": 10,
+    "gmail.users.drafts.get": 5,
+    "gmail.users.drafts.list": 5,
+    "gmail.users.drafts.send": 100,
+    "gmail.users.drafts.update": 15,
+    "gmail.users.history.list": 2,
+    "gmail.users.labels.create": 5,
+    "gmail.users.labels.delete": 5,
+    "gmail.users.labels.patch": 5,
+    "gmail.users.labels.update": 5,
+    "gmail.users.messages.attachments.get": 5,
+    "gmail.users.messages.batchDelete": 50,
+    "gmail.users.messages.batchModify": 50,
+    "gmail.users.messages.delete": 10,
+    "gmail.users.messages.get": 5,
+    "gmail.users.messages.import": 25,
+    "gmail.users.messages.insert": 25,
+    "gmail.users.messages.list": 5,
+    "gmail.users.messages.modify": 5,
+    "gmail.users.messages.send": 100,
+    "gmail.users.messages.trash": 5,
+    "gmail.users.messages.untrash": 5,
+    "gmail.users.stop": 50,
+    "gmail.users.threads.delete": 20,
+    "gmail.users.threads.get": 10,
+    "gmail.users.threads.list": 10,
+    "gmail.users.threads.modify": 10,
+    "gmail.users.threads.trash": 10,
+    "gmail.users.threads.untrash": 10,
+    "gmail.users.watch": 100,
+}
+DEFAULT_QUOTA_COST = 1
+
+# Response array key for list operations; the bundled specs carry no response schemas.
+ITEMS_KEYS = {
+    "gmail.users.drafts.list": "drafts",
+    "gmail.users.history.list": "history",
+    "gmail.users.labels.list": "labels",
+    "gmail.users.messages.list": "messages",
+    "gmail.users.settings.filters.list": "filter",
+    "gmail.users.settings.forwardingAddresses.list": "forwardingAddresses",
+    "gmail.users.settings.sendAs.list": "sendAs",
+    "gmail.users.settings.sendAs.smimeInfo.list": "smimeInfo",
+    "gmail.users.threads.list": "threads",
+}
+CALENDAR_ITEMS_KEY = "items"
+
+# Single-resource reads whose response only changes when that resource is edited. Listings,
+# history and the mailbox profile move with every new message, and labels, messages and threads
+# change when any message is labelled, read or added to a thread, so they are never cached.
+CACHEABLE = frozenset(
+    {
+        "calendar.acl.get",
+        "calendar.calendarList.get",
+        "calendar.calendars.get",
+        "calendar.colors.get",
+        "calendar.events.get",
+        "calendar.settings.get",
+        "gmail.users.drafts.get",
+        "gmail.users.messages.attachments.get",
+        "gmail.users.settings.filters.get",
+        "gmail.users.settings.forwardingAddresses.get",
+        "gmail.users.settings.getAutoForwarding",
+        "gmail.users.settings.getImap",
+        "gmail.users.settings.getPop",
+        "gmail.users.settings.getVacation",
+        "gmail.users.settings.sendAs.get",
+        "gmail.users.settings.sendAs.smimeInfo.get",
+    }
+)
+
+MAX_LINE_LENGTH = 100
+
+HEADER = '''# Generated by scripts/generate_endpoint_table.py from the bundled OpenAPI specs.
+# Do not edit by hand; rerun the generator after updating a spec.
+'''
+
+
+def build_table() -> dict[str, dict[str, object]]:
+    table: dict[str, dict[str, object]] = {}
+    for service, spec_path in SPECS.items():
+        spec = yaml.safe_load(spec_path.read_text(encoding="utf-8"))
+        for path, operations in spec["paths"].items():
+            for method, operation in operations.items():
+                if not isinstance(operation, dict) or "operationId" not in operation:
+                    continue
+                name = operation["operationId"]
+                method_name = method.upper()
+                parameters = operation.get("parameters", [])
+                query = tuple(sorted(p["name"] for p in parameters if p.get("in") == "query"))
+                is_list = method_name == "GET" and "pageToken" in query
+                items_key = ITEMS_KEYS.get(name)
+                if items_key is None and service == "calendar" and is_list:
+                    items_key = CALENDAR_ITEMS_KEY
+                table[name] = {
+                    "service": service,
+                    "method": method_name,
+                    "path": path,
+                    "path_params": tuple(re.findall(r"{(\w+)}", path)),
+                    "query_params": query,
+                    "quota_cost": QUOTA_COSTS.get(name, DEFAULT_QUOTA_COST),
+                    "cacheable": method_name == "GET" and name in CACHEABLE,
+                    "paginated": is_list,
+                    "items_key": items_key,
+                }
+    return dict(sorted(table.items()))
+
+
+def render(table: dict[str, dict[str, object]]) -> str:
+    lines = [HEADER, "ENDPOINT_SPECS: dict[str, dict[str, object]] = {"]
+    for name, spec in table.items():
+        lines.append(f"    {json.dumps(name)}: {{")
+        for key, value in spec.items():
+            line = f"        {json.dumps(key)}: {_literal(value)},"
+            if len(line) > MAX_LINE_LENGTH and isinstance(value, tuple):
+                lines.append(f"        {json.dumps(key)}: (")
+                lines.extend(f"            {_literal(item)}," for item in value)
+                lines.append("        ),")
+            else:
+                lines.append(line)
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _literal(value: object) -> str:
+    if isinstance(value, tuple):
+        if len(value) == 1:
+            return f"({_literal(value[0])},)"
+        return "(" + ", ".join(_literal(item) for item in value) + ")"
+    if isinstance(value, str):
+        return json.dumps(value)
+    return repr(value)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate wolper_google/endpoint_table.py")
+    parser.add_argument("--check", action="store_true", help="Fail if the table is out of date")
+    args = parser.parse_args()
+    rendered = render(build_table())
+    if args.check:
+        current = OUTPUT.read_text(encoding="utf-8") if OUTPUT.exists() else ""
+        return 0 if current == rendered else 1
+    OUTPUT.write_text(rendered, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
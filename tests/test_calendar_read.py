@@ -132,3 +132,39 @@ def test_get_setting(monkeypatch) -> None:
 
     assert payload == {"ok": True}
     assert called["url"].endswith("/calendar/v3/users/me/settings/locale")
+
+
+def test_list_events_merged_orders_by_start(monkeypatch) -> None:
+    auth = _auth()
+    pages = {
+        ("work", None): {
+            "items": [{"id": "w1", "start": {"dateTime": "2026-03-02T09:00:00+01:00"}}],
+            "nextPageToken": "w-2",
+        },
+        ("work", "w-2"): {"items": [{"id": "w2", "start": {"dateTime": "2026-03-04T09:00:00Z"}}]},
+        ("home", None): {
+            "items": [
+                {"id": "h1", "start": {"date": "2026-03-01"}},
+                {"id": "h2", "start": {"dateTime": "2026-03-02T08:30:00Z"}},
+            ]
+        },
+    }
+    seen_params: list[dict[str, Any]] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calendar_id = url.split("/calendars/")[1].split("/")[0]
+        seen_params.append(dict(params or {}))
+        return pages[(calendar_id, (params or {}).get("pageToken"))]
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    events = list(calendar.list_events_merged(auth, ["work", "home", "work"], params={"maxResults": "2"}))
+
+    assert [(event["calendarId"], event["id"]) for event in events] == [
+        ("home", "h1"),
+        ("work", "w1"),
+        ("home", "h2"),
+        ("work", "w2"),
+    ]
+    assert len(seen_params) == 3
+    assert all(params["orderBy"] == "startTime" for params in seen_params)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+from wolper_google import http
+from wolper_google.cassette import CassetteMiss, request_key, use_cassette
+from wolper_google.main import main
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.startswith("/missing"):
+            body = b'{"error": "gone"}'
+            self.send_response(404)
+        else:
+            body = b'{"path": "%s"}' % self.path.encode()
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+def _record(tmp_path) -> tuple[str, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    cassette_path = tmp_path / "session.json.gz"
+    try:
+        with use_cassette(cassette_path, mode="record") as cassette:
+            http.get_json(f"{url}/items", "token", params={"b": "2", "a": "1"})
+            with pytest.raises(HTTPError):
+                http.get_json(f"{url}/missing", "token")
+            assert len(cassette) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+    return url, str(cassette_path)
+
+
+def test_replay_serves_recorded_responses_without_network(tmp_path) -> None:
+    url, cassette_path = _record(tmp_path)
+
+    with use_cassette(cassette_path, latency=None):
+        payload = http.get_json(f"{url}/items", "other-token", params={"a": "1", "b": "2"})
+        with pytest.raises(HTTPError) as excinfo:
+            http.get_json(f"{url}/missing", "token")
+        with pytest.raises(CassetteMiss):
+            http.get_json(f"{url}/unknown", "token")
+
+    assert payload == {"path": "/items?b=2&a=1"}
+    assert excinfo.value.code == 404
+
+
+def test_replay_applies_synthetic_latency_within_deadline(tmp_path) -> None:
+    url, cassette_path = _record(tmp_path)
+
+    with use_cassette(cassette_path, latency=0.2):
+        started = time.monotonic()
+        http.get_json(f"{url}/items", "token", params={"a": "1", "b": "2"})
+        assert time.monotonic() - started >= 0.2
+        with pytest.raises(http.DeadlineExceeded):
+            with http.deadline(0.05):
+                http.get_json(f"{url}/items", "token", params={"a": "1", "b": "2"})
+
+
+def test_request_key_ignores_query_order() -> None:
+    assert request_key("get", "https://x/a?b=2&a=1") == request_key("GET", "https://x/a?a=1&b=2")
+
+
+def test_cli_reports_replay_miss(tmp_path, capsys) -> None:
+    _, cassette_path = _record(tmp_path)
+    auth_path = tmp_path / "auth.json"
+    auth_path.write_text(
+        json.dumps(
+            {"access_token": "token", "expires_at": "2026-02-20T16:55:09+00:00", "token_type": "Bearer"}
+        ),
+        encoding="utf-8",
+    )
+
+    argv = ["--replay", cassette_path, "gmail", "profile", "get", "--auth-file", str(auth_path)]
+
+    assert main(argv) == 1
+    assert capsys.readouterr().err == (
+        "replay miss: GET https://gmail.googleapis.com/gmail/v1/users/me/profile\n"
+    )
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from email.message import Message
+from io import BytesIO, StringIO
 import json
+import sys
+import threading
 from typing import Any
+from urllib.error import HTTPError
 
 from wolper_google.auth import AuthConfig
-from wolper_google.main import main
+import pytest
+
+from wolper_google.main import COMMANDS, EXIT_PARTIAL_FAILURE, build_parser, main, run
 
 
 def _auth(tmp_path) -> tuple[AuthConfig, str]:
@@ -89,3 +96,313 @@ def test_cli_gmail_messages_get_raw(monkeypatch, tmp_path, capsys) -> None:
 
     assert exit_code == 0
     assert captured.out.strip() == json.dumps(payload, sort_keys=True)
+
+
+def test_cli_gmail_messages_headers_table(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/messages"):
+            return {"messages": [{"id": "msg_1"}]}
+        return {
+            "id": "msg_1",
+            "payload": {"headers": [{"name": "Subject", "value": "Hello\tthere"}]},
+        }
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(
+        ["gmail", "messages", "headers", "--header", "Subject", "--header", "From", "--auth-file", auth_path]
+    )
+
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert captured.out == "msg_1\tHello there\t\n"
+
+    def missing(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        body = b'{"error": {"code": 404, "message": "Not Found", "errors": [{"reason": "notFound"}]}}'
+        raise HTTPError(url, 404, "Not Found", Message(), BytesIO(body))
+
+    monkeypatch.setattr(http, "get_json", missing)
+
+    argv = ["gmail", "messages", "headers", "--message-id", "nope", "--message-id", "nope2"]
+    assert main([*argv, "--auth-file", auth_path]) == 1
+    assert capsys.readouterr().err.splitlines()[-1] == "2 of 2 failed (0 retryable)"
+
+
+def test_cli_gmail_threads_list_hydrate(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+    calls: list[tuple[str, dict[str, Any] | None]] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append((url, params))
+        if url.endswith("/threads"):
+            return {"threads": [{"id": "t1"}], "resultSizeEstimate": 1}
+        return {"id": "t1", "messages": [{"id": "m1"}]}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(
+        ["gmail", "threads", "list", "--hydrate", "metadata", "--header", "Subject", "--auth-file", auth_path]
+    )
+
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert calls[1][0].endswith("/gmail/v1/users/me/threads/t1")
+    assert calls[1][1] == {"format": "metadata", "metadataHeaders": ["Subject"]}
+    assert json.loads(captured.out) == {
+        "resultSizeEstimate": 1,
+        "threads": [{"id": "t1", "messages": [{"id": "m1"}]}],
+    }
+
+
+def test_cli_gmail_list_counts_fetches_labels_concurrently(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+    label_ids = ["INBOX", "Label_1", "Label_2"]
+    in_flight = threading.Barrier(len(label_ids), timeout=5)
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/labels"):
+            return {"labels": [{"id": label_id, "name": label_id.lower()} for label_id in label_ids]}
+        label_id = url.rsplit("/", 1)[-1]
+        in_flight.wait()
+        return {
+            "id": label_id,
+            "name": label_id.lower(),
+            "messagesTotal": 10,
+            "messagesUnread": 2,
+            "threadsTotal": 7,
+            "threadsUnread": 1,
+        }
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(["gmail", "list", "--counts", "--auth-file", auth_path])
+
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert captured.out.splitlines() == [f"{label_id}\t{label_id.lower()}\t10\t2\t1" for label_id in label_ids]
+
+
+def test_cli_gmail_list_counts_keeps_going_when_a_label_fails(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/labels"):
+            return {"labels": [{"id": "INBOX", "name": "INBOX"}, {"id": "Label_1", "name": "gone"}]}
+        if url.endswith("/Label_1"):
+            body = b'{"error": {"code": 404, "message": "Not Found", "errors": [{"reason": "notFound"}]}}'
+            raise HTTPError(url, 404, "Not Found", Message(), BytesIO(body))
+        return {"id": "INBOX", "name": "INBOX", "messagesTotal": 3, "messagesUnread": 1, "threadsUnread": 1}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(["gmail", "list", "--counts", "--auth-file", auth_path])
+
+    captured = capsys.readouterr()
+
+    assert exit_code == EXIT_PARTIAL_FAILURE
+    assert captured.out == "INBOX\tINBOX\t3\t1\t1\n"
+    assert captured.err.splitlines() == ["Label_1\t404\tnotFound\tNot Found", "1 of 2 failed (0 retryable)"]
+
+
+def test_cli_hydrate_reports_failed_items_and_http_errors(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/threads"):
+            return {"threads": [{"id": "t1"}, {"id": "t2"}]}
+        if url.endswith("/threads/t2") or url.endswith("/profile"):
+            body = b'{"error": {"code": 503, "message": "Backend Error", "errors": [{"reason": "backendError"}]}}'
+            raise HTTPError(url, 503, "Service Unavailable", Message(), BytesIO(body))
+        return {"id": "t1", "messages": []}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    argv = ["gmail", "threads", "list", "--hydrate", "minimal", "--auth-file", auth_path]
+
+    assert main(argv) == EXIT_PARTIAL_FAILURE
+    assert json.loads(capsys.readouterr().out) == {
+        "threads": [
+            {"id": "t1", "messages": []},
+            {
+                "id": "t2",
+                "error": {"status": 503, "reason": "backendError", "message": "Backend Error", "retryable": True},
+            },
+        ],
+        "summary": {"total": 2, "succeeded": 1, "failed": 1, "retryable": 1},
+    }
+    with pytest.raises(HTTPError):
+        run(["gmail", "threads", "list"], auth=_auth(tmp_path)[0], hydrate="minimal", on_error="fail-fast")
+    assert main(["gmail", "profile", "get", "--auth-file", auth_path]) == 1
+    assert capsys.readouterr().err == "HTTP error 503 (backendError): Backend Error\n"
+
+
+def test_every_cli_command_is_registered() -> None:
+    paths = {
+        parser.get_default("command_path")
+        for parser in _walk_parsers(build_parser())
+        if parser.get_default("command_path") is not None
+    }
+
+    assert paths == set(COMMANDS)
+    assert ("gmail", "settings", "smime", "get") in COMMANDS
+
+
+def test_run_returns_payload_without_printing(monkeypatch, tmp_path, capsys) -> None:
+    auth, _ = _auth(tmp_path)
+    called: dict[str, Any] = {}
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        called["url"] = url
+        called["params"] = params
+        return {"items": [{"id": "event_1"}]}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    payload = run(
+        ["calendar", "events", "list"],
+        auth=auth,
+        calendar_id="cal_1",
+        param={"maxResults": "5"},
+    )
+
+    assert payload == {"items": [{"id": "event_1"}]}
+    assert called["url"].endswith("/calendars/cal_1/events")
+    assert called["params"] == {"maxResults": "5"}
+    assert capsys.readouterr().out == ""
+    with pytest.raises(ValueError, match="--calendar-id"):
+        run(["calendar", "events", "list"], auth=auth)
+    with pytest.raises(ValueError, match="Unknown command"):
+        run(["calendar", "nope"], auth=auth)
+
+
+def _walk_parsers(parser):
+    yield parser
+    for action in parser._actions:
+        if hasattr(action, "_name_parser_map"):
+            for subparser in action.choices.values():
+                yield from _walk_parsers(subparser)
+
+
+def test_cli_batch_runs_commands_and_tags_results(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+    batch_path = tmp_path / "batch.txt"
+    batch_path.write_text(
+        "# comment\ngmail labels get --label-id INBOX\ngmail nope\ncalendar get --calendar-id cal_1\n"
+        "gmail labels get --label-id INBOX --sort-keys --timeout=5\n",
+        encoding="utf-8",
+    )
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/calendars/cal_1"):
+            raise ValueError("boom")
+        return {"id": url.rsplit("/", 1)[1]}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(["batch", "--file", str(batch_path), "--auth-file", auth_path])
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_code == EXIT_PARTIAL_FAILURE
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert lines[0]["ok"] is True
+    assert lines[0]["result"] == {"id": "INBOX"}
+    assert lines[1]["error"]["type"] == "UsageError"
+    assert lines[1]["error"]["message"].startswith("argument command: invalid choice: 'nope'")
+    assert lines[2]["error"] == {
+        "type": "ValueError",
+        "status": None,
+        "reason": "ValueError",
+        "message": "boom",
+        "retryable": False,
+    }
+    assert lines[3]["error"] == {
+        "type": "UsageError",
+        "message": "Global flags are not allowed in a batch line: --sort-keys --timeout",
+    }
+
+
+def test_cli_batch_lines_share_one_search_cache_per_path(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+    cache_path = tmp_path / "search.json"
+    queries = [f"subject:q{index}" for index in range(8)]
+    batch_path = tmp_path / "batch.txt"
+    batch_path.write_text(
+        "".join(
+            f"gmail messages list --search-cache {cache_path} --param q={query}\n" for query in queries
+        ),
+        encoding="utf-8",
+    )
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/profile"):
+            return {"emailAddress": "me@example.com", "historyId": "100"}
+        return {"messages": [{"id": params["q"] if params else ""}], "resultSizeEstimate": 1}
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    exit_code = main(["batch", "--file", str(batch_path), "--workers", "8", "--auth-file", auth_path])
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    saved = json.loads(cache_path.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert all(line["ok"] for line in lines)
+    assert len(saved["accounts"]["me@example.com"]["entries"]) == len(queries)
+
+
+def test_cli_passthrough_writes_response_bytes_unchanged(monkeypatch, tmp_path, capsys) -> None:
+    _, auth_path = _auth(tmp_path)
+    body = b'{\n  "id": "msg_1",\n  "raw": "U3ViamVjdDogaGk="\n}'
+
+    from wolper_google import http
+
+    monkeypatch.setattr(http, "fetch", lambda url, headers, timeouts=None: body)
+    argv = ["gmail", "messages", "get", "--message-id", "msg_1", "--auth-file", auth_path]
+
+    assert main(argv) == 0
+    assert capsys.readouterr().out == body.decode() + "\n"
+    assert main([*argv, "--sort-keys"]) == 0
+    assert capsys.readouterr().out == json.dumps({"id": "msg_1", "raw": "U3ViamVjdDogaGk="}, sort_keys=True) + "\n"
+
+
+def test_passthrough_falls_back_to_text_stdout(monkeypatch) -> None:
+    from wolper_google import http
+    from wolper_google.main import _print_json
+
+    stdout = StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    _print_json(http.RawJSON(b'{\n  "id": "msg_\xc3\xa4"\n}'))
+
+    assert stdout.getvalue() == '{\n  "id": "msg_\u00e4"\n}\n'
+
+
+def test_streamed_json_matches_json_dumps(capsys) -> None:
+    from wolper_google.main import _print_json
+
+    payload = {"z": [{"b": 1, "a": [1, 2, {}]}, [], "x"], "a": {"n": None, "m": True}, "e": {}}
+
+    _print_json(payload)
+    _print_json(payload, sort_keys=True)
+
+    assert capsys.readouterr().out.splitlines() == [json.dumps(payload), json.dumps(payload, sort_keys=True)]
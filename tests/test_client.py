@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from typing import Any
+
+from wolper_google import Client, Session, gmail, http
+from wolper_google.auth import AuthConfig
+from wolper_google.concurrency import parallel_map
+from wolper_google.synthetic import SyntheticCalendar, SyntheticMailbox, serve
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def test_client_shares_session_cache_and_stats_across_threads() -> None:
+    mailbox = SyntheticMailbox.generate(messages=30, seed=4)
+
+    with serve(mailbox, SyntheticCalendar.generate(calendars=1, events=5, seed=4)) as server:
+        with Client(_auth(), cache_ttl=60, max_in_flight=4) as client:
+            listing = client.gmail.list_messages(params={"maxResults": "10"})
+            events = client.calendar.list_events("primary")
+            event_ids = [item["id"] for item in events["items"]]
+            parallel_map(lambda event_id: client.calendar.get_event("primary", event_id), event_ids)
+            parallel_map(lambda event_id: client.calendar.get_event("primary", event_id), event_ids * 2)
+            stats = client.stats()
+
+    assert len(listing["messages"]) == 10
+    assert len(events["items"]) == 5
+    assert stats.requests == 7
+    assert stats.cache_hits == 10
+    assert stats.errors == 0
+    assert stats.quota_units == 5 + 6
+    assert server.requests <= stats.requests
+
+
+def test_client_reads_auth_file_once_and_free_functions_use_default_session(monkeypatch, tmp_path) -> None:
+    auth_path = tmp_path / "auth.json"
+    auth_path.write_text(
+        json.dumps({"access_token": "file-token", "expires_at": "2026-02-20T16:55:09+00:00", "token_type": "Bearer"}),
+        encoding="utf-8",
+    )
+    tokens: list[str] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        tokens.append(token)
+        return {"id": url.rsplit("/", 1)[1]}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    client = Client(auth_file=auth_path, session=Session())
+
+    assert client.gmail.get_label("INBOX") == {"id": "INBOX"}
+    auth_path.unlink()
+    assert client.gmail.get_profile()["id"] == "profile"
+    assert gmail.get_label(_auth(), "STARRED") == {"id": "STARRED"}
+    assert tokens == ["file-token", "file-token", "token"]
+    assert client.stats().requests == 2
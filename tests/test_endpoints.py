@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import importlib.util
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from wolper_google import endpoints, http
+from wolper_google.auth import AuthConfig
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def test_endpoint_table_matches_specs() -> None:
+    pytest.importorskip("yaml")
+    script = PROJECT_ROOT / "scripts" / "generate_endpoint_table.py"
+    spec = importlib.util.spec_from_file_location("generate_endpoint_table", script)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rendered = module.render(module.build_table())
+
+    assert rendered == (PROJECT_ROOT / "wolper_google" / "endpoint_table.py").read_text(encoding="utf-8")
+
+
+def test_endpoint_metadata() -> None:
+    endpoint = endpoints.get("gmail.users.messages.list")
+
+    assert endpoint.method == "GET"
+    assert endpoint.paginated
+    assert not endpoint.cacheable
+    assert endpoints.get("calendar.events.get").cacheable
+    assert not endpoints.get("gmail.users.messages.get").cacheable
+    assert not endpoints.get("gmail.users.labels.get").cacheable
+    assert endpoint.items_key == "messages"
+    assert endpoint.quota_cost == 5
+    assert endpoints.get("gmail.users.messages.send").quota_cost == 100
+    assert endpoints.url("calendar.events.get", calendarId="cal_1", eventId="event_1").endswith(
+        "/calendar/v3/calendars/cal_1/events/event_1"
+    )
+    with pytest.raises(ValueError):
+        endpoints.url("calendar.events.get", calendarId="cal_1")
+    with pytest.raises(ValueError):
+        endpoints.get("gmail.users.nope")
+
+
+def test_call_dispatches_by_operation_id(monkeypatch) -> None:
+    called: dict[str, Any] = {}
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        called["url"] = url
+        called["params"] = params
+        return {"ok": True}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    payload = endpoints.call(_auth(), "gmail.users.threads.get", params={"format": "minimal"}, id="t1")
+
+    assert payload == {"ok": True}
+    assert called["url"] == "https://gmail.googleapis.com/gmail/v1/users/me/threads/t1"
+    assert called["params"] == {"format": "minimal"}
+
+
+def test_iter_items_streams_every_page(monkeypatch) -> None:
+    pages = {
+        None: b'{"items": [{"id": "e1"}, {"id": "e2"}], "nextPageToken": "p2"}',
+        "p2": b'{"items": [{"id": "e3"}], "nextPageToken": "p3"}',
+        "p3": b'{"items": []}',
+    }
+    requested: list[str] = []
+
+    def fake_stream(url: str, headers: dict[str, str], timeouts: Any = None, **kwargs: Any) -> Any:
+        requested.append(url)
+        token = url.partition("pageToken=")[2] or None
+        body = pages[token]
+        return iter([body[index : index + 7] for index in range(0, len(body), 7)])
+
+    monkeypatch.setattr(http, "stream", fake_stream)
+
+    items = endpoints.iter_items(_auth(), "calendar.events.list", {"maxResults": "2"}, calendarId="c1")
+
+    assert [item["id"] for item in items] == ["e1", "e2", "e3"]
+    assert len(requested) == 3
+    assert all("maxResults=2" in url for url in requested)
@@ -229,3 +229,68 @@ def test_threads(monkeypatch) -> None:
 
     assert payload == {"ok": True}
     assert called["url"].endswith("/gmail/v1/users/me/threads/thread_1")
+
+
+def test_get_headers_uses_metadata_format(monkeypatch) -> None:
+    auth = _auth()
+    calls: list[tuple[str, dict[str, Any] | None]] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append((url, params))
+        message_id = url.rsplit("/", 1)[1]
+        return {
+            "id": message_id,
+            "threadId": "thread_1",
+            "payload": {
+                "headers": [
+                    {"name": "From", "value": "=?utf-8?q?J=C3=BCrgen?= <j@example.com>"},
+                    {"name": "Subject", "value": "Report"},
+                    {"name": "X-Ignored", "value": "nope"},
+                ]
+            },
+        }
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    rows = gmail.get_headers(auth, ["msg_1", "msg_2"], headers=["From", "Subject"])
+
+    assert [row.message_id for row in rows] == ["msg_1", "msg_2"]
+    assert rows[0].headers == {"From": "Jürgen <j@example.com>", "Subject": "Report"}
+    assert rows[0].addresses["From"] == (("Jürgen", "j@example.com"),)
+    assert all(
+        params == {"format": "metadata", "metadataHeaders": ["From", "Subject"]}
+        for _, params in calls
+    )
+
+
+def test_thread_and_draft_params(monkeypatch) -> None:
+    auth = _auth()
+    called = _capture(monkeypatch)
+    params = gmail.payload_params("metadata", ["Subject"], fields="id,messages/id")
+
+    gmail.get_thread(auth, "thread_1", user_id="me", params=params)
+
+    assert called["params"] == {
+        "format": "metadata",
+        "metadataHeaders": ["Subject"],
+        "fields": "id,messages/id",
+    }
+
+    gmail.get_draft(auth, "draft_1", user_id="me", params={"format": "minimal"})
+
+    assert called["url"].endswith("/gmail/v1/users/me/drafts/draft_1")
+    assert called["params"] == {"format": "minimal"}
+
+
+def test_get_threads_parallel(monkeypatch) -> None:
+    auth = _auth()
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        return {"id": url.rsplit("/", 1)[1], "params": params}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    threads = gmail.get_threads(auth, ["t1", "t2", "t3"], params={"format": "minimal"})
+
+    assert [item["id"] for item in threads] == ["t1", "t2", "t3"]
+    assert all(item["params"] == {"format": "minimal"} for item in threads)
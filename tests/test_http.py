@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from urllib.error import HTTPError
+from collections.abc import Iterator
+
+import pytest
+
+from wolper_google import http
+from wolper_google.concurrency import parallel_map
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits: dict[str, int] = {}
+
+    def do_GET(self) -> None:  # noqa: N802
+        _Handler.hits[self.path] = _Handler.hits.get(self.path, 0) + 1
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/fast")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(2)
+        if self.path.startswith("/hot"):
+            time.sleep(0.3)
+        body = b'{"path": "%s", "auth": "%s"}' % (
+            self.path.encode(),
+            self.headers.get("Authorization", "").encode(),
+        )
+        if self.path.startswith("/large"):
+            body = b'{"items": [%s], "agent": "%s"}' % (
+                b", ".join([b'{"id": "item"}'] * 2000),
+                self.headers.get("User-Agent", "").encode(),
+            )
+        encoded = "gzip" in self.headers.get("Accept-Encoding", "")
+        if encoded:
+            body = gzip.compress(body)
+        self.send_response(404 if self.path.endswith("/missing") else 200)
+        self.send_header("Content-Type", "application/json")
+        if encoded:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+@pytest.fixture()
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_json_against_local_server(server_url: str) -> None:
+    payload = http.get_json(f"{server_url}/fast", "token", params={"a": ["1", "2"]})
+
+    assert payload == {"path": "/fast?a=1&a=2", "auth": "Bearer token"}
+
+
+def test_get_json_follows_redirects(server_url: str) -> None:
+    assert http.get_json(f"{server_url}/redirect", "token") == {"path": "/fast", "auth": "Bearer token"}
+
+
+def test_get_json_honors_proxy_environment(monkeypatch, server_url: str) -> None:
+    monkeypatch.setenv("HTTP_PROXY", server_url)
+    monkeypatch.setenv("NO_PROXY", "bypass.example.test")
+    monkeypatch.delenv("no_proxy", raising=False)
+    monkeypatch.delenv("http_proxy", raising=False)
+
+    payload = http.get_json("http://api.example.test/items", "token", params={"a": "1"})
+
+    assert payload["path"] == "http://api.example.test/items?a=1"
+    with pytest.raises(http.NETWORK_ERRORS):
+        http.get_json("http://bypass.example.test/items", "token")
+
+
+def test_deadline_bounds_slow_request(server_url: str) -> None:
+    started = time.monotonic()
+    with pytest.raises(http.DeadlineExceeded):
+        with http.deadline(0.3):
+            http.get_json(f"{server_url}/slow", "token")
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_deadline_propagates_through_fan_out(server_url: str) -> None:
+    started = time.monotonic()
+    with pytest.raises(http.DeadlineExceeded):
+        with http.deadline(0.3):
+            parallel_map(
+                lambda path: http.get_json(f"{server_url}{path}", "token"),
+                ["/fast", "/slow", "/slow"],
+            )
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_fan_out_fails_fast_on_first_error(server_url: str) -> None:
+    def fetch(path: str) -> dict[str, object]:
+        if path == "/boom":
+            time.sleep(0.2)
+            message = "boom"
+            raise ValueError(message)
+        return http.get_json(f"{server_url}{path}", "token")
+
+    started = time.monotonic()
+    with pytest.raises(ValueError, match="boom"):
+        parallel_map(fetch, ["/slow", "/boom"])
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_cancel_aborts_in_flight_request(server_url: str) -> None:
+    errors: list[BaseException] = []
+    scopes: list[http.CancelScope] = []
+
+    def worker() -> None:
+        with http.deadline() as scope:
+            scopes.append(scope)
+            try:
+                http.get_json(f"{server_url}/slow", "token")
+            except BaseException as exc:  # noqa: BLE001
+                errors.append(exc)
+
+    thread = threading.Thread(target=worker)
+    started = time.monotonic()
+    thread.start()
+    time.sleep(0.3)
+    scopes[0].cancel()
+    thread.join(timeout=5)
+
+    assert time.monotonic() - started < 1.5
+    assert len(errors) == 1
+    assert isinstance(errors[0], http.Cancelled)
+
+
+def test_get_json_negotiates_gzip(server_url: str) -> None:
+    http.reset_transfer_stats()
+
+    payload = http.get_json(f"{server_url}/large", "token")
+
+    stats = http.transfer_stats()
+    assert len(payload["items"]) == 2000
+    assert payload["agent"].endswith("(gzip)")
+    assert stats.requests == 1
+    assert stats.compression_ratio > 5
+
+
+def test_http2_falls_back_without_optional_dependency(monkeypatch, server_url: str) -> None:
+    monkeypatch.setattr(http, "httpx", None)
+
+    assert http.enable_http2() is False
+    assert http.http2_enabled() is False
+    assert http.get_json(f"{server_url}/fast", "token")["path"] == "/fast"
+
+
+def test_identical_in_flight_gets_are_coalesced(server_url: str) -> None:
+    http.reset_transfer_stats()
+    barrier = threading.Barrier(5)
+
+    def fetch(_: int) -> dict[str, object]:
+        barrier.wait()
+        return http.get_json(f"{server_url}/hot", "token")
+
+    results = parallel_map(fetch, range(5), max_workers=5)
+
+    assert _Handler.hits["/hot"] == 1
+    assert http.transfer_stats().coalesced == 4
+    assert all(result == results[0] for result in results)
+    assert len({id(result) for result in results}) == 5
+    for index, result in enumerate(results[:-1]):
+        result["path"] = f"mutated-{index}"
+    assert results[-1]["path"] == "/hot"
+
+
+def test_coalesced_http_errors_keep_their_body(server_url: str) -> None:
+    barrier = threading.Barrier(4)
+
+    def fetch(_: int) -> tuple[int, bytes]:
+        barrier.wait()
+        try:
+            http.get_json(f"{server_url}/hot/missing", "token")
+        except HTTPError as exc:
+            return exc.code, exc.read()
+        return 200, b""
+
+    results = parallel_map(fetch, range(4), max_workers=4)
+
+    assert _Handler.hits["/hot/missing"] == 1
+    assert results == [(404, b'{"path": "/hot/missing", "auth": "Bearer token"}')] * 4
+
+
+def test_stream_json_yields_items_from_compressed_body(server_url: str) -> None:
+    with http.stream_json(f"{server_url}/large", "token", "items") as items:
+        count = sum(1 for _ in items)
+        agent = items.page["agent"]
+
+    assert count == 2000
+    assert agent.endswith("(gzip)")
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from email.message import Message
+from io import BytesIO
+import json
+from urllib.error import HTTPError
+
+import pytest
+
+from wolper_google.concurrency import fan_out
+from wolper_google.jobs import PagedJob
+from wolper_google.streaming import ItemStream
+
+
+def test_paged_job_resumes_after_crash(tmp_path) -> None:
+    pages = {
+        None: {"items": [{"id": "a"}, {"id": "b"}], "nextPageToken": "p2"},
+        "p2": {"items": [{"id": "c"}]},
+    }
+    fetched: list[str | None] = []
+    crash = {"enabled": True}
+
+    def fetch_page(token: str | None) -> dict[str, object]:
+        fetched.append(token)
+        if token == "p2" and crash["enabled"]:
+            raise KeyboardInterrupt
+        return pages[token]
+
+    output = tmp_path / "out.ndjson"
+    state = tmp_path / "state.json"
+    job = PagedJob("events", fetch_page, "items", output, state, checkpoint_every=1)
+
+    with pytest.raises(KeyboardInterrupt):
+        job.run()
+
+    saved = json.loads(state.read_text(encoding="utf-8"))
+    assert saved["pageToken"] == "p2"
+    assert saved["outputOffset"] == output.stat().st_size
+
+    with output.open("ab") as handle:
+        handle.write(b'{"id": "partial"')
+
+    crash["enabled"] = False
+    fetched.clear()
+    result = job.run(resume=True)
+
+    assert fetched == ["p2"]
+    assert result.written == 1
+    assert result.completed
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "b", "c"]
+
+    assert job.run(resume=True).written == 0
+
+
+def test_paged_job_rejects_foreign_state(tmp_path) -> None:
+    state = tmp_path / "state.json"
+    state.write_text(json.dumps({"job": "other"}), encoding="utf-8")
+    job = PagedJob("events", lambda token: {"items": []}, "items", tmp_path / "out", state)
+
+    with pytest.raises(ValueError):
+        job.run(resume=True)
+
+
+def test_paged_job_records_failed_items_and_keeps_going(tmp_path) -> None:
+    def hydrate_one(item: dict[str, object]) -> dict[str, object]:
+        if item["id"] == "gone":
+            body = b'{"error": {"code": 404, "message": "Not Found", "errors": [{"reason": "notFound"}]}}'
+            raise HTTPError("url", 404, "Not Found", Message(), BytesIO(body))
+        return {**item, "hydrated": True}
+
+    job = PagedJob(
+        "messages",
+        lambda token: {"items": [{"id": "a"}, {"id": "gone"}, {"id": "b"}]},
+        "items",
+        tmp_path / "out.ndjson",
+        tmp_path / "state.json",
+        hydrate=lambda items: fan_out(hydrate_one, items, max_workers=2),
+    )
+
+    payload = job.run().to_payload()
+
+    assert payload["written"] == 2
+    assert payload["failed"] == 1
+    assert payload["errors"] == [
+        {
+            "id": "gone",
+            "error": {"status": 404, "reason": "notFound", "message": "Not Found", "retryable": False},
+        }
+    ]
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "b"]
+    with pytest.raises(HTTPError):
+        fan_out(hydrate_one, [{"id": "gone"}, {"id": "a"}], on_error="fail-fast")
+
+
+def test_paged_job_retries_retryable_failures_on_resume(tmp_path) -> None:
+    fetched: list[str] = []
+    unavailable = {"b"}
+    pages = {
+        None: {"items": [{"id": "a"}, {"id": "b"}], "nextPageToken": "p2"},
+        "p2": {"items": [{"id": "c"}]},
+    }
+
+    def hydrate_one(item: dict[str, object]) -> dict[str, object]:
+        fetched.append(str(item["id"]))
+        if item["id"] in unavailable:
+            body = b'{"error": {"code": 503, "message": "Backend Error", "errors": [{"reason": "backendError"}]}}'
+            raise HTTPError("url", 503, "Service Unavailable", Message(), BytesIO(body))
+        return {**item, "hydrated": True}
+
+    def make_job() -> PagedJob:
+        return PagedJob(
+            "messages",
+            lambda token: pages[token],
+            "items",
+            tmp_path / "out.ndjson",
+            tmp_path / "state.json",
+            hydrate=lambda items: fan_out(hydrate_one, items, max_workers=1),
+        )
+
+    first = make_job().run()
+    state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+
+    assert first.completed and first.written == 2
+    assert [error["id"] for error in first.errors] == ["b"]
+    assert "b" in state["failed"] and "b" not in state["processedIds"]
+
+    unavailable.clear()
+    fetched.clear()
+    second = make_job().run(resume=True)
+
+    assert fetched == ["b"]
+    assert second.written == 1 and second.errors == []
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "c", "b"]
+
+
+def test_paged_job_consumes_streamed_pages(tmp_path) -> None:
+    pages = {
+        None: b'{"items": [{"id": "a"}, {"id": "b"}, {"id": "c"}], "nextPageToken": "p2"}',
+        "p2": b'{"items": [{"id": "d"}]}',
+    }
+    job = PagedJob(
+        "events",
+        lambda token: ItemStream([pages[token]], "items"),
+        "items",
+        tmp_path / "out.ndjson",
+        tmp_path / "state.json",
+        checkpoint_every=2,
+    )
+
+    result = job.run()
+
+    assert result.completed and result.written == 4
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "b", "c", "d"]
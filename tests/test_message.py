@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timezone
+from typing import Any
+
+from wolper_google import http
+from wolper_google.auth import AuthConfig
+from wolper_google.message import MessageView
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def _encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode("ascii").rstrip("=")
+
+
+def _payload() -> dict[str, Any]:
+    return {
+        "id": "msg_1",
+        "threadId": "thread_1",
+        "payload": {
+            "partId": "",
+            "mimeType": "multipart/mixed",
+            "headers": [{"name": "Subject", "value": "Hello"}],
+            "body": {"size": 0},
+            "parts": [
+                {
+                    "partId": "0",
+                    "mimeType": "multipart/alternative",
+                    "body": {"size": 0},
+                    "parts": [
+                        {
+                            "partId": "0.0",
+                            "mimeType": "text/plain",
+                            "headers": [
+                                {"name": "Content-Type", "value": "text/plain; charset=iso-8859-1"},
+                            ],
+                            "body": {"size": 5, "data": _encode("Gr\xfc\xdf".encode("latin-1"))},
+                        },
+                        {
+                            "partId": "0.1",
+                            "mimeType": "text/html",
+                            "body": {"size": 12, "data": _encode(b"<p>Hello</p>")},
+                        },
+                    ],
+                },
+                {
+                    "partId": "1",
+                    "mimeType": "application/pdf",
+                    "filename": "invoice.pdf",
+                    "body": {"size": 3, "attachmentId": "att_1"},
+                },
+            ],
+        },
+    }
+
+
+def test_message_view_decodes_requested_parts_only() -> None:
+    view = MessageView(_payload())
+
+    assert view.headers["subject"] == "Hello"
+    assert view.plain_text() == "Grüß"
+    html_part = view.part("0.1")
+    assert html_part is not None
+    assert not html_part.is_loaded
+    assert view.html() == "<p>Hello</p>"
+    assert html_part.is_loaded
+
+
+def test_message_view_fetches_attachment_on_demand(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append(url)
+        return {"size": 3, "data": _encode(b"PDF")}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    view = MessageView(_payload(), auth=_auth())
+    attachments = list(view.attachments())
+
+    assert [part.filename for part in attachments] == ["invoice.pdf"]
+    assert calls == []
+    assert attachments[0].data() == b"PDF"
+    assert attachments[0].data() == b"PDF"
+    assert len(calls) == 1
+    assert calls[0].endswith("/gmail/v1/users/me/messages/msg_1/attachments/att_1")
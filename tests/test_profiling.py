@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import pstats
+
+from wolper_google import profiling
+from wolper_google.concurrency import parallel_map
+from wolper_google.main import _extract_global_flags, main
+from wolper_google.synthetic import SyntheticMailbox, serve
+
+
+def test_cli_profile_flag_writes_pstats_and_phase_report(tmp_path, capsys) -> None:
+    auth_path = tmp_path / "auth.json"
+    auth_path.write_text(
+        json.dumps({"access_token": "token", "expires_at": "2026-02-20T16:55:09+00:00", "token_type": "Bearer"}),
+        encoding="utf-8",
+    )
+    output = tmp_path / "run.prof"
+
+    with serve(SyntheticMailbox.generate(messages=20)):
+        exit_code = main(
+            ["gmail", "profile", "get", "--profile", "--auth-file", str(auth_path), "--profile-out", str(output)]
+        )
+
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    assert json.loads(captured.out)["messagesTotal"] == 20
+    assert "profile (cpu)" in captured.err
+    for name in profiling.PHASES:
+        assert f"\n{name} " in captured.err
+    assert pstats.Stats(str(output)).total_calls > 0
+    assert profiling.active() is None
+
+
+def test_profile_context_manager_tracks_memory_by_phase(tmp_path) -> None:
+    output = tmp_path / "alloc.folded"
+
+    with profiling.profile("mem", output=output, report=False) as profile:
+        with profiling.phase("decode"):
+            blob = [bytearray(1024) for _ in range(256)]
+
+    assert profile.phases["decode"].calls == 1
+    assert profile.phases["decode"].allocated >= 256 * 1024
+    assert profile.peak_bytes >= 256 * 1024
+    assert "test_profiling.py" in output.read_text(encoding="utf-8")
+    assert len(blob) == 256
+
+
+def test_bare_profile_flag_does_not_swallow_the_command() -> None:
+    hoisted, cleaned = _extract_global_flags(["--profile", "gmail", "labels", "list", "--profile=mem"])
+
+    assert hoisted == ["--profile=cpu", "--profile=mem"]
+    assert cleaned == ["gmail", "labels", "list"]
+    assert _extract_global_flags(["--profile", "mem", "gmail", "labels", "list"]) == (
+        ["--profile=mem"],
+        ["gmail", "labels", "list"],
+    )
+
+
+def _spin(count: int) -> int:
+    return sum(range(count))
+
+
+def test_cpu_profile_includes_worker_threads(tmp_path) -> None:
+    output = tmp_path / "workers.prof"
+
+    with profiling.profile("cpu", output=output, report=False):
+        assert parallel_map(_spin, [1000] * 8, max_workers=4) == [sum(range(1000))] * 8
+
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert "_spin" in functions
+
+
+def test_cli_profile_reports_default_output_path(tmp_path, monkeypatch, capsys) -> None:
+    auth_path = tmp_path / "auth.json"
+    auth_path.write_text(
+        json.dumps({"access_token": "token", "expires_at": "2026-02-20T16:55:09+00:00", "token_type": "Bearer"}),
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+
+    with serve(SyntheticMailbox.generate(messages=5)):
+        exit_code = main(["--profile", "mem", "gmail", "profile", "get", "--auth-file", str(auth_path)])
+
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    assert json.loads(captured.out)["messagesTotal"] == 5
+    assert captured.err.splitlines()[0] == f"Writing profile to {tmp_path.resolve() / 'wolper-google.folded'}"
+    assert (tmp_path / "wolper-google.folded").exists()
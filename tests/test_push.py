@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timezone
+import json
+import queue
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from wolper_google import calendar, gmail, http
+from wolper_google.auth import AuthConfig
+from wolper_google.push import (
+    CalendarNotification,
+    GmailNotification,
+    IncrementalSync,
+    NotificationServer,
+)
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def _post(url: str, body: bytes, headers: dict[str, str] | None = None) -> int:
+    request = Request(url, data=body, headers=headers or {}, method="POST")
+    with urlopen(request, timeout=5) as response:
+        return response.status
+
+
+def test_watch_endpoints_post_bodies(monkeypatch) -> None:
+    called: list[tuple[str, Any]] = []
+
+    def fake_post_json(url: str, token: str, body: Any = None, params: Any = None) -> dict[str, Any]:
+        called.append((url, body))
+        return {"historyId": "10"}
+
+    monkeypatch.setattr(http, "post_json", fake_post_json)
+
+    gmail.watch(_auth(), "projects/p/topics/t", label_ids=["INBOX"])
+    calendar.watch_events(_auth(), "cal_1", "chan_1", "https://example.com/hook", ttl_seconds=60)
+
+    assert called[0] == (
+        "https://gmail.googleapis.com/gmail/v1/users/me/watch",
+        {"topicName": "projects/p/topics/t", "labelIds": ["INBOX"]},
+    )
+    assert called[1][0].endswith("/calendar/v3/calendars/cal_1/events/watch")
+    assert called[1][1] == {
+        "id": "chan_1",
+        "type": "web_hook",
+        "address": "https://example.com/hook",
+        "params": {"ttl": "60"},
+    }
+
+
+def test_notification_server_accepts_fake_notifier() -> None:
+    received: queue.Queue[Any] = queue.Queue()
+    server = NotificationServer(received.put, verify_token="secret")
+    server.start()
+    try:
+        data = base64.b64encode(json.dumps({"emailAddress": "me@example.com", "historyId": 42}).encode())
+        body = json.dumps({"message": {"data": data.decode()}}).encode()
+
+        assert _post(f"{server.url}/?token=secret", body) == 204
+        assert received.get(timeout=5) == GmailNotification("me@example.com", "42")
+
+        headers = {
+            "X-Goog-Channel-ID": "chan_1",
+            "X-Goog-Channel-Token": "secret",
+            "X-Goog-Resource-ID": "res_1",
+            "X-Goog-Resource-State": "exists",
+        }
+        assert _post(server.url, b"", headers) == 204
+        notification = received.get(timeout=5)
+        assert isinstance(notification, CalendarNotification)
+        assert notification.channel_id == "chan_1"
+        assert notification.resource_state == "exists"
+
+        with pytest.raises(HTTPError) as excinfo:
+            _post(f"{server.url}/?token=wrong", body)
+        assert excinfo.value.code == 403
+    finally:
+        server.stop()
+
+
+def test_incremental_sync_fetches_deltas(monkeypatch) -> None:
+    calls: list[tuple[str, dict[str, Any] | None]] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append((url, params))
+        if url.endswith("/history"):
+            return {"history": [{"id": "11"}], "historyId": "12"}
+        if params and "syncToken" in params:
+            return {"items": [{"id": "event_2"}], "nextSyncToken": "sync_2"}
+        return {"items": [{"id": "event_1"}], "nextSyncToken": "sync_1"}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    emitted: list[Any] = []
+    sync = IncrementalSync(_auth(), emitted.append, start_history_id="10", channels={"chan_1": "cal_1"})
+
+    sync(GmailNotification("me@example.com", "12"))
+    sync(CalendarNotification("chan_1", "res_1", "sync", "1", ""))
+    sync(CalendarNotification("chan_1", "res_1", "exists", "2", ""))
+
+    assert calls[0][1] == {"startHistoryId": "10"}
+    assert calls[2][1] == {"syncToken": "sync_1"}
+    assert emitted == [
+        {"source": "gmail", "history": {"id": "11"}},
+        {"source": "calendar", "calendarId": "cal_1", "event": {"id": "event_2"}},
+    ]
+
+
+def test_notification_server_keeps_draining_after_handler_error(capsys) -> None:
+    received: queue.Queue[Any] = queue.Queue()
+
+    def handler(notification: Any) -> None:
+        if notification.channel_id == "bad":
+            message = "handler exploded"
+            raise RuntimeError(message)
+        received.put(notification)
+
+    server = NotificationServer(handler)
+    server.start()
+    try:
+        for channel_id in ("bad", "good"):
+            headers = {"X-Goog-Channel-ID": channel_id, "X-Goog-Resource-ID": "res_1"}
+            assert _post(server.url, b"", headers) == 204
+
+        assert received.get(timeout=5).channel_id == "good"
+    finally:
+        server.stop()
+    assert "handler exploded" in capsys.readouterr().err
+
+
+def test_incremental_sync_resets_expired_history_id(monkeypatch) -> None:
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/history"):
+            assert params is not None
+            if params["startHistoryId"] == "1":
+                raise HTTPError(url, 404, "Not Found", None, None)
+            return {"history": [{"id": "51"}], "historyId": "52"}
+        if url.endswith("/profile"):
+            return {"emailAddress": "me@example.com", "historyId": "50"}
+        raise AssertionError(url)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    emitted: list[Any] = []
+    sync = IncrementalSync(_auth(), emitted.append, start_history_id="1")
+
+    sync(GmailNotification("me@example.com", "50"))
+    sync(GmailNotification("me@example.com", "52"))
+
+    assert emitted == [{"source": "gmail", "history": {"id": "51"}}]
+
+
+def test_incremental_sync_keeps_start_id_when_a_later_page_fails(monkeypatch) -> None:
+    starts: list[tuple[str, str | None]] = []
+    failing = [True]
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        assert params is not None
+        starts.append((params["startHistoryId"], params.get("pageToken")))
+        if params.get("pageToken") == "p2":
+            if failing[0]:
+                raise HTTPError(url, 503, "Service Unavailable", None, None)
+            return {"history": [{"id": "12"}], "historyId": "20"}
+        return {"history": [{"id": "11"}], "historyId": "20", "nextPageToken": "p2"}
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    emitted: list[Any] = []
+    sync = IncrementalSync(_auth(), emitted.append, start_history_id="10")
+
+    with pytest.raises(HTTPError):
+        sync(GmailNotification("me@example.com", "20"))
+    failing[0] = False
+    sync(GmailNotification("me@example.com", "20"))
+    sync(GmailNotification("me@example.com", "21"))
+
+    assert starts == [
+        ("10", None),
+        ("10", "p2"),
+        ("10", None),
+        ("10", "p2"),
+        ("20", None),
+        ("20", "p2"),
+    ]
+    assert [item["history"]["id"] for item in emitted] == ["11", "11", "12", "11", "12"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Any
+
+import pytest
+
+from wolper_google import calendar, http
+from wolper_google.auth import AuthConfig
+from wolper_google.recurrence import RecurrenceRule, expand_events
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def _standup() -> list[dict[str, Any]]:
+    master = {
+        "id": "standup",
+        "summary": "Standup",
+        "start": {"dateTime": "2025-03-24T09:00:00+01:00", "timeZone": "Europe/Berlin"},
+        "end": {"dateTime": "2025-03-24T09:15:00+01:00", "timeZone": "Europe/Berlin"},
+        "recurrence": [
+            "RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+            "EXDATE;TZID=Europe/Berlin:20250326T090000",
+            "RDATE;TZID=Europe/Berlin:20250329T100000",
+        ],
+    }
+    moved = {
+        "id": "standup_20250327T080000Z",
+        "recurringEventId": "standup",
+        "originalStartTime": {"dateTime": "2025-03-27T09:00:00+01:00", "timeZone": "Europe/Berlin"},
+        "start": {"dateTime": "2025-03-27T11:00:00+01:00"},
+        "end": {"dateTime": "2025-03-27T11:15:00+01:00"},
+        "summary": "Standup (moved)",
+    }
+    cancelled = {
+        "id": "standup_20250328T080000Z",
+        "recurringEventId": "standup",
+        "status": "cancelled",
+        "originalStartTime": {"dateTime": "2025-03-28T09:00:00+01:00", "timeZone": "Europe/Berlin"},
+    }
+    holiday = {"id": "holiday", "start": {"date": "2025-03-25"}, "end": {"date": "2025-03-26"}}
+    return [master, moved, cancelled, holiday]
+
+
+def test_rule_dates_follow_count_until_and_set_positions() -> None:
+    last_friday = RecurrenceRule.parse("RRULE:FREQ=MONTHLY;BYDAY=-1FR;COUNT=3")
+    weekdays = RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20250115")
+    last_workday = RecurrenceRule.parse("FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1")
+
+    assert list(last_friday.dates(date(2025, 1, 31))) == [
+        date(2025, 1, 31),
+        date(2025, 2, 28),
+        date(2025, 3, 28),
+    ]
+    assert list(islice(weekdays.dates(date(2025, 1, 6)), 3)) == [
+        date(2025, 1, 6),
+        date(2025, 1, 8),
+        date(2025, 1, 13),
+    ]
+    assert list(islice(last_workday.dates(date(2025, 5, 30)), 2)) == [date(2025, 5, 30), date(2025, 6, 30)]
+    with pytest.raises(ValueError, match="BYHOUR"):
+        RecurrenceRule.parse("FREQ=DAILY;BYHOUR=9")
+
+
+def test_expand_events_applies_exceptions_and_keeps_wall_time_across_dst() -> None:
+    events = list(
+        expand_events(
+            _standup(),
+            datetime(2025, 3, 24, tzinfo=timezone.utc),
+            datetime(2025, 4, 1, tzinfo=timezone.utc),
+        )
+    )
+
+    assert [event["id"] for event in events] == [
+        "standup_20250324T080000Z",
+        "holiday",
+        "standup_20250325T080000Z",
+        "standup_20250327T080000Z",
+        "standup_20250329T090000Z",
+        "standup_20250331T070000Z",
+    ]
+    assert events[3]["summary"] == "Standup (moved)"
+    assert events[-1]["start"] == {"dateTime": "2025-03-31T09:00:00+02:00", "timeZone": "Europe/Berlin"}
+    assert events[-1]["recurringEventId"] == "standup"
+
+
+def test_expand_events_fetches_masters_once_across_pages(monkeypatch) -> None:
+    pages = {
+        None: {"timeZone": "Europe/Berlin", "items": _standup()[:2], "nextPageToken": "p2"},
+        "p2": {"items": _standup()[2:]},
+    }
+    calls: list[dict[str, Any]] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append(dict(params or {}))
+        return pages[(params or {}).get("pageToken")]
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    series = calendar.recurring_events(_auth(), "primary")
+    march = list(series.between(datetime(2025, 3, 24), datetime(2025, 3, 29)))
+    april = list(series.between(datetime(2025, 4, 7), datetime(2025, 4, 8)))
+
+    assert [call.get("pageToken") for call in calls] == [None, "p2"]
+    assert all(call["singleEvents"] == "false" for call in calls)
+    assert len(march) == 4
+    assert [event["id"] for event in april] == ["standup_20250407T070000Z"]
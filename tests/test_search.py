@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from wolper_google import http
+from wolper_google.auth import AuthConfig
+from wolper_google.search import SearchCache, normalize_query
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def test_normalize_query_canonicalizes_equivalent_searches() -> None:
+    assert normalize_query("FROM:Bob   is:unread") == normalize_query("is:unread from:bob")
+    assert normalize_query("c b OR a") == "a OR b c"
+    assert normalize_query('older:2024-1-5 "Quarterly  Report"') == '"quarterly report" before:2024/01/05'
+    assert normalize_query("-(x OR y) subject:(Hello  World)") == "-(x OR y) subject:(hello world)"
+    assert normalize_query("label:Work AND has:attachment") == "has:attachment label:work"
+
+
+def test_search_cache_serves_repeats_until_history_changes(monkeypatch, tmp_path) -> None:
+    calls: list[str] = []
+    history: list[dict[str, Any]] = []
+    listed: list[int] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append(url.rsplit("/", 1)[-1])
+        if url.endswith("/profile"):
+            return {"emailAddress": "me@example.com", "historyId": "100"}
+        if url.endswith("/history"):
+            assert params is not None
+            return {"historyId": "101" if history else params["startHistoryId"], "history": history}
+        if url.endswith("/messages"):
+            listed.append(len(listed))
+            return {"messages": [{"id": f"msg_{len(listed)}"}], "resultSizeEstimate": 1}
+        raise AssertionError(url)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    now = [1000.0]
+    path = tmp_path / "search.json"
+
+    cache = SearchCache(path, ttl=30, clock=lambda: now[0])
+    first = cache.list_messages(_auth(), params={"q": "from:Bob is:unread"})
+    cache.save()
+    repeat = SearchCache(path, ttl=30, clock=lambda: now[0]).list_messages(
+        _auth(),
+        params={"q": "is:unread  FROM:bob"},
+    )
+
+    assert repeat == first
+    assert calls == ["profile", "messages"]
+
+    now[0] += 60
+    calls.clear()
+    assert cache.list_messages(_auth(), params={"q": "from:bob is:unread"}) == first
+    assert calls == ["history"]
+
+    now[0] += 60
+    calls.clear()
+    history.append({"id": "101", "messagesAdded": [{"message": {"id": "new"}}]})
+    fresh = cache.list_messages(_auth(), params={"q": "from:bob is:unread"})
+
+    assert fresh != first
+    assert calls == ["history", "messages"]
+    assert cache.stats.invalidations == 1
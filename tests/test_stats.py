@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.message import Message
+from io import BytesIO
+from typing import Any
+from urllib.error import HTTPError
+
+from wolper_google import http, stats
+from wolper_google.auth import AuthConfig
+
+DAY_MS = 86400 * 1000
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def _message(message_id: str, sender: str, internal_date: int) -> dict[str, Any]:
+    return {
+        "id": message_id,
+        "internalDate": str(internal_date),
+        "payload": {"headers": [{"name": "From", "value": sender}]},
+    }
+
+
+def test_mailbox_stats_counts_labels_senders_and_dates(monkeypatch) -> None:
+    messages = {
+        "m1": _message("m1", "Ann <ann@example.com>", 0),
+        "m2": _message("m2", "ann@example.com", DAY_MS),
+        "m3": _message("m3", "Bob <bob@example.com>", DAY_MS + 5),
+        "m4": _message("m4", "eve@other.org", 40 * DAY_MS),
+    }
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/labels"):
+            return {"labels": [{"id": "INBOX"}]}
+        if url.endswith("/labels/INBOX"):
+            return {"id": "INBOX", "name": "INBOX", "messagesTotal": 4, "messagesUnread": 1}
+        if url.endswith("/messages"):
+            if params and params.get("pageToken") == "p2":
+                return {"messages": [{"id": "m3"}, {"id": "m4"}]}
+            return {"messages": [{"id": "m1"}, {"id": "m2"}], "nextPageToken": "p2"}
+        assert params is not None and params["metadataHeaders"] == ["From"]
+        return messages[url.rsplit("/", 1)[1]]
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    result = stats.mailbox_stats(_auth(), top=1, bucket="month").to_payload()
+
+    assert result["messages"] == 4
+    assert result["labels"] == [
+        {
+            "id": "INBOX",
+            "name": "INBOX",
+            "messagesTotal": 4,
+            "messagesUnread": 1,
+            "threadsTotal": 0,
+            "threadsUnread": 0,
+        }
+    ]
+    assert result["senders"] == [{"sender": "ann@example.com", "count": 2}]
+    assert result["domains"] == [{"domain": "example.com", "count": 3}]
+    assert result["dates"] == [{"date": "1970-01", "count": 3}, {"date": "1970-02", "count": 1}]
+
+
+def test_summarize_without_numpy(monkeypatch) -> None:
+    monkeypatch.setattr(stats, "numpy", None)
+    columns = stats.MessageColumns()
+    columns.extend(
+        [
+            _message("m1", "a@x.io", 0),
+            _message("m2", "b@x.io", DAY_MS),
+            _message("m3", "b@x.io", DAY_MS),
+        ]
+    )
+
+    summary = stats.summarize(columns)
+
+    assert summary.senders == [("b@x.io", 2), ("a@x.io", 1)]
+    assert summary.domains == [("x.io", 3)]
+    assert summary.dates == [("1970-01-01", 1), ("1970-01-02", 2)]
+
+
+def test_collect_columns_skips_and_counts_failed_messages(monkeypatch) -> None:
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/messages"):
+            return {"messages": [{"id": "m1"}, {"id": "gone"}, {"id": "m2"}]}
+        message_id = url.rsplit("/", 1)[1]
+        if message_id == "gone":
+            raise HTTPError(url, 404, "Not Found", Message(), BytesIO(b"{}"))
+        return _message(message_id, "ann@example.com", 0)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    result = stats.mailbox_stats(_auth(), include_labels=False).to_payload()
+
+    assert result["messages"] == 2
+    assert result["failed"] == 1
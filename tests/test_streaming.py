@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from wolper_google.streaming import ItemStream
+
+
+def _chunks(payload: dict[str, object], size: int) -> list[bytes]:
+    encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return [encoded[index : index + size] for index in range(0, len(encoded), size)]
+
+
+def test_item_stream_yields_items_and_page_fields() -> None:
+    payload = {
+        "kind": "calendar#events",
+        "items": [{"id": f"e{index}", "summary": "Café ☕"} for index in range(5)],
+        "nextPageToken": "next",
+        "resultSizeEstimate": 12345,
+    }
+    stream = ItemStream(_chunks(payload, 1), "items")
+
+    with pytest.raises(RuntimeError):
+        stream.page
+    items = list(stream)
+
+    assert items == payload["items"]
+    assert stream.page == {"kind": "calendar#events", "nextPageToken": "next", "resultSizeEstimate": 12345}
+
+
+def test_item_stream_handles_missing_and_empty_items() -> None:
+    empty = ItemStream([b'{"items": [], "historyId": "7"}'], "items")
+    missing = ItemStream([b"{}"], "items")
+
+    assert list(empty) == []
+    assert empty.page == {"historyId": "7"}
+    assert list(missing) == []
+    assert missing.page == {}
+
+
+def test_item_stream_rejects_truncated_body() -> None:
+    with pytest.raises(ValueError):
+        list(ItemStream([b'{"items": [{"id": "a"}, {"id": '], "items"))
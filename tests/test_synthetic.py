@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import threading
+from urllib.error import HTTPError
+
+import pytest
+
+from wolper_google import calendar, endpoints, gmail, stats
+from wolper_google.auth import AuthConfig
+from wolper_google.synthetic import SyntheticCalendar, SyntheticMailbox, serve
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def test_fake_server_pages_messages_and_replays_history() -> None:
+    mailbox = SyntheticMailbox.generate(messages=250, attachment_ratio=0.1, attachment_size=64, seed=1)
+
+    with serve(mailbox) as server:
+        assert endpoints.url("gmail.users.getProfile").startswith(server.url)
+        seen: list[str] = []
+        params: dict[str, str] = {"maxResults": "100"}
+        while True:
+            page = gmail.list_messages(_auth(), params=params)
+            seen.extend(item["id"] for item in page["messages"])
+            if "nextPageToken" not in page:
+                break
+            params["pageToken"] = page["nextPageToken"]
+        start = gmail.get_profile(_auth())["historyId"]
+        added = mailbox.add_message("new@example.com", "Hello", "body")
+        mailbox.delete_message(seen[0])
+        history = gmail.list_history(_auth(), start)
+        full = gmail.get_message(_auth(), seen[-1])
+        with pytest.raises(HTTPError) as excinfo:
+            gmail.list_history(_auth(), "1")
+
+    assert len(seen) == len(set(seen)) == 250
+    assert [list(record)[-1] for record in history["history"]] == ["messagesAdded", "messagesDeleted"]
+    assert history["history"][0]["messagesAdded"][0]["message"]["id"] == added.message_id
+    assert full["payload"]["headers"][0]["name"] == "From"
+    assert excinfo.value.code == 404
+    assert not endpoints.API_BASES["gmail"].startswith(server.url)
+
+
+def test_fake_server_calendar_sync_tokens_and_stats() -> None:
+    store = SyntheticCalendar.generate(calendars=2, events=30, seed=2)
+    mailbox = SyntheticMailbox.generate(messages=40, seed=2)
+
+    with serve(mailbox, store):
+        first = calendar.list_events(_auth(), "primary", {"maxResults": "20"})
+        rest = calendar.list_events(_auth(), "primary", {"maxResults": "20", "pageToken": first["nextPageToken"]})
+        store.cancel_event("primary", first["items"][0]["id"])
+        delta = calendar.list_events(_auth(), "primary", {"syncToken": rest["nextSyncToken"]})
+        merged = list(calendar.list_events_merged(_auth(), ["primary", "team1@group.calendar.test"]))
+        with pytest.raises(HTTPError) as excinfo:
+            calendar.list_events(_auth(), "primary", {"syncToken": "bogus"})
+        summary = stats.mailbox_stats(_auth(), top=3).to_payload()
+
+    assert len(first["items"]) + len(rest["items"]) == 30
+    assert [item["status"] for item in delta["items"]] == ["cancelled"]
+    assert len(merged) == 59
+    assert excinfo.value.code == 410
+    assert summary["messages"] == 40
+
+
+def test_fake_server_reads_race_writes_and_reject_bad_page_sizes() -> None:
+    mailbox = SyntheticMailbox.generate(messages=200, seed=3)
+    stop = threading.Event()
+
+    def churn() -> None:
+        while not stop.is_set():
+            message = mailbox.add_message("churn@example.com", "Churn")
+            mailbox.delete_message(message.message_id)
+
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        for _ in range(50):
+            assert mailbox.get_label("INBOX")["messagesTotal"] >= 200
+            assert len(mailbox.list_messages({"maxResults": ["500"]})["messages"]) >= 200
+    finally:
+        stop.set()
+        writer.join()
+
+    with serve(mailbox, SyntheticCalendar.generate(calendars=1, events=5, seed=3)):
+        with pytest.raises(HTTPError) as messages_error:
+            gmail.list_messages(_auth(), params={"maxResults": "ten"})
+        with pytest.raises(HTTPError) as events_error:
+            calendar.list_events(_auth(), "primary", {"pageToken": "abc"})
+
+    assert messages_error.value.code == 400
+    assert json.loads(messages_error.value.read())["error"]["message"] == "Invalid value for maxResults: ten"
+    assert events_error.value.code == 400
+
+
+def test_synthetic_payloads_use_spec_fields() -> None:
+    yaml = pytest.importorskip("yaml")
+    gmail_spec = yaml.safe_load((ROOT / "gmail-api-openapi-spec.yaml").read_text())["definitions"]
+    calendar_spec = yaml.safe_load((ROOT / "google-calendar-api-openapi-spec.yaml").read_text())["definitions"]
+    mailbox = SyntheticMailbox.generate(messages=5, seed=3)
+    store = SyntheticCalendar.generate(calendars=1, events=5, seed=3)
+
+    checks = [
+        (gmail_spec["ListMessagesResponse"], mailbox.list_messages({})),
+        (gmail_spec["Profile"], mailbox.profile()),
+        (gmail_spec["Label"], mailbox.get_label("INBOX")),
+        (calendar_spec["Events"], store.list_events("primary", {})),
+        (calendar_spec["EventDateTime"], store.list_events("primary", {})["items"][0]["start"]),
+    ]
+
+    for definition, payload in checks:
+        assert set(payload) <= set(definition["properties"])
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.message import Message
+from io import BytesIO
+from typing import Any
+from urllib.error import HTTPError
+
+from wolper_google import http
+from wolper_google.auth import AuthConfig
+from wolper_google.threads import ThreadCache
+
+
+def _auth() -> AuthConfig:
+    return AuthConfig(
+        access_token="token",
+        expires_at=datetime(2026, 2, 20, 16, 55, 9, 859080, tzinfo=timezone.utc),
+        token_type="Bearer",
+    )
+
+
+def _message(message_id: str, internal_date: str) -> dict[str, Any]:
+    return {"id": message_id, "threadId": "thread_1", "internalDate": internal_date}
+
+
+def test_thread_cache_fetches_only_new_messages(monkeypatch, tmp_path) -> None:
+    calls: list[str] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        calls.append(url)
+        if url.endswith("/threads/thread_1"):
+            return {
+                "id": "thread_1",
+                "historyId": "100",
+                "messages": [_message("msg_2", "2000"), _message("msg_1", "1000")],
+            }
+        if url.endswith("/history"):
+            assert params is not None
+            assert params["startHistoryId"] == "100"
+            return {
+                "historyId": "105",
+                "history": [
+                    {"messagesAdded": [{"message": {"id": "msg_3", "threadId": "thread_1"}}]},
+                    {"messagesAdded": [{"message": {"id": "other", "threadId": "thread_2"}}]},
+                    {"messagesDeleted": [{"message": {"id": "msg_1", "threadId": "thread_1"}}]},
+                ],
+            }
+        if url.endswith("/messages/msg_3"):
+            return _message("msg_3", "3000")
+        raise AssertionError(url)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    cache_path = tmp_path / "threads.json"
+
+    cache = ThreadCache(cache_path)
+    first = cache.refresh(_auth(), "thread_1")
+    cache.save()
+
+    assert [item["id"] for item in first.conversation()] == ["msg_1", "msg_2"]
+
+    calls.clear()
+    reloaded = ThreadCache(cache_path)
+    refreshed = reloaded.refresh(_auth(), "thread_1")
+
+    assert [url.rsplit("/", 1)[1] for url in calls] == ["history", "msg_3"]
+    assert refreshed.history_id == "105"
+    assert [item["id"] for item in refreshed.conversation()] == ["msg_2", "msg_3"]
+
+
+def test_thread_cache_drops_messages_deleted_before_fetch(monkeypatch) -> None:
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/threads/thread_1"):
+            return {"id": "thread_1", "historyId": "100", "messages": [_message("msg_1", "1000")]}
+        if url.endswith("/history"):
+            added = [{"message": {"id": message_id, "threadId": "thread_1"}} for message_id in ("msg_2", "gone")]
+            return {"historyId": "105", "history": [{"messagesAdded": added}]}
+        if url.endswith("/messages/msg_2"):
+            return _message("msg_2", "2000")
+        raise HTTPError(url, 404, "Not Found", Message(), BytesIO(b"{}"))
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    cache = ThreadCache()
+    cache.refresh(_auth(), "thread_1")
+    refreshed = cache.refresh(_auth(), "thread_1")
+
+    assert [item["id"] for item in refreshed.conversation()] == ["msg_1", "msg_2"]
+    assert refreshed.history_id == "105"
+
+
+def test_thread_cache_applies_label_history(monkeypatch) -> None:
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/threads/thread_1"):
+            message = {**_message("msg_1", "1000"), "labelIds": ["INBOX", "UNREAD"]}
+            return {"id": "thread_1", "historyId": "100", "messages": [message]}
+        if url.endswith("/history"):
+            assert params is not None and "labelAdded" in params["historyTypes"]
+            change = {"message": {"id": "msg_1", "threadId": "thread_1"}}
+            return {
+                "historyId": "101",
+                "history": [
+                    {"labelsRemoved": [{**change, "labelIds": ["UNREAD", "INBOX"]}]},
+                    {"labelsAdded": [{**change, "labelIds": ["STARRED", "INBOX"]}]},
+                ],
+            }
+        raise AssertionError(url)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+
+    cache = ThreadCache()
+    cache.refresh(_auth(), "thread_1")
+    refreshed = cache.refresh(_auth(), "thread_1")
+
+    assert refreshed.messages["msg_1"]["labelIds"] == ["STARRED", "INBOX"]
+
+
+def test_thread_cache_refetches_when_params_change(monkeypatch, tmp_path) -> None:
+    calls: list[dict[str, Any] | None] = []
+
+    def fake_get_json(url: str, token: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if url.endswith("/threads/thread_1"):
+            calls.append(params)
+            return {"id": "thread_1", "historyId": "100", "messages": [_message("msg_1", "1000")]}
+        if url.endswith("/history"):
+            return {"historyId": "100", "history": []}
+        raise AssertionError(url)
+
+    monkeypatch.setattr(http, "get_json", fake_get_json)
+    cache_path = tmp_path / "threads.json"
+
+    cache = ThreadCache(cache_path)
+    cache.refresh(_auth(), "thread_1", params={"format": "metadata"})
+    cache.save()
+    reloaded = ThreadCache(cache_path)
+    reloaded.refresh(_auth(), "thread_1", params={"format": ["metadata"]})
+    reloaded.refresh(_auth(), "thread_1", params={"format": "full"})
+
+    assert calls == [{"format": "metadata"}, {"format": "full"}]
+    assert reloaded.get("thread_1").params == {"format": ["full"]}
@@ -1,5 +1,8 @@
 from wolper_google.auth import AuthConfig, read_auth_file
 from wolper_google.calendar import Calendar
+from wolper_google.client import Client
 from wolper_google.gmail import Mailbox
+from wolper_google.message import MessageView
+from wolper_google.session import Session
 
-__all__ = ["AuthConfig", "Calendar", "Mailbox", "read_auth_file"]
+__all__ = ["AuthConfig", "Calendar", "Client", "Mailbox", "MessageView", "Session", "read_auth_file"]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from datetime import date, datetime, timezone
+import heapq
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
 
 from wolper_google.auth import AuthConfig
-from wolper_google import http
+from wolper_google import endpoints
+from wolper_google.concurrency import DEFAULT_MAX_WORKERS, Submit, background
+from wolper_google.recurrence import EventSet
+from wolper_google.session import AuthSource, Session, default_session
 
-CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+CALENDAR_API_BASE = endpoints.API_BASES["calendar"]
 CALENDAR_LIST_URL = f"{CALENDAR_API_BASE}/users/me/calendarList"
 
 
@@ -22,7 +27,7 @@ class Calendar:
 
     @classmethod
     def list_raw(cls, auth: AuthConfig) -> Mapping[str, object]:
-        payload = http.get_json(CALENDAR_LIST_URL, auth.access_token)
+        payload = CalendarService(auth).list_calendars()
         if not isinstance(payload, dict):
             message = "Invalid calendar list response"
             raise ValueError(message)
@@ -43,9 +48,149 @@ class Calendar:
                 yield cls(calendar_id=calendar_id, summary=summary)
 
 
+class CalendarService:
+    def __init__(self, auth: AuthSource, session: Session | None = None) -> None:
+        self.auth = auth
+        self.session = session or default_session()
+
+    def list_calendars(self) -> Mapping[str, object]:
+        return self._get("calendar.calendarList.list")
+
+    def get_calendar(self, calendar_id: str) -> Mapping[str, object]:
+        return self._get("calendar.calendars.get", calendarId=calendar_id)
+
+    def list_acl(
+        self,
+        calendar_id: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("calendar.acl.list", params, calendarId=calendar_id)
+
+    def get_acl(self, calendar_id: str, rule_id: str) -> Mapping[str, object]:
+        return self._get("calendar.acl.get", calendarId=calendar_id, ruleId=rule_id)
+
+    def list_events(
+        self,
+        calendar_id: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("calendar.events.list", params, calendarId=calendar_id)
+
+    def list_events_merged(
+        self,
+        calendar_ids: Iterable[str],
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Iterator[dict[str, object]]:
+        unique_ids = list(dict.fromkeys(calendar_ids))
+        merged_params: dict[str, Sequence[str] | str] = {
+            "singleEvents": "true",
+            "orderBy": "startTime",
+            **(params or {}),
+        }
+        with background(min(max_workers, len(unique_ids))) as submit:
+            streams = [
+                _event_stream(submit, self.list_events, calendar_id, merged_params)
+                for calendar_id in unique_ids
+            ]
+            yield from heapq.merge(*streams, key=_start_key)
+
+    def recurring_events(
+        self,
+        calendar_id: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> EventSet:
+        base: dict[str, Sequence[str] | str] = {**(params or {}), "singleEvents": "false"}
+        events: list[Mapping[str, object]] = []
+        time_zone = "UTC"
+        token: str | None = None
+        while True:
+            page = self.list_events(calendar_id, {**base, "pageToken": token} if token else base)
+            if isinstance(page.get("timeZone"), str):
+                time_zone = str(page["timeZone"])
+            items = page.get("items", [])
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict):
+                    events.append(item)
+            next_token = page.get("nextPageToken")
+            if not isinstance(next_token, str) or not next_token:
+                return EventSet(events, time_zone)
+            token = next_token
+
+    def expand_events(
+        self,
+        calendar_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Iterator[dict[str, object]]:
+        return self.recurring_events(calendar_id, params).between(time_min, time_max)
+
+    def get_event(
+        self,
+        calendar_id: str,
+        event_id: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("calendar.events.get", params, calendarId=calendar_id, eventId=event_id)
+
+    def list_event_instances(
+        self,
+        calendar_id: str,
+        event_id: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("calendar.events.instances", params, calendarId=calendar_id, eventId=event_id)
+
+    def watch_events(
+        self,
+        calendar_id: str,
+        channel_id: str,
+        address: str,
+        token: str | None = None,
+        ttl_seconds: int | None = None,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        body: dict[str, object] = {"id": channel_id, "type": "web_hook", "address": address}
+        if token:
+            body["token"] = token
+        if ttl_seconds is not None:
+            body["params"] = {"ttl": str(ttl_seconds)}
+        return self.session.post_json(
+            "calendar.events.watch",
+            self.auth,
+            body,
+            params=params,
+            calendarId=calendar_id,
+        )
+
+    def stop_channel(self, channel_id: str, resource_id: str) -> Mapping[str, object]:
+        body = {"id": channel_id, "resourceId": resource_id}
+        return self.session.post_json("calendar.channels.stop", self.auth, body)
+
+    def get_colors(self) -> Mapping[str, object]:
+        return self._get("calendar.colors.get")
+
+    def get_calendar_list_entry(self, calendar_id: str) -> Mapping[str, object]:
+        return self._get("calendar.calendarList.get", calendarId=calendar_id)
+
+    def list_settings(self) -> Mapping[str, object]:
+        return self._get("calendar.settings.list")
+
+    def get_setting(self, setting: str) -> Mapping[str, object]:
+        return self._get("calendar.settings.get", setting=setting)
+
+    def _get(
+        self,
+        name: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        **path_values: str,
+    ) -> Mapping[str, object]:
+        return self.session.get_json(name, self.auth, params, **path_values)
+
+
 def get_calendar(auth: AuthConfig, calendar_id: str) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).get_calendar(calendar_id)
 
 
 def list_acl(
@@ -53,13 +198,11 @@ def list_acl(
     calendar_id: str,
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}/acl")
-    return http.get_json(url, auth.access_token, params=params)
+    return CalendarService(auth).list_acl(calendar_id, params=params)
 
 
 def get_acl(auth: AuthConfig, calendar_id: str, rule_id: str) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}/acl/{rule_id}")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).get_acl(calendar_id, rule_id)
 
 
 def list_events(
@@ -67,8 +210,34 @@ def list_events(
     calendar_id: str,
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}/events")
-    return http.get_json(url, auth.access_token, params=params)
+    return CalendarService(auth).list_events(calendar_id, params=params)
+
+
+def list_events_merged(
+    auth: AuthConfig,
+    calendar_ids: Iterable[str],
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[dict[str, object]]:
+    return CalendarService(auth).list_events_merged(calendar_ids, params=params, max_workers=max_workers)
+
+
+def recurring_events(
+    auth: AuthConfig,
+    calendar_id: str,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+) -> EventSet:
+    return CalendarService(auth).recurring_events(calendar_id, params=params)
+
+
+def expand_events(
+    auth: AuthConfig,
+    calendar_id: str,
+    time_min: datetime,
+    time_max: datetime,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+) -> Iterator[dict[str, object]]:
+    return CalendarService(auth).expand_events(calendar_id, time_min, time_max, params=params)
 
 
 def get_event(
@@ -77,8 +246,7 @@ def get_event(
     event_id: str,
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}/events/{event_id}")
-    return http.get_json(url, auth.access_token, params=params)
+    return CalendarService(auth).get_event(calendar_id, event_id, params=params)
 
 
 def list_event_instances(
@@ -87,29 +255,90 @@ def list_event_instances(
     event_id: str,
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _calendar_url(f"/calendars/{calendar_id}/events/{event_id}/instances")
-    return http.get_json(url, auth.access_token, params=params)
+    return CalendarService(auth).list_event_instances(calendar_id, event_id, params=params)
+
+
+def watch_events(
+    auth: AuthConfig,
+    calendar_id: str,
+    channel_id: str,
+    address: str,
+    token: str | None = None,
+    ttl_seconds: int | None = None,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+) -> Mapping[str, object]:
+    return CalendarService(auth).watch_events(
+        calendar_id,
+        channel_id,
+        address,
+        token=token,
+        ttl_seconds=ttl_seconds,
+        params=params,
+    )
+
+
+def stop_channel(auth: AuthConfig, channel_id: str, resource_id: str) -> Mapping[str, object]:
+    return CalendarService(auth).stop_channel(channel_id, resource_id)
 
 
 def get_colors(auth: AuthConfig) -> Mapping[str, object]:
-    url = _calendar_url("/colors")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).get_colors()
 
 
 def get_calendar_list_entry(auth: AuthConfig, calendar_id: str) -> Mapping[str, object]:
-    url = _calendar_url(f"/users/me/calendarList/{calendar_id}")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).get_calendar_list_entry(calendar_id)
 
 
 def list_settings(auth: AuthConfig) -> Mapping[str, object]:
-    url = _calendar_url("/users/me/settings")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).list_settings()
 
 
 def get_setting(auth: AuthConfig, setting: str) -> Mapping[str, object]:
-    url = _calendar_url(f"/users/me/settings/{setting}")
-    return http.get_json(url, auth.access_token)
+    return CalendarService(auth).get_setting(setting)
+
+
+def _event_stream(
+    submit: Submit,
+    list_events: Callable[[str, Mapping[str, Sequence[str] | str]], Mapping[str, object]],
+    calendar_id: str,
+    params: Mapping[str, Sequence[str] | str],
+) -> Iterator[dict[str, object]]:
+    first_page = submit(list_events, calendar_id, params)
+
+    def events() -> Iterator[dict[str, object]]:
+        future = first_page
+        while future is not None:
+            page = future.result()
+            token = page.get("nextPageToken")
+            future = (
+                submit(list_events, calendar_id, {**params, "pageToken": token})
+                if isinstance(token, str) and token
+                else None
+            )
+            items = page.get("items", [])
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict):
+                    yield {**item, "calendarId": calendar_id}
+
+    return events()
 
 
-def _calendar_url(path: str) -> str:
-    return f"{CALENDAR_API_BASE}{path}"
+def _start_key(event: Mapping[str, object]) -> tuple[float, str, str]:
+    start = event.get("start")
+    timestamp = 0.0
+    if isinstance(start, dict):
+        value = start.get("dateTime") or start.get("date")
+        if isinstance(value, str):
+            try:
+                parsed = (
+                    datetime.fromisoformat(value)
+                    if "T" in value
+                    else datetime.combine(date.fromisoformat(value), datetime.min.time())
+                )
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                timestamp = parsed.timestamp()
+    return timestamp, str(event.get("calendarId", "")), str(event.get("id", ""))
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import gzip
+import hashlib
+from io import BytesIO
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from wolper_google import http
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMiss(LookupError):
+    def __init__(self, method: str, url: str) -> None:
+        super().__init__(f"No recorded interaction for {method.upper()} {url}")
+        self.method = method.upper()
+        self.url = url
+
+
+@dataclass
+class Interaction:
+    key: str
+    method: str
+    url: str
+    status: int
+    reason: str
+    body: str
+    elapsed: float
+
+    def payload(self) -> bytes:
+        return base64.b64decode(self.body)
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = "replay",
+        latency: str | float | None = "recorded",
+    ) -> None:
+        if mode not in CASSETTE_MODES:
+            message = f"Unknown cassette mode: {mode}"
+            raise ValueError(message)
+        self.path = Path(path).expanduser()
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions: dict[str, list[Interaction]] = {}
+        self._cursor: dict[str, int] = {}
+        if mode == "replay":
+            self._load()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._interactions.values())
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        network: Callable[[], Iterator[bytes]],
+    ) -> Iterator[bytes]:
+        key = request_key(method, url, body)
+        if self.mode == "replay":
+            return iter([self._replay(key, method, url)])
+        return self._record(key, method, url, network)
+
+    def save(self) -> None:
+        with self._lock:
+            interactions = [asdict(item) for items in self._interactions.values() for item in items]
+        payload = {"version": CASSETTE_VERSION, "interactions": interactions}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with gzip.open(temp_path, "wt", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(temp_path, self.path)
+
+    def _replay(self, key: str, method: str, url: str) -> bytes:
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise CassetteMiss(method, url)
+            position = self._cursor.get(key, 0)
+            self._cursor[key] = position + 1
+            interaction = recorded[min(position, len(recorded) - 1)]
+        self._sleep(interaction.elapsed)
+        payload = interaction.payload()
+        if interaction.status >= 400:
+            raise HTTPError(interaction.url, interaction.status, interaction.reason, None, BytesIO(payload))
+        return payload
+
+    def _record(
+        self,
+        key: str,
+        method: str,
+        url: str,
+        network: Callable[[], Iterator[bytes]],
+    ) -> Iterator[bytes]:
+        started = time.monotonic()
+        chunks: list[bytes] = []
+        status, reason = 200, "OK"
+        try:
+            for chunk in network():
+                chunks.append(chunk)
+                yield chunk
+        except HTTPError as exc:
+            status, reason = exc.code, str(exc.reason)
+            chunks = [exc.read()]
+            self._add(key, method, url, status, reason, chunks, started)
+            raise HTTPError(url, status, reason, exc.headers, BytesIO(chunks[0])) from exc
+        self._add(key, method, url, status, reason, chunks, started)
+
+    def _add(
+        self,
+        key: str,
+        method: str,
+        url: str,
+        status: int,
+        reason: str,
+        chunks: list[bytes],
+        started: float,
+    ) -> None:
+        interaction = Interaction(
+            key=key,
+            method=method,
+            url=url,
+            status=status,
+            reason=reason,
+            body=base64.b64encode(b"".join(chunks)).decode("ascii"),
+            elapsed=round(time.monotonic() - started, 6),
+        )
+        with self._lock:
+            self._interactions.setdefault(key, []).append(interaction)
+
+    def _sleep(self, recorded: float) -> None:
+        if self.latency == "recorded":
+            delay = recorded
+        elif isinstance(self.latency, (int, float)):
+            delay = float(self.latency)
+        else:
+            delay = 0.0
+        if delay <= 0:
+            return
+        scope = http.current_scope()
+        remaining = scope.remaining() if scope is not None else None
+        if remaining is not None and remaining < delay:
+            time.sleep(max(0.0, remaining))
+            message = "Operation deadline exceeded"
+            raise http.DeadlineExceeded(message)
+        time.sleep(delay)
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if not isinstance(payload, dict) or payload.get("version") != CASSETTE_VERSION:
+            message = f"Unsupported cassette file: {self.path}"
+            raise ValueError(message)
+        for item in payload.get("interactions", []):
+            interaction = Interaction(**item)
+            self._interactions.setdefault(interaction.key, []).append(interaction)
+
+
+def request_key(method: str, url: str, body: bytes | None = None) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+    digest = hashlib.sha256(body or b"").hexdigest()[:16]
+    return f"{method.upper()} {normalized} {digest}"
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path,
+    mode: str = "replay",
+    latency: str | float | None = "recorded",
+) -> Iterator[Cassette]:
+    cassette = Cassette(path, mode=mode, latency=latency)
+    http.set_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        http.set_cassette(None)
+        if mode == "record":
+            cassette.save()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+from types import TracebackType
+
+from wolper_google import http
+from wolper_google.auth import AuthConfig, read_auth_file
+from wolper_google.calendar import CalendarService
+from wolper_google.gmail import GmailService
+from wolper_google.session import DEFAULT_CACHE_SIZE, AuthSource, Session, SessionStats
+
+
+class Client:
+    def __init__(
+        self,
+        auth: AuthSource | None = None,
+        auth_file: str | Path | None = None,
+        session: Session | None = None,
+        timeouts: http.Timeouts | None = None,
+        max_in_flight: int | None = None,
+        cache_ttl: float | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.session = session or Session(
+            timeouts=timeouts,
+            max_in_flight=max_in_flight,
+            cache_ttl=cache_ttl,
+            cache_size=cache_size,
+        )
+        self._auth = auth
+        self._auth_file = auth_file
+        self._loaded: AuthConfig | None = None
+        self._lock = threading.Lock()
+        self.gmail = GmailService(self.get_auth, self.session)
+        self.calendar = CalendarService(self.get_auth, self.session)
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def get_auth(self) -> AuthConfig:
+        if isinstance(self._auth, AuthConfig):
+            return self._auth
+        if self._auth is not None:
+            return self._auth()
+        with self._lock:
+            if self._loaded is None:
+                self._loaded = read_auth_file(self._auth_file)
+            return self._loaded
+
+    def stats(self) -> SessionStats:
+        return self.session.stats()
+
+    def close(self) -> None:
+        self.session.clear_cache()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import contextvars
+from dataclasses import asdict, dataclass
+import json
+from typing import Any, Generic, TypeVar
+from urllib.error import HTTPError, URLError
+
+from wolper_google import http
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 8
+ON_ERROR_POLICIES = ("continue", "fail-fast")
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+RETRYABLE_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded", "backendError"})
+
+
+@dataclass(frozen=True)
+class ItemError:
+    status: int | None
+    reason: str
+    message: str
+    retryable: bool
+
+    @classmethod
+    def from_exception(cls, exc: BaseException) -> ItemError:
+        if isinstance(exc, HTTPError):
+            reason, message = _google_error(exc)
+            retryable = exc.code in RETRYABLE_STATUSES or reason in RETRYABLE_REASONS
+            return cls(status=exc.code, reason=reason, message=message, retryable=retryable)
+        if isinstance(exc, URLError):
+            return cls(status=None, reason="network", message=str(exc.reason), retryable=True)
+        if isinstance(exc, http.NETWORK_ERRORS):
+            return cls(status=None, reason="network", message=str(exc), retryable=True)
+        if isinstance(exc, TimeoutError):
+            return cls(status=None, reason="timeout", message=str(exc), retryable=True)
+        return cls(status=None, reason=type(exc).__name__, message=str(exc), retryable=False)
+
+    def to_payload(self) -> dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ItemResult(Generic[T, R]):
+    item: T
+    value: R | None = None
+    error: ItemError | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class FanOutSummary:
+    total: int
+    succeeded: int
+    failed: int
+    retryable: int
+
+    @classmethod
+    def of(cls, results: Sequence[ItemResult[Any, Any]]) -> FanOutSummary:
+        errors = [result.error for result in results if result.error is not None]
+        return cls(
+            total=len(results),
+            succeeded=len(results) - len(errors),
+            failed=len(errors),
+            retryable=sum(error.retryable for error in errors),
+        )
+
+    def to_payload(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[R]:
+    pending = list(items)
+    if len(pending) <= 1 or max_workers <= 1:
+        return [func(item) for item in pending]
+    with http.deadline() as scope:
+        context = contextvars.copy_context()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)))
+        futures: list[Future[R]] = [
+            executor.submit(context.copy().run, func, item) for item in pending
+        ]
+        try:
+            wait(futures, return_when=FIRST_EXCEPTION)
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    future.result()
+            return [future.result() for future in futures]
+        except BaseException:
+            scope.cancel()
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def fan_out(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_error: str = "continue",
+) -> list[ItemResult[T, R]]:
+    if on_error not in ON_ERROR_POLICIES:
+        message = f"Unknown error policy: {on_error}"
+        raise ValueError(message)
+
+    def attempt(item: T) -> ItemResult[T, R]:
+        try:
+            return ItemResult(item, value=func(item))
+        except (http.Cancelled, http.DeadlineExceeded):
+            raise
+        except Exception as exc:
+            if on_error == "fail-fast":
+                raise
+            return ItemResult(item, error=ItemError.from_exception(exc))
+
+    return parallel_map(attempt, items, max_workers=max_workers)
+
+
+Submit = Callable[..., Future[Any]]
+
+
+@contextmanager
+def background(max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[Submit]:
+    context = contextvars.copy_context()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        yield lambda func, *args: executor.submit(context.copy().run, func, *args)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _google_error(exc: HTTPError) -> tuple[str, str]:
+    reason = str(exc.reason)
+    message = str(exc.reason)
+    try:
+        payload = json.loads(exc.read() or b"{}")
+    except (OSError, ValueError, AttributeError):
+        return reason, message
+    error = payload.get("error") if isinstance(payload, dict) else None
+    if not isinstance(error, dict):
+        return reason, message
+    details = error.get("errors")
+    first = details[0] if isinstance(details, list) and details and isinstance(details[0], dict) else {}
+    reason = str(first.get("reason") or error.get("status") or reason)
+    message = str(error.get("message") or message)
+    return reason, message
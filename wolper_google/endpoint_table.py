@@ -0,0 +1,1164 @@
+# Generated by scripts/generate_endpoint_table.py from the bundled OpenAPI specs.
+# Do not edit by hand; rerun the generator after updating a spec.
+
+ENDPOINT_SPECS: dict[str, dict[str, object]] = {
+    "calendar.acl.delete": {
+        "service": "calendar",
+        "method": "DELETE",
+        "path": "/calendars/{calendarId}/acl/{ruleId}",
+        "path_params": ("calendarId", "ruleId"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.acl.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}/acl/{ruleId}",
+        "path_params": ("calendarId", "ruleId"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.acl.insert": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/acl",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.acl.list": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}/acl",
+        "path_params": ("calendarId",),
+        "query_params": ("maxResults", "pageToken", "showDeleted", "syncToken"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "items",
+    },
+    "calendar.acl.patch": {
+        "service": "calendar",
+        "method": "PATCH",
+        "path": "/calendars/{calendarId}/acl/{ruleId}",
+        "path_params": ("calendarId", "ruleId"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.acl.update": {
+        "service": "calendar",
+        "method": "PUT",
+        "path": "/calendars/{calendarId}/acl/{ruleId}",
+        "path_params": ("calendarId", "ruleId"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.acl.watch": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/acl/watch",
+        "path_params": ("calendarId",),
+        "query_params": ("maxResults", "pageToken", "showDeleted", "syncToken"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.delete": {
+        "service": "calendar",
+        "method": "DELETE",
+        "path": "/users/me/calendarList/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/users/me/calendarList/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.insert": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/users/me/calendarList",
+        "path_params": (),
+        "query_params": ("colorRgbFormat",),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.list": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/users/me/calendarList",
+        "path_params": (),
+        "query_params": (
+            "maxResults",
+            "minAccessRole",
+            "pageToken",
+            "showDeleted",
+            "showHidden",
+            "syncToken",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "items",
+    },
+    "calendar.calendarList.patch": {
+        "service": "calendar",
+        "method": "PATCH",
+        "path": "/users/me/calendarList/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": ("colorRgbFormat",),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.update": {
+        "service": "calendar",
+        "method": "PUT",
+        "path": "/users/me/calendarList/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": ("colorRgbFormat",),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendarList.watch": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/users/me/calendarList/watch",
+        "path_params": (),
+        "query_params": (
+            "maxResults",
+            "minAccessRole",
+            "pageToken",
+            "showDeleted",
+            "showHidden",
+            "syncToken",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.clear": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/clear",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.delete": {
+        "service": "calendar",
+        "method": "DELETE",
+        "path": "/calendars/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.insert": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars",
+        "path_params": (),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.patch": {
+        "service": "calendar",
+        "method": "PATCH",
+        "path": "/calendars/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.calendars.update": {
+        "service": "calendar",
+        "method": "PUT",
+        "path": "/calendars/{calendarId}",
+        "path_params": ("calendarId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.channels.stop": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/channels/stop",
+        "path_params": (),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.colors.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/colors",
+        "path_params": (),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.delete": {
+        "service": "calendar",
+        "method": "DELETE",
+        "path": "/calendars/{calendarId}/events/{eventId}",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": ("sendNotifications",),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}/events/{eventId}",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": ("alwaysIncludeEmail", "maxAttendees", "timeZone"),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.import": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/events/import",
+        "path_params": ("calendarId",),
+        "query_params": ("supportsAttachments",),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.insert": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/events",
+        "path_params": ("calendarId",),
+        "query_params": ("maxAttendees", "sendNotifications", "supportsAttachments"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.instances": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}/events/{eventId}/instances",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": (
+            "alwaysIncludeEmail",
+            "maxAttendees",
+            "maxResults",
+            "originalStart",
+            "pageToken",
+            "showDeleted",
+            "timeMax",
+            "timeMin",
+            "timeZone",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "items",
+    },
+    "calendar.events.list": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/calendars/{calendarId}/events",
+        "path_params": ("calendarId",),
+        "query_params": (
+            "alwaysIncludeEmail",
+            "iCalUID",
+            "maxAttendees",
+            "maxResults",
+            "orderBy",
+            "pageToken",
+            "privateExtendedProperty",
+            "q",
+            "sharedExtendedProperty",
+            "showDeleted",
+            "showHiddenInvitations",
+            "singleEvents",
+            "syncToken",
+            "timeMax",
+            "timeMin",
+            "timeZone",
+            "updatedMin",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "items",
+    },
+    "calendar.events.move": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/events/{eventId}/move",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": ("destination", "sendNotifications"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.patch": {
+        "service": "calendar",
+        "method": "PATCH",
+        "path": "/calendars/{calendarId}/events/{eventId}",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": (
+            "alwaysIncludeEmail",
+            "maxAttendees",
+            "sendNotifications",
+            "supportsAttachments",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.quickAdd": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/events/quickAdd",
+        "path_params": ("calendarId",),
+        "query_params": ("sendNotifications", "text"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.update": {
+        "service": "calendar",
+        "method": "PUT",
+        "path": "/calendars/{calendarId}/events/{eventId}",
+        "path_params": ("calendarId", "eventId"),
+        "query_params": (
+            "alwaysIncludeEmail",
+            "maxAttendees",
+            "sendNotifications",
+            "supportsAttachments",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.events.watch": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/calendars/{calendarId}/events/watch",
+        "path_params": ("calendarId",),
+        "query_params": (
+            "alwaysIncludeEmail",
+            "iCalUID",
+            "maxAttendees",
+            "maxResults",
+            "orderBy",
+            "pageToken",
+            "privateExtendedProperty",
+            "q",
+            "sharedExtendedProperty",
+            "showDeleted",
+            "showHiddenInvitations",
+            "singleEvents",
+            "syncToken",
+            "timeMax",
+            "timeMin",
+            "timeZone",
+            "updatedMin",
+        ),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.freebusy.query": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/freeBusy",
+        "path_params": (),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.settings.get": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/users/me/settings/{setting}",
+        "path_params": ("setting",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "calendar.settings.list": {
+        "service": "calendar",
+        "method": "GET",
+        "path": "/users/me/settings",
+        "path_params": (),
+        "query_params": ("maxResults", "pageToken", "syncToken"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "items",
+    },
+    "calendar.settings.watch": {
+        "service": "calendar",
+        "method": "POST",
+        "path": "/users/me/settings/watch",
+        "path_params": (),
+        "query_params": ("maxResults", "pageToken", "syncToken"),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.drafts.create": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/drafts",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.drafts.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/drafts/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.drafts.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/drafts/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": ("format",),
+        "quota_cost": 5,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.drafts.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/drafts",
+        "path_params": ("userId",),
+        "query_params": ("includeSpamTrash", "maxResults", "pageToken", "q"),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "drafts",
+    },
+    "gmail.users.drafts.send": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/drafts/send",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 100,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.drafts.update": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/drafts/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 15,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.getProfile": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/profile",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.history.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/history",
+        "path_params": ("userId",),
+        "query_params": ("historyTypes", "labelId", "maxResults", "pageToken", "startHistoryId"),
+        "quota_cost": 2,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "history",
+    },
+    "gmail.users.labels.create": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/labels",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.labels.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/labels/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.labels.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/labels/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.labels.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/labels",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": "labels",
+    },
+    "gmail.users.labels.patch": {
+        "service": "gmail",
+        "method": "PATCH",
+        "path": "/{userId}/labels/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.labels.update": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/labels/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.attachments.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/messages/{messageId}/attachments/{id}",
+        "path_params": ("userId", "messageId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.batchDelete": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/batchDelete",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 50,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.batchModify": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/batchModify",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 50,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/messages/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/messages/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": ("format", "metadataHeaders"),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.import": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/import",
+        "path_params": ("userId",),
+        "query_params": ("deleted", "internalDateSource", "neverMarkSpam", "processForCalendar"),
+        "quota_cost": 25,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.insert": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages",
+        "path_params": ("userId",),
+        "query_params": ("deleted", "internalDateSource"),
+        "quota_cost": 25,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/messages",
+        "path_params": ("userId",),
+        "query_params": ("includeSpamTrash", "labelIds", "maxResults", "pageToken", "q"),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "messages",
+    },
+    "gmail.users.messages.modify": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/{id}/modify",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.send": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/send",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 100,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.trash": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/{id}/trash",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.messages.untrash": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/messages/{id}/untrash",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 5,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.filters.create": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/filters",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.filters.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/settings/filters/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.filters.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/filters/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.filters.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/filters",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": "filter",
+    },
+    "gmail.users.settings.forwardingAddresses.create": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/forwardingAddresses",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.forwardingAddresses.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/settings/forwardingAddresses/{forwardingEmail}",
+        "path_params": ("userId", "forwardingEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.forwardingAddresses.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/forwardingAddresses/{forwardingEmail}",
+        "path_params": ("userId", "forwardingEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.forwardingAddresses.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/forwardingAddresses",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": "forwardingAddresses",
+    },
+    "gmail.users.settings.getAutoForwarding": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/autoForwarding",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.getImap": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/imap",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.getPop": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/pop",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.getVacation": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/vacation",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.create": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/sendAs",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/sendAs",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": "sendAs",
+    },
+    "gmail.users.settings.sendAs.patch": {
+        "service": "gmail",
+        "method": "PATCH",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.smimeInfo.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/smimeInfo/{id}",
+        "path_params": ("userId", "sendAsEmail", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.smimeInfo.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/smimeInfo/{id}",
+        "path_params": ("userId", "sendAsEmail", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": True,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.smimeInfo.insert": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/smimeInfo",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.smimeInfo.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/smimeInfo",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": "smimeInfo",
+    },
+    "gmail.users.settings.sendAs.smimeInfo.setDefault": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/smimeInfo/{id}/setDefault",
+        "path_params": ("userId", "sendAsEmail", "id"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.update": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.sendAs.verify": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/settings/sendAs/{sendAsEmail}/verify",
+        "path_params": ("userId", "sendAsEmail"),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.updateAutoForwarding": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/settings/autoForwarding",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.updateImap": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/settings/imap",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.updatePop": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/settings/pop",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.settings.updateVacation": {
+        "service": "gmail",
+        "method": "PUT",
+        "path": "/{userId}/settings/vacation",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 1,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.stop": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/stop",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 50,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.threads.delete": {
+        "service": "gmail",
+        "method": "DELETE",
+        "path": "/{userId}/threads/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 20,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.threads.get": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/threads/{id}",
+        "path_params": ("userId", "id"),
+        "query_params": ("format", "metadataHeaders"),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.threads.list": {
+        "service": "gmail",
+        "method": "GET",
+        "path": "/{userId}/threads",
+        "path_params": ("userId",),
+        "query_params": ("includeSpamTrash", "labelIds", "maxResults", "pageToken", "q"),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": True,
+        "items_key": "threads",
+    },
+    "gmail.users.threads.modify": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/threads/{id}/modify",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.threads.trash": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/threads/{id}/trash",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.threads.untrash": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/threads/{id}/untrash",
+        "path_params": ("userId", "id"),
+        "query_params": (),
+        "quota_cost": 10,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+    "gmail.users.watch": {
+        "service": "gmail",
+        "method": "POST",
+        "path": "/{userId}/watch",
+        "path_params": ("userId",),
+        "query_params": (),
+        "quota_cost": 100,
+        "cacheable": False,
+        "paginated": False,
+        "items_key": None,
+    },
+}
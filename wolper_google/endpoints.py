@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+import os
+
+from wolper_google.auth import AuthConfig
+from wolper_google import http
+from wolper_google.endpoint_table import ENDPOINT_SPECS
+from wolper_google.streaming import ItemStream
+
+API_BASES = {
+    "gmail": os.environ.get("WOLPER_GOOGLE_GMAIL_API_BASE", "https://gmail.googleapis.com/gmail/v1/users"),
+    "calendar": os.environ.get("WOLPER_GOOGLE_CALENDAR_API_BASE", "https://www.googleapis.com/calendar/v3"),
+}
+DEFAULT_PATH_VALUES = {"userId": "me"}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    service: str
+    method: str
+    path: str
+    path_params: tuple[str, ...]
+    query_params: tuple[str, ...]
+    quota_cost: int
+    cacheable: bool
+    paginated: bool
+    items_key: str | None
+
+    def url(self, **path_values: str) -> str:
+        values = {**DEFAULT_PATH_VALUES, **path_values}
+        missing = [name for name in self.path_params if name not in values]
+        if missing:
+            message = f"Missing path parameters for {self.name}: {', '.join(missing)}"
+            raise ValueError(message)
+        path = self.path
+        for name in self.path_params:
+            path = path.replace(f"{{{name}}}", str(values[name]))
+        return f"{API_BASES[self.service]}{path}"
+
+
+ENDPOINTS: dict[str, Endpoint] = {
+    name: Endpoint(name=name, **spec) for name, spec in ENDPOINT_SPECS.items()  # type: ignore[arg-type]
+}
+
+
+def get(name: str) -> Endpoint:
+    endpoint = ENDPOINTS.get(name)
+    if endpoint is None:
+        message = f"Unknown endpoint: {name}"
+        raise ValueError(message)
+    return endpoint
+
+
+def url(name: str, **path_values: str) -> str:
+    return get(name).url(**path_values)
+
+
+@contextmanager
+def api_bases(**bases: str) -> Iterator[dict[str, str]]:
+    unknown = sorted(set(bases) - set(API_BASES))
+    if unknown:
+        message = f"Unknown API service: {', '.join(unknown)}"
+        raise ValueError(message)
+    previous = dict(API_BASES)
+    API_BASES.update(bases)
+    try:
+        yield API_BASES
+    finally:
+        API_BASES.clear()
+        API_BASES.update(previous)
+
+
+def for_service(service: str) -> Iterable[Endpoint]:
+    return (endpoint for endpoint in ENDPOINTS.values() if endpoint.service == service)
+
+
+def call(
+    auth: AuthConfig,
+    name: str,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    body: Mapping[str, object] | None = None,
+    **path_values: str,
+) -> Mapping[str, object]:
+    endpoint = get(name)
+    request_url = endpoint.url(**path_values)
+    if endpoint.method == "GET":
+        return http.get_json(request_url, auth.access_token, params=params)
+    if endpoint.method == "POST":
+        return http.post_json(request_url, auth.access_token, body, params=params)
+    message = f"Unsupported method {endpoint.method} for {name}"
+    raise ValueError(message)
+
+
+def stream(
+    auth: AuthConfig,
+    name: str,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    **path_values: str,
+) -> ItemStream:
+    endpoint = get(name)
+    if endpoint.method != "GET" or endpoint.items_key is None:
+        message = f"{name} does not return an item list"
+        raise ValueError(message)
+    return http.stream_json(
+        endpoint.url(**path_values),
+        auth.access_token,
+        endpoint.items_key,
+        params=params,
+    )
+
+
+def iter_items(
+    auth: AuthConfig,
+    name: str,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    **path_values: str,
+) -> Iterator[object]:
+    page_params: dict[str, Sequence[str] | str] = dict(params or {})
+    while True:
+        with stream(auth, name, page_params, **path_values) as items:
+            yield from items
+            token = items.page.get("nextPageToken")
+        if not isinstance(token, str) or not token:
+            return
+        page_params = {**page_params, "pageToken": token}
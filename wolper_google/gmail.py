@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from email.header import decode_header, make_header
+from email.utils import getaddresses
 from typing import Iterable, Mapping, Sequence
 
 from wolper_google.auth import AuthConfig
-from wolper_google import http
+from wolper_google import endpoints
+from wolper_google.concurrency import DEFAULT_MAX_WORKERS, parallel_map
+from wolper_google.session import AuthSource, Session, default_session
 
-GMAIL_API_BASE = "https://gmail.googleapis.com/gmail/v1/users"
+GMAIL_API_BASE = endpoints.API_BASES["gmail"]
 GMAIL_LABELS_URL = f"{GMAIL_API_BASE}/me/labels"
+TRIAGE_HEADERS = ("From", "To", "Subject", "Date", "Message-ID")
+PAYLOAD_FORMATS = ("minimal", "metadata", "full", "raw")
+ADDRESS_HEADERS = frozenset({"from", "to", "cc", "bcc", "reply-to", "sender"})
 
 
 @dataclass(frozen=True)
@@ -22,7 +29,7 @@ class Mailbox:
 
     @classmethod
     def list_raw(cls, auth: AuthConfig) -> Mapping[str, object]:
-        payload = http.get_json(GMAIL_LABELS_URL, auth.access_token)
+        payload = GmailService(auth).list_labels()
         if not isinstance(payload, dict):
             message = "Invalid gmail labels response"
             raise ValueError(message)
@@ -43,18 +50,333 @@ class Mailbox:
                 yield cls(mailbox_id=mailbox_id, name=name)
 
 
+@dataclass(frozen=True)
+class MessageHeaders:
+    message_id: str
+    thread_id: str
+    headers: Mapping[str, str]
+    addresses: Mapping[str, tuple[tuple[str, str], ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: Mapping[str, object],
+        wanted: Sequence[str] = TRIAGE_HEADERS,
+    ) -> MessageHeaders:
+        message_id = payload.get("id", "")
+        thread_id = payload.get("threadId", "")
+        wanted_keys = {name.lower(): name for name in wanted}
+        headers: dict[str, str] = {}
+        addresses: dict[str, tuple[tuple[str, str], ...]] = {}
+        root = payload.get("payload", {})
+        raw_headers = root.get("headers", []) if isinstance(root, dict) else []
+        for header in raw_headers if isinstance(raw_headers, list) else []:
+            if not isinstance(header, dict):
+                continue
+            name = header.get("name")
+            value = header.get("value")
+            if not isinstance(name, str) or not isinstance(value, str):
+                continue
+            key = name.lower()
+            if key not in wanted_keys or wanted_keys[key] in headers:
+                continue
+            decoded = decode_header_value(value)
+            headers[wanted_keys[key]] = decoded
+            if key in ADDRESS_HEADERS:
+                addresses[wanted_keys[key]] = tuple(getaddresses([decoded]))
+        return cls(
+            message_id=message_id if isinstance(message_id, str) else "",
+            thread_id=thread_id if isinstance(thread_id, str) else "",
+            headers=headers,
+            addresses=addresses,
+        )
+
+
+def decode_header_value(value: str) -> str:
+    if "=?" not in value:
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except (LookupError, UnicodeDecodeError, ValueError):
+        return value
+
+
+class GmailService:
+    def __init__(self, auth: AuthSource, session: Session | None = None) -> None:
+        self.auth = auth
+        self.session = session or default_session()
+
+    def get_headers(
+        self,
+        message_ids: Iterable[str],
+        headers: Sequence[str] = TRIAGE_HEADERS,
+        user_id: str = "me",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> list[MessageHeaders]:
+        return parallel_map(
+            lambda message_id: self.get_message_headers(message_id, headers, user_id=user_id),
+            message_ids,
+            max_workers=max_workers,
+        )
+
+    def get_message_headers(
+        self,
+        message_id: str,
+        headers: Sequence[str] = TRIAGE_HEADERS,
+        user_id: str = "me",
+    ) -> MessageHeaders:
+        params: dict[str, Sequence[str] | str] = {
+            "format": "metadata",
+            "metadataHeaders": list(headers),
+        }
+        payload = self.get_message(message_id, user_id=user_id, params=params)
+        return MessageHeaders.from_payload(payload, headers)
+
+    def list_drafts(
+        self,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.drafts.list", params, userId=user_id)
+
+    def get_draft(
+        self,
+        draft_id: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.drafts.get", params, userId=user_id, id=draft_id)
+
+    def get_drafts(
+        self,
+        draft_ids: Iterable[str],
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> list[Mapping[str, object]]:
+        return parallel_map(
+            lambda draft_id: self.get_draft(draft_id, user_id=user_id, params=params),
+            draft_ids,
+            max_workers=max_workers,
+        )
+
+    def list_history(
+        self,
+        start_history_id: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        merged_params: dict[str, Sequence[str] | str] = {}
+        if params:
+            merged_params.update(params)
+        merged_params["startHistoryId"] = start_history_id
+        return self._get("gmail.users.history.list", merged_params, userId=user_id)
+
+    def list_labels(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.labels.list", userId=user_id)
+
+    def get_label(self, label_id: str, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.labels.get", userId=user_id, id=label_id)
+
+    def get_labels(
+        self,
+        label_ids: Iterable[str],
+        user_id: str = "me",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> list[Mapping[str, object]]:
+        return parallel_map(
+            lambda label_id: self.get_label(label_id, user_id=user_id),
+            label_ids,
+            max_workers=max_workers,
+        )
+
+    def list_messages(
+        self,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.messages.list", params, userId=user_id)
+
+    def get_message(
+        self,
+        message_id: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.messages.get", params, userId=user_id, id=message_id)
+
+    def get_message_attachment(
+        self,
+        message_id: str,
+        attachment_id: str,
+        user_id: str = "me",
+    ) -> Mapping[str, object]:
+        return self._get(
+            "gmail.users.messages.attachments.get",
+            userId=user_id,
+            messageId=message_id,
+            id=attachment_id,
+        )
+
+    def get_profile(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.getProfile", userId=user_id)
+
+    def get_settings_auto_forwarding(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.getAutoForwarding", userId=user_id)
+
+    def list_settings_filters(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.filters.list", userId=user_id)
+
+    def get_settings_filter(self, filter_id: str, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.filters.get", userId=user_id, id=filter_id)
+
+    def list_settings_forwarding_addresses(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.forwardingAddresses.list", userId=user_id)
+
+    def get_settings_forwarding_address(
+        self,
+        forwarding_email: str,
+        user_id: str = "me",
+    ) -> Mapping[str, object]:
+        return self._get(
+            "gmail.users.settings.forwardingAddresses.get",
+            userId=user_id,
+            forwardingEmail=forwarding_email,
+        )
+
+    def get_settings_imap(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.getImap", userId=user_id)
+
+    def get_settings_pop(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.getPop", userId=user_id)
+
+    def list_settings_send_as(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.sendAs.list", userId=user_id)
+
+    def get_settings_send_as(self, send_as_email: str, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.sendAs.get", userId=user_id, sendAsEmail=send_as_email)
+
+    def list_settings_smime_info(self, send_as_email: str, user_id: str = "me") -> Mapping[str, object]:
+        return self._get(
+            "gmail.users.settings.sendAs.smimeInfo.list",
+            userId=user_id,
+            sendAsEmail=send_as_email,
+        )
+
+    def get_settings_smime_info(
+        self,
+        send_as_email: str,
+        smime_id: str,
+        user_id: str = "me",
+    ) -> Mapping[str, object]:
+        return self._get(
+            "gmail.users.settings.sendAs.smimeInfo.get",
+            userId=user_id,
+            sendAsEmail=send_as_email,
+            id=smime_id,
+        )
+
+    def get_settings_vacation(self, user_id: str = "me") -> Mapping[str, object]:
+        return self._get("gmail.users.settings.getVacation", userId=user_id)
+
+    def list_threads(
+        self,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.threads.list", params, userId=user_id)
+
+    def get_thread(
+        self,
+        thread_id: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self._get("gmail.users.threads.get", params, userId=user_id, id=thread_id)
+
+    def get_threads(
+        self,
+        thread_ids: Iterable[str],
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> list[Mapping[str, object]]:
+        return parallel_map(
+            lambda thread_id: self.get_thread(thread_id, user_id=user_id, params=params),
+            thread_ids,
+            max_workers=max_workers,
+        )
+
+    def watch(
+        self,
+        topic_name: str,
+        label_ids: Sequence[str] | None = None,
+        label_filter_behavior: str | None = None,
+        user_id: str = "me",
+    ) -> Mapping[str, object]:
+        body: dict[str, object] = {"topicName": topic_name}
+        if label_ids:
+            body["labelIds"] = list(label_ids)
+        if label_filter_behavior:
+            body["labelFilterBehavior"] = label_filter_behavior
+        return self.session.post_json("gmail.users.watch", self.auth, body, userId=user_id)
+
+    def stop_watch(self, user_id: str = "me") -> Mapping[str, object]:
+        return self.session.post_json("gmail.users.stop", self.auth, userId=user_id)
+
+    def _get(
+        self,
+        name: str,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        **path_values: str,
+    ) -> Mapping[str, object]:
+        return self.session.get_json(name, self.auth, params, **path_values)
+
+
+def get_headers(
+    auth: AuthConfig,
+    message_ids: Iterable[str],
+    headers: Sequence[str] = TRIAGE_HEADERS,
+    user_id: str = "me",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[MessageHeaders]:
+    return GmailService(auth).get_headers(message_ids, headers, user_id=user_id, max_workers=max_workers)
+
+
+def get_message_headers(
+    auth: AuthConfig,
+    message_id: str,
+    headers: Sequence[str] = TRIAGE_HEADERS,
+    user_id: str = "me",
+) -> MessageHeaders:
+    return GmailService(auth).get_message_headers(message_id, headers, user_id=user_id)
+
+
 def list_drafts(
     auth: AuthConfig,
     user_id: str = "me",
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/drafts")
-    return http.get_json(url, auth.access_token, params=params)
+    return GmailService(auth).list_drafts(user_id=user_id, params=params)
+
+
+def get_draft(
+    auth: AuthConfig,
+    draft_id: str,
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+) -> Mapping[str, object]:
+    return GmailService(auth).get_draft(draft_id, user_id=user_id, params=params)
 
 
-def get_draft(auth: AuthConfig, draft_id: str, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/drafts/{draft_id}")
-    return http.get_json(url, auth.access_token)
+def get_drafts(
+    auth: AuthConfig,
+    draft_ids: Iterable[str],
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[Mapping[str, object]]:
+    return GmailService(auth).get_drafts(draft_ids, user_id=user_id, params=params, max_workers=max_workers)
 
 
 def list_history(
@@ -63,22 +385,24 @@ def list_history(
     user_id: str = "me",
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    merged_params: dict[str, Sequence[str] | str] = {}
-    if params:
-        merged_params.update(params)
-    merged_params["startHistoryId"] = start_history_id
-    url = _gmail_url(user_id, "/history")
-    return http.get_json(url, auth.access_token, params=merged_params)
+    return GmailService(auth).list_history(start_history_id, user_id=user_id, params=params)
 
 
 def list_labels(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/labels")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).list_labels(user_id=user_id)
 
 
 def get_label(auth: AuthConfig, label_id: str, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/labels/{label_id}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_label(label_id, user_id=user_id)
+
+
+def get_labels(
+    auth: AuthConfig,
+    label_ids: Iterable[str],
+    user_id: str = "me",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[Mapping[str, object]]:
+    return GmailService(auth).get_labels(label_ids, user_id=user_id, max_workers=max_workers)
 
 
 def list_messages(
@@ -86,8 +410,7 @@ def list_messages(
     user_id: str = "me",
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/messages")
-    return http.get_json(url, auth.access_token, params=params)
+    return GmailService(auth).list_messages(user_id=user_id, params=params)
 
 
 def get_message(
@@ -96,8 +419,7 @@ def get_message(
     user_id: str = "me",
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/messages/{message_id}")
-    return http.get_json(url, auth.access_token, params=params)
+    return GmailService(auth).get_message(message_id, user_id=user_id, params=params)
 
 
 def get_message_attachment(
@@ -106,33 +428,27 @@ def get_message_attachment(
     attachment_id: str,
     user_id: str = "me",
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/messages/{message_id}/attachments/{attachment_id}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_message_attachment(message_id, attachment_id, user_id=user_id)
 
 
 def get_profile(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/profile")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_profile(user_id=user_id)
 
 
 def get_settings_auto_forwarding(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/autoForwarding")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_auto_forwarding(user_id=user_id)
 
 
 def list_settings_filters(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/filters")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).list_settings_filters(user_id=user_id)
 
 
 def get_settings_filter(auth: AuthConfig, filter_id: str, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/settings/filters/{filter_id}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_filter(filter_id, user_id=user_id)
 
 
 def list_settings_forwarding_addresses(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/forwardingAddresses")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).list_settings_forwarding_addresses(user_id=user_id)
 
 
 def get_settings_forwarding_address(
@@ -140,23 +456,19 @@ def get_settings_forwarding_address(
     forwarding_email: str,
     user_id: str = "me",
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/settings/forwardingAddresses/{forwarding_email}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_forwarding_address(forwarding_email, user_id=user_id)
 
 
 def get_settings_imap(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/imap")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_imap(user_id=user_id)
 
 
 def get_settings_pop(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/pop")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_pop(user_id=user_id)
 
 
 def list_settings_send_as(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/sendAs")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).list_settings_send_as(user_id=user_id)
 
 
 def get_settings_send_as(
@@ -164,8 +476,7 @@ def get_settings_send_as(
     send_as_email: str,
     user_id: str = "me",
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/settings/sendAs/{send_as_email}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_send_as(send_as_email, user_id=user_id)
 
 
 def list_settings_smime_info(
@@ -173,8 +484,7 @@ def list_settings_smime_info(
     send_as_email: str,
     user_id: str = "me",
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/settings/sendAs/{send_as_email}/smimeInfo")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).list_settings_smime_info(send_as_email, user_id=user_id)
 
 
 def get_settings_smime_info(
@@ -183,13 +493,11 @@ def get_settings_smime_info(
     smime_id: str,
     user_id: str = "me",
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/settings/sendAs/{send_as_email}/smimeInfo/{smime_id}")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_smime_info(send_as_email, smime_id, user_id=user_id)
 
 
 def get_settings_vacation(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/settings/vacation")
-    return http.get_json(url, auth.access_token)
+    return GmailService(auth).get_settings_vacation(user_id=user_id)
 
 
 def list_threads(
@@ -197,14 +505,53 @@ def list_threads(
     user_id: str = "me",
     params: Mapping[str, Sequence[str] | str] | None = None,
 ) -> Mapping[str, object]:
-    url = _gmail_url(user_id, "/threads")
-    return http.get_json(url, auth.access_token, params=params)
+    return GmailService(auth).list_threads(user_id=user_id, params=params)
+
+
+def get_thread(
+    auth: AuthConfig,
+    thread_id: str,
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+) -> Mapping[str, object]:
+    return GmailService(auth).get_thread(thread_id, user_id=user_id, params=params)
 
 
-def get_thread(auth: AuthConfig, thread_id: str, user_id: str = "me") -> Mapping[str, object]:
-    url = _gmail_url(user_id, f"/threads/{thread_id}")
-    return http.get_json(url, auth.access_token)
+def get_threads(
+    auth: AuthConfig,
+    thread_ids: Iterable[str],
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[Mapping[str, object]]:
+    return GmailService(auth).get_threads(thread_ids, user_id=user_id, params=params, max_workers=max_workers)
+
+
+def payload_params(
+    payload_format: str,
+    headers: Sequence[str] | None = None,
+    fields: str | None = None,
+) -> dict[str, Sequence[str] | str]:
+    if payload_format not in PAYLOAD_FORMATS:
+        message = f"Invalid payload format: {payload_format}"
+        raise ValueError(message)
+    params: dict[str, Sequence[str] | str] = {"format": payload_format}
+    if headers and payload_format == "metadata":
+        params["metadataHeaders"] = list(headers)
+    if fields:
+        params["fields"] = fields
+    return params
+
+
+def watch(
+    auth: AuthConfig,
+    topic_name: str,
+    label_ids: Sequence[str] | None = None,
+    label_filter_behavior: str | None = None,
+    user_id: str = "me",
+) -> Mapping[str, object]:
+    return GmailService(auth).watch(topic_name, label_ids, label_filter_behavior, user_id=user_id)
 
 
-def _gmail_url(user_id: str, path: str) -> str:
-    return f"{GMAIL_API_BASE}/{user_id}{path}"
+def stop_watch(auth: AuthConfig, user_id: str = "me") -> Mapping[str, object]:
+    return GmailService(auth).stop_watch(user_id=user_id)
@@ -1,26 +1,621 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+import copy
+from dataclasses import dataclass, replace
+from email.message import Message
+from http.client import HTTPConnection, HTTPSConnection
+from io import BytesIO
+import base64
 import json
-from collections.abc import Mapping, Sequence
+import socket
+import threading
+import time
 from typing import Any
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+from urllib.parse import SplitResult, unquote, urlencode, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+import zlib
+
+from wolper_google import profiling
+from wolper_google.streaming import ItemStream
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import h2  # type: ignore[import-not-found]  # noqa: F401
+    import httpx  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+READ_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "wolper-google/0.1.0 (gzip)"
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+DEFAULT_HTTP2_STREAMS = 100
+SINGLE_FLIGHT_POLL_SECONDS = 0.05
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+NETWORK_ERRORS = (URLError, ConnectionError, socket.gaierror)
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    connect: float = 10.0
+    read: float = 20.0
+    total: float | None = None
+
+
+DEFAULT_TIMEOUTS = Timeouts()
+
+
+class Cancelled(Exception):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CancelScope:
+    def __init__(
+        self,
+        deadline: float | None = None,
+        parent: CancelScope | None = None,
+        timeouts: Timeouts | None = None,
+    ) -> None:
+        self.deadline = deadline
+        self.timeouts = timeouts if timeouts is not None else parent.timeouts if parent else None
+        self._parent = parent
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._connections: set[HTTPConnection] = set()
+        self._children: set[CancelScope] = set()
+        if parent is not None:
+            parent._adopt(self)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled or (self._parent is not None and self._parent.cancelled)
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self) -> None:
+        if self.cancelled:
+            message = "Operation cancelled"
+            raise Cancelled(message)
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            message = "Operation deadline exceeded"
+            raise DeadlineExceeded(message)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            connections = list(self._connections)
+            children = list(self._children)
+        for connection in connections:
+            _abort(connection)
+        for child in children:
+            child.cancel()
+
+    def _adopt(self, child: CancelScope) -> None:
+        with self._lock:
+            self._children.add(child)
+
+    def _release(self, child: CancelScope) -> None:
+        with self._lock:
+            self._children.discard(child)
+
+    def _register(self, connection: HTTPConnection) -> None:
+        with self._lock:
+            self._connections.add(connection)
+        if self.cancelled:
+            _abort(connection)
+
+    def _unregister(self, connection: HTTPConnection) -> None:
+        with self._lock:
+            self._connections.discard(connection)
+
+    def _close(self) -> None:
+        if self._parent is not None:
+            self._parent._release(self)
+
+
+@dataclass(frozen=True)
+class TransferStats:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    coalesced: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.wire_bytes:
+            return 1.0
+        return self.decoded_bytes / self.wire_bytes
+
+
+class _TransferCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = TransferStats()
+
+    def record(self, wire_bytes: int, decoded_bytes: int) -> None:
+        with self._lock:
+            self._stats = replace(
+                self._stats,
+                requests=self._stats.requests + 1,
+                wire_bytes=self._stats.wire_bytes + wire_bytes,
+                decoded_bytes=self._stats.decoded_bytes + decoded_bytes,
+            )
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self._stats = replace(self._stats, coalesced=self._stats.coalesced + 1)
+
+    def snapshot(self) -> TransferStats:
+        with self._lock:
+            return self._stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = TransferStats()
+
+
+_transfer_counter = _TransferCounter()
+
+
+def transfer_stats() -> TransferStats:
+    return _transfer_counter.snapshot()
+
+
+def reset_transfer_stats() -> None:
+    _transfer_counter.reset()
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Mapping[str, Any] | None = None
+        self.error: BaseException | None = None
+        self.error_body = b""
+        self.followers = 0
+
+
+class _SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[tuple[object, ...], _Call] = {}
+
+    def do(self, key: tuple[object, ...], func: Callable[[], Mapping[str, Any]]) -> Mapping[str, Any]:
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                else:
+                    call.followers += 1
+            if leader:
+                return self._lead(key, call, func)
+            _transfer_counter.record_coalesced()
+            _wait(call.done)
+            if isinstance(call.error, (Cancelled, DeadlineExceeded)):
+                continue
+            if isinstance(call.error, HTTPError):
+                raise _replay_error(call.error, call.error_body)
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result or {})
+
+    def _lead(
+        self,
+        key: tuple[object, ...],
+        call: _Call,
+        func: Callable[[], Mapping[str, Any]],
+    ) -> Mapping[str, Any]:
+        try:
+            call.result = func()
+        except HTTPError as exc:
+            call.error = exc
+            try:
+                call.error_body = exc.read() or b""
+            except (OSError, AttributeError, ValueError):
+                call.error_body = b""
+            raise _replay_error(exc, call.error_body) from None
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                shared = call.followers > 0
+            call.done.set()
+        return copy.deepcopy(call.result) if shared else call.result
+
+
+_single_flight = _SingleFlight()
+
+
+def _replay_error(error: HTTPError, body: bytes) -> HTTPError:
+    return HTTPError(error.url, error.code, error.msg, error.hdrs, BytesIO(body))
+
+
+class _Http2Transport:
+    def __init__(self, max_streams: int, prior_knowledge: bool) -> None:
+        self._client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+        self._streams = threading.BoundedSemaphore(max(1, max_streams))
+
+    def fetch(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        limits: Timeouts,
+        request_deadline: float | None,
+        method: str,
+        body: bytes | None,
+    ) -> bytes:
+        scope = _current_scope.get()
+        timeout = httpx.Timeout(
+            connect=_bounded(limits.connect, request_deadline),
+            read=_bounded(limits.read, request_deadline),
+            write=_bounded(limits.read, request_deadline),
+            pool=_bounded(limits.connect, request_deadline),
+        )
+        request_headers = {"Accept-Encoding": ACCEPT_ENCODING, "User-Agent": USER_AGENT, **headers}
+        try:
+            with self._streams, self._client.stream(
+                method,
+                url,
+                headers=request_headers,
+                content=body,
+                timeout=timeout,
+            ) as response:
+                chunks: list[bytes] = []
+                for chunk in response.iter_bytes(READ_CHUNK_SIZE):
+                    if scope is not None:
+                        scope.check()
+                    _bounded(limits.read, request_deadline)
+                    chunks.append(chunk)
+                payload = b"".join(chunks)
+                _transfer_counter.record(response.num_bytes_downloaded, len(payload))
+        except httpx.TimeoutException as exc:
+            if _expired(request_deadline):
+                message = f"Deadline exceeded for {urlsplit(url).hostname}"
+                raise DeadlineExceeded(message) from exc
+            raise TimeoutError(str(exc)) from exc
+        except httpx.TransportError as exc:
+            raise ConnectionError(str(exc)) from exc
+        if response.status_code >= 400:
+            response_headers = Message()
+            for key, value in response.headers.multi_items():
+                response_headers[key] = value
+            raise HTTPError(
+                url,
+                response.status_code,
+                response.reason_phrase,
+                response_headers,
+                BytesIO(payload),
+            )
+        return payload
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_http2_transport: _Http2Transport | None = None
+_cassette: Any = None
+_http2_lock = threading.Lock()
+
+
+def enable_http2(
+    max_streams: int = DEFAULT_HTTP2_STREAMS,
+    prior_knowledge: bool = False,
+) -> bool:
+    global _http2_transport
+    if httpx is None:
+        return False
+    with _http2_lock:
+        if _http2_transport is not None:
+            _http2_transport.close()
+        _http2_transport = _Http2Transport(max_streams, prior_knowledge)
+    return True
+
+
+def disable_http2() -> None:
+    global _http2_transport
+    with _http2_lock:
+        if _http2_transport is not None:
+            _http2_transport.close()
+        _http2_transport = None
+
+
+def http2_enabled() -> bool:
+    return _http2_transport is not None
+
+
+_current_scope: ContextVar[CancelScope | None] = ContextVar("wolper_google_scope", default=None)
+
+
+@contextmanager
+def deadline(
+    seconds: float | None = None,
+    timeouts: Timeouts | None = None,
+) -> Iterator[CancelScope]:
+    parent = _current_scope.get()
+    limit = time.monotonic() + seconds if seconds is not None else None
+    if parent is not None and parent.deadline is not None:
+        limit = parent.deadline if limit is None else min(limit, parent.deadline)
+    scope = CancelScope(limit, parent, timeouts)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        scope._close()
+
+
+def current_scope() -> CancelScope | None:
+    return _current_scope.get()
+
+
+class RawJSON(Mapping[str, Any]):
+    __slots__ = ("body", "_data")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self._data: dict[str, Any] | None = None
+
+    def decode(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = _decode_object(self.body)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.decode()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.decode())
+
+    def __len__(self) -> int:
+        return len(self.decode())
+
+
+_passthrough: ContextVar[bool] = ContextVar("wolper_google_passthrough", default=False)
+
+
+@contextmanager
+def passthrough() -> Iterator[None]:
+    token = _passthrough.set(True)
+    try:
+        yield
+    finally:
+        _passthrough.reset(token)
 
 
 def get_json(
     url: str,
     token: str,
     params: Mapping[str, Sequence[str] | str] | None = None,
+    timeouts: Timeouts | None = None,
+) -> Mapping[str, Any]:
+    request_url = build_url(url, params)
+    raw = _passthrough.get()
+
+    def load() -> Mapping[str, Any]:
+        body = fetch(request_url, {"Authorization": f"Bearer {token}"}, timeouts)
+        return RawJSON(body) if raw else _decode_object(body)
+
+    return _single_flight.do((request_url, token, raw), load)
+
+
+def stream_json(
+    url: str,
+    token: str,
+    items_key: str,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    timeouts: Timeouts | None = None,
+) -> ItemStream:
+    request_url = build_url(url, params)
+    return ItemStream(stream(request_url, {"Authorization": f"Bearer {token}"}, timeouts), items_key)
+
+
+def post_json(
+    url: str,
+    token: str,
+    body: Mapping[str, object] | None = None,
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    timeouts: Timeouts | None = None,
 ) -> dict[str, Any]:
     request_url = build_url(url, params)
-    request = Request(request_url, headers={"Authorization": f"Bearer {token}"})
-    with urlopen(request, timeout=20) as response:
-        payload = response.read().decode("utf-8")
-    data = json.loads(payload)
-    if not isinstance(data, dict):
-        message = "Expected JSON object response"
-        raise ValueError(message)
-    return data
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    encoded = json.dumps(body if body is not None else {}).encode("utf-8")
+    response = fetch(request_url, headers, timeouts, method="POST", body=encoded)
+    if not response.strip():
+        return {}
+    return _decode_object(response)
+
+
+def fetch(
+    url: str,
+    headers: Mapping[str, str],
+    timeouts: Timeouts | None = None,
+    method: str = "GET",
+    body: bytes | None = None,
+) -> bytes:
+    with profiling.phase("request"):
+        return b"".join(stream(url, headers, timeouts, method=method, body=body))
+
+
+def stream(
+    url: str,
+    headers: Mapping[str, str],
+    timeouts: Timeouts | None = None,
+    method: str = "GET",
+    body: bytes | None = None,
+) -> Iterator[bytes]:
+    cassette = _cassette
+    if cassette is None:
+        return _network_stream(url, headers, timeouts, method, body)
+    return cassette.stream(
+        method,
+        url,
+        body,
+        lambda: _network_stream(url, headers, timeouts, method, body),
+    )
+
+
+def set_cassette(cassette: Any) -> None:
+    global _cassette
+    _cassette = cassette
+
+
+def _network_stream(
+    url: str,
+    headers: Mapping[str, str],
+    timeouts: Timeouts | None,
+    method: str,
+    body: bytes | None,
+    redirects: int = 0,
+) -> Iterator[bytes]:
+    scope = _current_scope.get()
+    limits = timeouts or (scope.timeouts if scope is not None else None) or DEFAULT_TIMEOUTS
+    request_deadline = time.monotonic() + limits.total if limits.total is not None else None
+    if scope is not None:
+        scope.check()
+        if scope.deadline is not None:
+            request_deadline = (
+                scope.deadline if request_deadline is None else min(request_deadline, scope.deadline)
+            )
+    transport = _http2_transport
+    if transport is not None:
+        yield transport.fetch(url, headers, limits, request_deadline, method, body)
+        return
+
+    parts = urlsplit(url)
+    proxy = _proxy_for(parts)
+    connection = _connection(parts, proxy, _bounded(limits.connect, request_deadline))
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    request_headers = {"Accept-Encoding": ACCEPT_ENCODING, "User-Agent": USER_AGENT, **headers}
+    if proxy is not None and parts.scheme != "https":
+        path = parts._replace(fragment="").geturl()
+        request_headers.update(_proxy_headers(proxy))
+    redirect: str | None = None
+    if scope is not None:
+        scope._register(connection)
+    try:
+        connection.connect()
+        connection.sock.settimeout(_bounded(limits.read, request_deadline))
+        connection.request(method, path, body=body, headers=request_headers)
+        response = connection.getresponse()
+        location = response.getheader("Location")
+        if response.status in REDIRECT_STATUSES and location:
+            if redirects >= MAX_REDIRECTS:
+                message = f"Too many redirects: {response.reason}"
+                raise HTTPError(url, response.status, message, response.headers, BytesIO())
+            redirect = urljoin(url, location)
+            status = response.status
+        else:
+            yield from _read_body(url, connection, response, limits, request_deadline)
+        if scope is not None:
+            scope.check()
+    except (Cancelled, DeadlineExceeded, HTTPError):
+        raise
+    except (OSError, ValueError, AttributeError) as exc:
+        if scope is not None and scope.cancelled:
+            message = "Operation cancelled"
+            raise Cancelled(message) from exc
+        if isinstance(exc, (TimeoutError, socket.timeout)) and _expired(request_deadline):
+            message = f"Deadline exceeded for {parts.hostname}"
+            raise DeadlineExceeded(message) from exc
+        raise
+    finally:
+        if scope is not None:
+            scope._unregister(connection)
+        connection.close()
+    if redirect is not None:
+        if status not in (307, 308):
+            method, body = ("HEAD" if method == "HEAD" else "GET"), None
+        if urlsplit(redirect).netloc != parts.netloc:
+            headers = {
+                name: value for name, value in headers.items() if name.lower() != "authorization"
+            }
+        yield from _network_stream(redirect, headers, timeouts, method, body, redirects + 1)
+
+
+def _read_body(
+    url: str,
+    connection: HTTPConnection,
+    response: Any,
+    limits: Timeouts,
+    request_deadline: float | None,
+) -> Iterator[bytes]:
+    decoder = _decoder(response.getheader("Content-Encoding"))
+    failed = response.status >= 400
+    error_chunks: list[bytes] = []
+    wire_bytes = 0
+    decoded_bytes = 0
+    while True:
+        if connection.sock is not None:
+            connection.sock.settimeout(_bounded(limits.read, request_deadline))
+        chunk = response.read(READ_CHUNK_SIZE)
+        if not chunk:
+            chunk = decoder.flush() if decoder is not None else b""
+            decoder = None
+            if not chunk:
+                break
+        else:
+            wire_bytes += len(chunk)
+            chunk = decoder.decompress(chunk) if decoder is not None else chunk
+        decoded_bytes += len(chunk)
+        if failed:
+            error_chunks.append(chunk)
+        elif chunk:
+            yield chunk
+    _transfer_counter.record(wire_bytes, decoded_bytes)
+    if failed:
+        payload = b"".join(error_chunks)
+        raise HTTPError(url, response.status, response.reason, response.headers, BytesIO(payload))
+
+
+def _proxy_for(parts: SplitResult) -> SplitResult | None:
+    host = parts.hostname or ""
+    proxy = getproxies().get(parts.scheme)
+    if not proxy or not host or proxy_bypass(host):
+        return None
+    return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _proxy_headers(proxy: SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    return {"Proxy-Authorization": f"Basic {base64.b64encode(credentials.encode()).decode('ascii')}"}
+
+
+def _connection(parts: SplitResult, proxy: SplitResult | None, timeout: float) -> HTTPConnection:
+    connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+    if proxy is None:
+        return connection_class(parts.hostname or "", parts.port, timeout=timeout)
+    connection = connection_class(proxy.hostname or "", proxy.port, timeout=timeout)
+    if parts.scheme == "https":
+        connection.set_tunnel(parts.hostname or "", parts.port, headers=_proxy_headers(proxy))
+    return connection
 
 
 def build_url(url: str, params: Mapping[str, Sequence[str] | str] | None) -> str:
@@ -35,3 +630,68 @@ def build_url(url: str, params: Mapping[str, Sequence[str] | str] | None) -> str
             normalized.append((key, str(value)))
     query = urlencode(normalized, doseq=True)
     return f"{url}?{query}"
+
+
+class _BrotliDecoder:
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._decompressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decoder(content_encoding: str | None) -> Any:
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if encoding == "deflate":
+        return zlib.decompressobj(zlib.MAX_WBITS | 32)
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecoder()
+    message = f"Unsupported Content-Encoding: {content_encoding}"
+    raise ValueError(message)
+
+
+def _decode_object(body: bytes) -> dict[str, Any]:
+    with profiling.phase("decode"):
+        data = json.loads(body.decode("utf-8"))
+    if not isinstance(data, dict):
+        message = "Expected JSON object response"
+        raise ValueError(message)
+    return data
+
+
+def _bounded(timeout: float, request_deadline: float | None) -> float:
+    if request_deadline is None:
+        return timeout
+    remaining = request_deadline - time.monotonic()
+    if remaining <= 0:
+        message = "Operation deadline exceeded"
+        raise DeadlineExceeded(message)
+    return min(timeout, remaining)
+
+
+def _wait(done: threading.Event) -> None:
+    scope = _current_scope.get()
+    while not done.wait(SINGLE_FLIGHT_POLL_SECONDS):
+        if scope is not None:
+            scope.check()
+
+
+def _expired(request_deadline: float | None) -> bool:
+    return request_deadline is not None and time.monotonic() >= request_deadline
+
+
+def _abort(connection: HTTPConnection) -> None:
+    sock = connection.sock
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
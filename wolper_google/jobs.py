@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from wolper_google.concurrency import ItemResult
+from wolper_google.streaming import ItemStream
+
+DEFAULT_CHECKPOINT_EVERY = 100
+
+PageFetcher = Callable[[str | None], Mapping[str, object] | ItemStream]
+Hydrator = Callable[
+    [list[Mapping[str, object]]],
+    Sequence[Mapping[str, object] | ItemResult[Any, Mapping[str, object]]],
+]
+
+
+@dataclass
+class Checkpoint:
+    job: str
+    page_token: str | None = None
+    processed_ids: set[str] = field(default_factory=set)
+    output_offset: int = 0
+    completed: bool = False
+    failed: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> Checkpoint:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict) or not isinstance(payload.get("job"), str):
+            message = f"Invalid job state file: {path}"
+            raise ValueError(message)
+        page_token = payload.get("pageToken")
+        processed = payload.get("processedIds", [])
+        offset = payload.get("outputOffset", 0)
+        failed = payload.get("failed", {})
+        return cls(
+            job=payload["job"],
+            page_token=page_token if isinstance(page_token, str) else None,
+            processed_ids={item for item in processed if isinstance(item, str)},
+            output_offset=offset if isinstance(offset, int) else 0,
+            completed=payload.get("completed") is True,
+            failed={
+                str(item_id): entry
+                for item_id, entry in (failed.items() if isinstance(failed, dict) else [])
+                if isinstance(entry, dict) and isinstance(entry.get("item"), dict)
+            },
+        )
+
+    def retryable(self) -> list[Mapping[str, object]]:
+        return [
+            entry["item"]
+            for entry in self.failed.values()
+            if isinstance(entry.get("error"), dict) and entry["error"].get("retryable") is True
+        ]
+
+    def errors(self) -> list[dict[str, object]]:
+        return [
+            {"id": item_id, "error": entry.get("error", {})}
+            for item_id, entry in self.failed.items()
+        ]
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "job": self.job,
+            "pageToken": self.page_token,
+            "processedIds": sorted(self.processed_ids),
+            "outputOffset": self.output_offset,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.tmp")
+        temp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+@dataclass(frozen=True)
+class JobResult:
+    written: int
+    skipped: int
+    completed: bool
+    errors: list[dict[str, object]] = field(default_factory=list)
+
+    def to_payload(self) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "written": self.written,
+            "skipped": self.skipped,
+            "completed": self.completed,
+        }
+        if self.errors:
+            payload["failed"] = len(self.errors)
+            payload["errors"] = self.errors
+        return payload
+
+
+class PagedJob:
+    def __init__(
+        self,
+        job: str,
+        fetch_page: PageFetcher,
+        items_key: str,
+        output_path: str | Path,
+        state_path: str | Path,
+        hydrate: Hydrator | None = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        self._job = job
+        self._fetch_page = fetch_page
+        self._items_key = items_key
+        self._output_path = Path(output_path).expanduser()
+        self._state_path = Path(state_path).expanduser()
+        self._hydrate = hydrate
+        self._checkpoint_every = max(1, checkpoint_every)
+
+    def run(self, resume: bool = False) -> JobResult:
+        checkpoint = self._start(resume)
+        retry = checkpoint.retryable()
+        if checkpoint.completed and not retry:
+            return JobResult(written=0, skipped=0, completed=True, errors=checkpoint.errors())
+        written = 0
+        skipped = 0
+        mode = "r+b" if self._output_path.exists() else "wb"
+        with self._output_path.open(mode) as output:
+            output.truncate(checkpoint.output_offset)
+            output.seek(checkpoint.output_offset)
+            try:
+                written += self._write(output, checkpoint, retry)
+                while not checkpoint.completed:
+                    page = self._fetch_page(checkpoint.page_token)
+                    pending: list[Mapping[str, object]] = []
+                    with page if isinstance(page, ItemStream) else nullcontext():
+                        for item in _page_items(page, self._items_key):
+                            item_id = item.get("id")
+                            if (
+                                not isinstance(item_id, str)
+                                or item_id in checkpoint.processed_ids
+                                or item_id in checkpoint.failed
+                            ):
+                                skipped += 1
+                                continue
+                            pending.append(item)
+                            if len(pending) >= self._checkpoint_every:
+                                written += self._write(output, checkpoint, pending)
+                                pending = []
+                        written += self._write(output, checkpoint, pending)
+                        fields = page.page if isinstance(page, ItemStream) else page
+                    next_token = fields.get("nextPageToken")
+                    if not isinstance(next_token, str) or not next_token:
+                        checkpoint.completed = True
+                        break
+                    checkpoint.page_token = next_token
+                    checkpoint.processed_ids.clear()
+                    self._checkpoint(output, checkpoint)
+            finally:
+                self._checkpoint(output, checkpoint)
+        return JobResult(
+            written=written,
+            skipped=skipped,
+            completed=checkpoint.completed,
+            errors=checkpoint.errors(),
+        )
+
+    def _write(
+        self,
+        output: BinaryIO,
+        checkpoint: Checkpoint,
+        items: Sequence[Mapping[str, object]],
+    ) -> int:
+        written = 0
+        for start in range(0, len(items), self._checkpoint_every):
+            chunk = list(items[start : start + self._checkpoint_every])
+            records = self._hydrate(chunk) if self._hydrate is not None else chunk
+            for item, record in zip(chunk, records):
+                item_id = str(item["id"])
+                if isinstance(record, ItemResult):
+                    if record.error is not None:
+                        error = record.error.to_payload()
+                        checkpoint.failed[item_id] = {"item": dict(item), "error": error}
+                        continue
+                    record = record.value
+                output.write(json.dumps(record).encode("utf-8") + b"\n")
+                checkpoint.processed_ids.add(item_id)
+                checkpoint.failed.pop(item_id, None)
+                written += 1
+            self._checkpoint(output, checkpoint)
+        return written
+
+    def _start(self, resume: bool) -> Checkpoint:
+        if resume and self._state_path.exists():
+            checkpoint = Checkpoint.load(self._state_path)
+            if checkpoint.job != self._job:
+                message = f"State file belongs to a different job: {checkpoint.job}"
+                raise ValueError(message)
+            return checkpoint
+        return Checkpoint(job=self._job)
+
+    def _checkpoint(self, output: BinaryIO, checkpoint: Checkpoint) -> None:
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint.output_offset = output.tell()
+        checkpoint.save(self._state_path)
+
+
+def _page_items(
+    page: Mapping[str, object] | ItemStream,
+    items_key: str,
+) -> Iterable[Mapping[str, object]]:
+    if isinstance(page, ItemStream):
+        return (item for item in page if isinstance(item, dict))
+    items = page.get(items_key, [])
+    if not isinstance(items, list):
+        message = f"Invalid {items_key} page in response"
+        raise ValueError(message)
+    return [item for item in items if isinstance(item, dict)]
@@ -1,20 +1,40 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import as_completed
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 import json
+import shlex
 from pathlib import Path
 import sys
-from typing import Mapping, Sequence
+import threading
+from urllib.error import HTTPError
+import uuid
+from typing import Callable, ContextManager, Iterable, Iterator, Mapping, NoReturn, Sequence, TypeVar
 
 from wolper_google import calendar as calendar_api
 from wolper_google import gmail as gmail_api
-from wolper_google.auth import read_auth_file
+from wolper_google import endpoints, http, profiling
+from wolper_google.auth import AuthConfig, read_auth_file
 from wolper_google.calendar import Calendar
-from wolper_google.gmail import Mailbox
-
-
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(prog="wolper-google")
+from wolper_google.cassette import CassetteMiss, use_cassette
+from wolper_google.concurrency import DEFAULT_MAX_WORKERS, ON_ERROR_POLICIES, background, fan_out
+from wolper_google.concurrency import FanOutSummary, ItemError, ItemResult
+from wolper_google.jobs import PagedJob
+from wolper_google.gmail import TRIAGE_HEADERS, Mailbox, MessageHeaders
+from wolper_google.push import IncrementalSync, NotificationServer
+from wolper_google.search import DEFAULT_SEARCH_TTL, SearchCache
+from wolper_google.stats import DATE_BUCKETS, DEFAULT_TOP, LABEL_COUNT_WORKERS, label_counts, mailbox_stats
+from wolper_google.threads import ThreadCache
+
+
+def build_parser(
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    parser = parser_class(prog="wolper-google")
     parser.add_argument(
         "--auth-file",
         dest="auth_file",
@@ -28,6 +48,78 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print raw JSON response",
     )
+    parser.add_argument(
+        "--sort-keys",
+        dest="sort_keys",
+        action="store_true",
+        help="Sort object keys in JSON output",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Multiplex requests over HTTP/2 when httpx[http2] is installed",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        default=None,
+        choices=profiling.PROFILE_MODES,
+        help="Profile the run and its worker threads: cpu (cProfile) or mem (tracemalloc)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        dest="profile_out",
+        default=None,
+        help="Write pstats (cpu) or collapsed stacks (mem) here (default: ./wolper-google.prof|.folded)",
+    )
+    parser.add_argument(
+        "--record",
+        dest="record_path",
+        default=None,
+        help="Record every HTTP interaction to this gzip cassette file",
+    )
+    parser.add_argument(
+        "--replay",
+        dest="replay_path",
+        default=None,
+        help="Answer HTTP requests from this cassette file instead of the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        dest="replay_latency",
+        type=_latency,
+        default="recorded",
+        help="Replay delay: 'recorded', 'none' or seconds (default: recorded)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        dest="connect_timeout",
+        type=float,
+        default=http.DEFAULT_TIMEOUTS.connect,
+        help=f"Connect timeout per request in seconds (default: {http.DEFAULT_TIMEOUTS.connect:g})",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        dest="read_timeout",
+        type=float,
+        default=http.DEFAULT_TIMEOUTS.read,
+        help=f"Socket read timeout in seconds (default: {http.DEFAULT_TIMEOUTS.read:g})",
+    )
+    parser.add_argument(
+        "--timeout",
+        dest="total_timeout",
+        type=float,
+        default=None,
+        help="Total time limit per request in seconds",
+    )
+    parser.add_argument(
+        "--deadline",
+        dest="deadline",
+        type=float,
+        default=None,
+        help="Time limit for the whole command in seconds, across pages and fan-out",
+    )
     subparsers = parser.add_subparsers(dest="service", required=True)
 
     calendar_parser = subparsers.add_parser("calendar", help="Calendar commands")
@@ -62,12 +154,47 @@ def build_parser() -> argparse.ArgumentParser:
     calendar_events = calendar_sub.add_parser("events", help="Calendar events")
     calendar_events_sub = calendar_events.add_subparsers(dest="events_command", required=True)
     calendar_events_list = calendar_events_sub.add_parser("list", help="List events")
-    calendar_events_list.add_argument("--calendar-id", required=True)
+    calendar_events_list.add_argument(
+        "--calendar-id",
+        action="append",
+        help="Calendar to list. Repeat to merge several calendars by start time.",
+    )
+    calendar_events_list.add_argument(
+        "--all-calendars",
+        action="store_true",
+        help="Merge events from every calendar in the calendar list",
+    )
+    _add_workers_argument(calendar_events_list)
     _add_param_argument(calendar_events_list)
     calendar_events_get = calendar_events_sub.add_parser("get", help="Get event")
     calendar_events_get.add_argument("--calendar-id", required=True)
     calendar_events_get.add_argument("--event-id", required=True)
     _add_param_argument(calendar_events_get)
+    calendar_events_export = calendar_events_sub.add_parser(
+        "export",
+        help="Export events to NDJSON (resumable)",
+    )
+    calendar_events_export.add_argument("--calendar-id", required=True)
+    _add_export_arguments(calendar_events_export)
+    _add_param_argument(calendar_events_export)
+    calendar_events_expand = calendar_events_sub.add_parser(
+        "expand",
+        help="Expand recurring events locally for a time window",
+    )
+    calendar_events_expand.add_argument("--calendar-id", required=True)
+    calendar_events_expand.add_argument(
+        "--time-min",
+        required=True,
+        type=_parse_datetime,
+        help="Window start (ISO 8601)",
+    )
+    calendar_events_expand.add_argument(
+        "--time-max",
+        required=True,
+        type=_parse_datetime,
+        help="Window end (ISO 8601)",
+    )
+    _add_param_argument(calendar_events_expand)
     calendar_events_instances = calendar_events_sub.add_parser(
         "instances",
         help="List event instances",
@@ -76,6 +203,22 @@ def build_parser() -> argparse.ArgumentParser:
     calendar_events_instances.add_argument("--event-id", required=True)
     _add_param_argument(calendar_events_instances)
 
+    calendar_events_watch = calendar_events_sub.add_parser(
+        "watch",
+        help="Open a push notification channel for events",
+    )
+    calendar_events_watch.add_argument("--calendar-id", required=True)
+    calendar_events_watch.add_argument("--address", required=True, help="HTTPS webhook URL")
+    calendar_events_watch.add_argument("--channel-id", default=None, help="Channel id (default: random)")
+    calendar_events_watch.add_argument("--token", default=None, help="Channel verification token")
+    calendar_events_watch.add_argument("--ttl", type=int, default=None, help="Channel TTL in seconds")
+
+    calendar_channels = calendar_sub.add_parser("channels", help="Notification channels")
+    calendar_channels_sub = calendar_channels.add_subparsers(dest="channels_command", required=True)
+    calendar_channels_stop = calendar_channels_sub.add_parser("stop", help="Stop a channel")
+    calendar_channels_stop.add_argument("--channel-id", required=True)
+    calendar_channels_stop.add_argument("--resource-id", required=True)
+
     calendar_colors = calendar_sub.add_parser("colors", help="Calendar colors")
     calendar_colors_sub = calendar_colors.add_subparsers(dest="colors_command", required=True)
     calendar_colors_sub.add_parser("get", help="Get colors")
@@ -99,7 +242,13 @@ def build_parser() -> argparse.ArgumentParser:
     gmail_parser = subparsers.add_parser("gmail", help="Gmail commands", parents=[gmail_parent])
     gmail_sub = gmail_parser.add_subparsers(dest="command", required=True)
 
-    gmail_sub.add_parser("list", help="List mailboxes", parents=[gmail_parent])
+    gmail_list = gmail_sub.add_parser("list", help="List mailboxes", parents=[gmail_parent])
+    gmail_list.add_argument(
+        "--counts",
+        action="store_true",
+        help="Fetch every label concurrently and show messagesTotal/messagesUnread/threadsUnread",
+    )
+    _add_workers_argument(gmail_list, default=LABEL_COUNT_WORKERS)
 
     gmail_labels = gmail_sub.add_parser("labels", help="Label commands", parents=[gmail_parent])
     gmail_labels_sub = gmail_labels.add_subparsers(dest="labels_command", required=True)
@@ -111,6 +260,7 @@ def build_parser() -> argparse.ArgumentParser:
     gmail_drafts_sub = gmail_drafts.add_subparsers(dest="drafts_command", required=True)
     gmail_drafts_list = gmail_drafts_sub.add_parser("list", help="List drafts", parents=[gmail_parent])
     _add_param_argument(gmail_drafts_list)
+    _add_hydrate_arguments(gmail_drafts_list)
     gmail_drafts_get = gmail_drafts_sub.add_parser("get", help="Get draft", parents=[gmail_parent])
     gmail_drafts_get.add_argument("--draft-id", required=True)
     _add_param_argument(gmail_drafts_get)
@@ -129,9 +279,46 @@ def build_parser() -> argparse.ArgumentParser:
         parents=[gmail_parent],
     )
     _add_param_argument(gmail_messages_list)
+    _add_search_cache_arguments(gmail_messages_list)
     gmail_messages_get = gmail_messages_sub.add_parser("get", help="Get message", parents=[gmail_parent])
     gmail_messages_get.add_argument("--message-id", required=True)
     _add_param_argument(gmail_messages_get)
+    gmail_messages_export = gmail_messages_sub.add_parser(
+        "export",
+        help="Export messages to NDJSON (resumable)",
+        parents=[gmail_parent],
+    )
+    gmail_messages_export.add_argument(
+        "--format",
+        dest="message_format",
+        choices=["minimal", "metadata", "full", "raw"],
+        default="full",
+        help="Message format to fetch (default: full)",
+    )
+    _add_export_arguments(gmail_messages_export)
+    _add_workers_argument(gmail_messages_export)
+    _add_on_error_argument(gmail_messages_export)
+    _add_param_argument(gmail_messages_export)
+    gmail_messages_headers = gmail_messages_sub.add_parser(
+        "headers",
+        help="Get message headers (format=metadata)",
+        parents=[gmail_parent],
+    )
+    gmail_messages_headers.add_argument(
+        "--message-id",
+        dest="message_ids",
+        action="append",
+        help="Message id. Repeatable. Defaults to the first page of messages list.",
+    )
+    gmail_messages_headers.add_argument(
+        "--header",
+        dest="headers",
+        action="append",
+        help="Header name. Repeatable. Defaults to From/To/Subject/Date/Message-ID.",
+    )
+    _add_on_error_argument(gmail_messages_headers)
+    _add_workers_argument(gmail_messages_headers)
+    _add_param_argument(gmail_messages_headers)
 
     gmail_attachments = gmail_sub.add_parser(
         "attachments",
@@ -154,6 +341,23 @@ def build_parser() -> argparse.ArgumentParser:
     gmail_profile_sub = gmail_profile.add_subparsers(dest="profile_command", required=True)
     gmail_profile_sub.add_parser("get", help="Get profile", parents=[gmail_parent])
 
+    gmail_stats = gmail_sub.add_parser(
+        "stats",
+        help="Label counts and sender/domain/date histograms",
+        parents=[gmail_parent],
+    )
+    gmail_stats.add_argument("--max-messages", type=int, help="Stop after this many messages")
+    gmail_stats.add_argument("--top", type=int, default=DEFAULT_TOP, help="Senders/domains to show")
+    gmail_stats.add_argument("--bucket", choices=DATE_BUCKETS, default="day", help="Date histogram bucket")
+    gmail_stats.add_argument(
+        "--no-labels",
+        dest="include_labels",
+        action="store_false",
+        help="Skip per-label counters",
+    )
+    _add_workers_argument(gmail_stats)
+    _add_param_argument(gmail_stats)
+
     gmail_settings = gmail_sub.add_parser("settings", help="Settings commands", parents=[gmail_parent])
     gmail_settings_sub = gmail_settings.add_subparsers(dest="settings_command", required=True)
 
@@ -265,308 +469,930 @@ def build_parser() -> argparse.ArgumentParser:
         parents=[gmail_parent],
     )
 
+    gmail_watch = gmail_sub.add_parser("watch", help="Push notification commands", parents=[gmail_parent])
+    gmail_watch_sub = gmail_watch.add_subparsers(dest="watch_command", required=True)
+    gmail_watch_start = gmail_watch_sub.add_parser(
+        "start",
+        help="Start Pub/Sub notifications",
+        parents=[gmail_parent],
+    )
+    gmail_watch_start.add_argument("--topic-name", required=True)
+    gmail_watch_start.add_argument("--label-id", dest="label_ids", action="append")
+    gmail_watch_start.add_argument(
+        "--label-filter-behavior",
+        choices=["include", "exclude"],
+        default=None,
+    )
+    gmail_watch_sub.add_parser("stop", help="Stop notifications", parents=[gmail_parent])
+
     gmail_threads = gmail_sub.add_parser("threads", help="Thread commands", parents=[gmail_parent])
     gmail_threads_sub = gmail_threads.add_subparsers(dest="threads_command", required=True)
     gmail_threads_list = gmail_threads_sub.add_parser("list", help="List threads", parents=[gmail_parent])
     _add_param_argument(gmail_threads_list)
+    _add_search_cache_arguments(gmail_threads_list)
+    _add_hydrate_arguments(gmail_threads_list)
     gmail_threads_get = gmail_threads_sub.add_parser("get", help="Get thread", parents=[gmail_parent])
     gmail_threads_get.add_argument("--thread-id", required=True)
+    _add_param_argument(gmail_threads_get)
+    gmail_threads_get.add_argument(
+        "--cache-file",
+        default=None,
+        help="Thread cache file; only messages missing from the cache are fetched",
+    )
+
+    api_parser = subparsers.add_parser("api", help="Endpoints from the bundled OpenAPI specs")
+    api_sub = api_parser.add_subparsers(dest="command", required=True)
+    api_list = api_sub.add_parser("list", help="List endpoints")
+    api_list.add_argument(
+        "--service",
+        dest="service_filter",
+        choices=sorted(endpoints.API_BASES),
+        default=None,
+    )
+    api_call = api_sub.add_parser("call", help="Call an endpoint by operation id")
+    api_call.add_argument("endpoint", help="Operation id, e.g. gmail.users.messages.get")
+    api_call.add_argument(
+        "--path",
+        dest="path_values",
+        action="append",
+        help="Path parameter (key=value). Repeatable.",
+    )
+    api_call.add_argument("--body", default=None, help="JSON request body for POST endpoints")
+    _add_param_argument(api_call)
+
+    listen_parser = subparsers.add_parser(
+        "listen",
+        help="Receive push notifications and print incremental changes as NDJSON",
+    )
+    listen_parser.add_argument("--host", default="127.0.0.1")
+    listen_parser.add_argument("--port", type=int, default=8080)
+    listen_parser.add_argument("--verify-token", default=None)
+    listen_parser.add_argument("--user-id", default="me", help="Gmail user id (default: me)")
+    listen_parser.add_argument(
+        "--start-history-id",
+        default=None,
+        help="Gmail history id to sync from (e.g. from gmail watch start)",
+    )
+    listen_parser.add_argument(
+        "--channel",
+        dest="channels",
+        action="append",
+        default=[],
+        help="Calendar channel mapping CHANNEL_ID=CALENDAR_ID. Repeatable.",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run many commands in one process and print tagged NDJSON results",
+    )
+    batch_parser.add_argument(
+        "--file",
+        default="-",
+        help="One command per line, or a JSON array of argv lists (default: stdin)",
+    )
+    batch_parser.add_argument(
+        "--order",
+        choices=BATCH_ORDERS,
+        default="input",
+        help="Print results in input or completion order (default: input)",
+    )
+    _add_workers_argument(batch_parser)
 
+    _bind_command_paths(parser)
     return parser
 
 
 def main(argv: Sequence[str] | None = None) -> int:
-    parser = build_parser()
     raw_argv = list(sys.argv[1:]) if argv is None else list(argv)
-    auth_file, raw_mode, cleaned_argv = _extract_global_flags(raw_argv)
-    args = parser.parse_args(cleaned_argv)
-    if auth_file is not None:
-        args.auth_file = auth_file
-    if raw_mode:
-        args.raw = True
+    global_argv, cleaned_argv = _extract_global_flags(raw_argv)
+    with _profiling(global_argv):
+        return _main(global_argv, cleaned_argv)
+
+
+def _main(global_argv: list[str], cleaned_argv: list[str]) -> int:
+    with profiling.phase("startup"):
+        parser = build_parser()
+        args = parser.parse_args([*global_argv, *cleaned_argv])
 
     try:
-        auth = read_auth_file(Path(args.auth_file) if args.auth_file else None)
+        with profiling.phase("auth"):
+            auth = read_auth_file(Path(args.auth_file) if args.auth_file else None)
     except Exception as exc:  # noqa: BLE001
         print(f"Auth error: {exc}", file=sys.stderr)
         return 1
 
-    if args.service == "calendar" and args.command == "list":
-        payload = Calendar.list_raw(auth)
-        return _render_calendar_list(payload, args.raw)
+    if args.http2 and not http.enable_http2():
+        print("HTTP/2 unavailable (install httpx[http2]); using HTTP/1.1", file=sys.stderr)
+    timeouts = http.Timeouts(
+        connect=args.connect_timeout,
+        read=args.read_timeout,
+        total=args.total_timeout,
+    )
+    try:
+        with _cassette(args), http.deadline(args.deadline, timeouts=timeouts):
+            return _dispatch(args, auth)
+    except TimeoutError as exc:
+        print(f"Timeout: {exc}", file=sys.stderr)
+        return 1
+    except HTTPError as exc:
+        error = ItemError.from_exception(exc)
+        print(f"HTTP error {error.status} ({error.reason}): {error.message}", file=sys.stderr)
+        return 1
+    except http.NETWORK_ERRORS as exc:
+        print(f"Network error: {ItemError.from_exception(exc).message}", file=sys.stderr)
+        return 1
+    except CassetteMiss as exc:
+        print(f"replay miss: {exc.method} {exc.url}", file=sys.stderr)
+        return 1
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
 
-    if args.service == "calendar" and args.command == "get":
-        payload = calendar_api.get_calendar(auth, args.calendar_id)
-        _print_json(payload)
-        return 0
 
-    if args.service == "calendar" and args.command == "calendarlist":
-        if args.calendarlist_command == "list":
-            payload = Calendar.list_raw(auth)
-            return _render_calendar_list(payload, args.raw)
-        if args.calendarlist_command == "get":
-            payload = calendar_api.get_calendar_list_entry(auth, args.calendar_id)
-            _print_json(payload)
-            return 0
-
-    if args.service == "calendar" and args.command == "acl":
-        if args.acl_command == "list":
-            params = _parse_params(args.param)
-            payload = calendar_api.list_acl(auth, args.calendar_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.acl_command == "get":
-            payload = calendar_api.get_acl(auth, args.calendar_id, args.rule_id)
-            _print_json(payload)
-            return 0
-
-    if args.service == "calendar" and args.command == "events":
-        if args.events_command == "list":
-            params = _parse_params(args.param)
-            payload = calendar_api.list_events(auth, args.calendar_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.events_command == "get":
-            params = _parse_params(args.param)
-            payload = calendar_api.get_event(auth, args.calendar_id, args.event_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.events_command == "instances":
-            params = _parse_params(args.param)
-            payload = calendar_api.list_event_instances(
-                auth,
-                args.calendar_id,
-                args.event_id,
-                params=params,
-            )
-            _print_json(payload)
-            return 0
-
-    if args.service == "calendar" and args.command == "colors":
-        if args.colors_command == "get":
-            payload = calendar_api.get_colors(auth)
-            _print_json(payload)
-            return 0
-
-    if args.service == "calendar" and args.command == "settings":
-        if args.settings_command == "list":
-            payload = calendar_api.list_settings(auth)
-            _print_json(payload)
-            return 0
-        if args.settings_command == "get":
-            payload = calendar_api.get_setting(auth, args.setting)
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "list":
-        payload = gmail_api.list_labels(auth, user_id=args.user_id)
-        return _render_mailbox_list(payload, args.raw)
-
-    if args.service == "gmail" and args.command == "labels":
-        if args.labels_command == "list":
-            payload = gmail_api.list_labels(auth, user_id=args.user_id)
-            return _render_mailbox_list(payload, args.raw)
-        if args.labels_command == "get":
-            payload = gmail_api.get_label(auth, args.label_id, user_id=args.user_id)
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "drafts":
-        if args.drafts_command == "list":
-            params = _parse_params(args.param)
-            payload = gmail_api.list_drafts(auth, user_id=args.user_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.drafts_command == "get":
-            params = _parse_params(args.param)
-            payload = gmail_api.get_draft(auth, args.draft_id, user_id=args.user_id)
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "history":
-        if args.history_command == "list":
-            params = _parse_params(args.param)
-            payload = gmail_api.list_history(
-                auth,
-                start_history_id=args.start_history_id,
-                user_id=args.user_id,
-                params=params,
-            )
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "messages":
-        if args.messages_command == "list":
-            params = _parse_params(args.param)
-            payload = gmail_api.list_messages(auth, user_id=args.user_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.messages_command == "get":
-            params = _parse_params(args.param)
-            payload = gmail_api.get_message(
-                auth,
-                args.message_id,
-                user_id=args.user_id,
-                params=params,
-            )
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "attachments":
-        if args.attachments_command == "get":
-            payload = gmail_api.get_message_attachment(
-                auth,
-                args.message_id,
-                args.attachment_id,
-                user_id=args.user_id,
-            )
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "profile":
-        if args.profile_command == "get":
-            payload = gmail_api.get_profile(auth, user_id=args.user_id)
-            _print_json(payload)
-            return 0
-
-    if args.service == "gmail" and args.command == "settings":
-        if args.settings_command == "auto-forwarding":
-            if args.auto_command == "get":
-                payload = gmail_api.get_settings_auto_forwarding(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-        if args.settings_command == "filters":
-            if args.filters_command == "list":
-                payload = gmail_api.list_settings_filters(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-            if args.filters_command == "get":
-                payload = gmail_api.get_settings_filter(
-                    auth,
-                    args.filter_id,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-        if args.settings_command == "forwarding-addresses":
-            if args.forwarding_command == "list":
-                payload = gmail_api.list_settings_forwarding_addresses(
-                    auth,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-            if args.forwarding_command == "get":
-                payload = gmail_api.get_settings_forwarding_address(
-                    auth,
-                    args.forwarding_email,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-        if args.settings_command == "imap":
-            if args.imap_command == "get":
-                payload = gmail_api.get_settings_imap(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-        if args.settings_command == "pop":
-            if args.pop_command == "get":
-                payload = gmail_api.get_settings_pop(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-        if args.settings_command == "send-as":
-            if args.send_as_command == "list":
-                payload = gmail_api.list_settings_send_as(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-            if args.send_as_command == "get":
-                payload = gmail_api.get_settings_send_as(
-                    auth,
-                    args.send_as_email,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-        if args.settings_command == "smime":
-            if args.smime_command == "list":
-                payload = gmail_api.list_settings_smime_info(
-                    auth,
-                    args.send_as_email,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-            if args.smime_command == "get":
-                payload = gmail_api.get_settings_smime_info(
-                    auth,
-                    args.send_as_email,
-                    args.smime_id,
-                    user_id=args.user_id,
-                )
-                _print_json(payload)
-                return 0
-        if args.settings_command == "vacation":
-            if args.vacation_command == "get":
-                payload = gmail_api.get_settings_vacation(auth, user_id=args.user_id)
-                _print_json(payload)
-                return 0
-
-    if args.service == "gmail" and args.command == "threads":
-        if args.threads_command == "list":
-            params = _parse_params(args.param)
-            payload = gmail_api.list_threads(auth, user_id=args.user_id, params=params)
-            _print_json(payload)
-            return 0
-        if args.threads_command == "get":
-            payload = gmail_api.get_thread(auth, args.thread_id, user_id=args.user_id)
-            _print_json(payload)
-            return 0
-
-    print("Unknown command", file=sys.stderr)
-    return 1
+def run(
+    command_path: Sequence[str],
+    auth: AuthConfig | None = None,
+    **kwargs: object,
+) -> object:
+    path = tuple(command_path)
+    command = _command(path)
+    args = _command_namespace(path, kwargs)
+    if auth is None:
+        auth = read_auth_file(Path(args.auth_file) if args.auth_file else None)
+    return command.handler(auth, args)
 
 
 def cli() -> None:
     raise SystemExit(main())
 
 
-if __name__ == "__main__":
-    cli()
+Handler = Callable[[AuthConfig, argparse.Namespace], object]
+Renderer = Callable[[object, argparse.Namespace], int]
+
+
+@dataclass(frozen=True)
+class Command:
+    path: tuple[str, ...]
+    handler: Handler
+    render: Renderer | None = None
+    passthrough: bool = False
+
+
+COMMANDS: dict[tuple[str, ...], Command] = {}
+
+
+def command(
+    *path: str,
+    render: Renderer | None = None,
+    passthrough: bool = False,
+) -> Callable[[Handler], Handler]:
+    def register(handler: Handler) -> Handler:
+        COMMANDS[path] = Command(path=path, handler=handler, render=render, passthrough=passthrough)
+        return handler
+
+    return register
+
+
+def _dispatch(args: argparse.Namespace, auth: AuthConfig) -> int:
+    command = COMMANDS.get(getattr(args, "command_path", ()))
+    if command is None:
+        print("Unknown command", file=sys.stderr)
+        return 1
+    with http.passthrough() if command.passthrough and not args.sort_keys else nullcontext():
+        payload = command.handler(auth, args)
+    render = command.render or _render_json
+    with profiling.phase("render"):
+        return render(payload, args)
+
+
+def _command(path: tuple[str, ...]) -> Command:
+    command = COMMANDS.get(path)
+    if command is None:
+        message = f"Unknown command: {' '.join(path)}"
+        raise ValueError(message)
+    return command
+
+
+def _bind_command_paths(parser: argparse.ArgumentParser, path: tuple[str, ...] = ()) -> None:
+    subparsers = _subparsers_action(parser)
+    if subparsers is None:
+        parser.set_defaults(command_path=path)
+        return
+    for name, subparser in subparsers.choices.items():
+        _bind_command_paths(subparser, (*path, name))
+
+
+def _subparsers_action(parser: argparse.ArgumentParser) -> argparse._SubParsersAction | None:
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            return action
+    return None
+
+
+@lru_cache(maxsize=1)
+def _cached_parser() -> argparse.ArgumentParser:
+    return build_parser()
+
+
+class _BatchArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str) -> NoReturn:
+        raise ValueError(message)
+
+
+@lru_cache(maxsize=1)
+def _batch_parser() -> argparse.ArgumentParser:
+    return build_parser(_BatchArgumentParser)
+
+
+def _command_namespace(path: tuple[str, ...], overrides: Mapping[str, object]) -> argparse.Namespace:
+    parser = _cached_parser()
+    values: dict[str, object] = {}
+    required: list[argparse.Action] = []
+    current: argparse.ArgumentParser | None = parser
+    for name in (*path, None):
+        if current is None:
+            break
+        for action in current._actions:
+            if action.dest in (argparse.SUPPRESS, "help") or isinstance(
+                action, argparse._SubParsersAction
+            ):
+                continue
+            values[action.dest] = action.default
+            if action.required:
+                required.append(action)
+        subparsers = _subparsers_action(current)
+        current = subparsers.choices.get(name) if subparsers is not None and name else None
+    missing = [action.option_strings[0] for action in required if overrides.get(action.dest) is None]
+    if missing:
+        message = f"Missing required arguments for {' '.join(path)}: {', '.join(missing)}"
+        raise ValueError(message)
+    values.update(overrides)
+    values["command_path"] = path
+    return argparse.Namespace(**values)
+
+
+@command(
+    "calendar",
+    "list",
+    render=lambda payload, args: _render_calendar_list(payload, args.raw, args.sort_keys),
+)
+@command(
+    "calendar",
+    "calendarlist",
+    "list",
+    render=lambda payload, args: _render_calendar_list(payload, args.raw, args.sort_keys),
+)
+def _calendar_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return Calendar.list_raw(auth)
+
+
+@command("calendar", "get", passthrough=True)
+def _calendar_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.get_calendar(auth, args.calendar_id)
+
+
+@command("calendar", "calendarlist", "get", passthrough=True)
+def _calendar_list_entry_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.get_calendar_list_entry(auth, args.calendar_id)
+
+
+@command("calendar", "acl", "list", passthrough=True)
+def _calendar_acl_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.list_acl(auth, args.calendar_id, params=_parse_params(args.param))
+
+
+@command("calendar", "acl", "get", passthrough=True)
+def _calendar_acl_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.get_acl(auth, args.calendar_id, args.rule_id)
+
+
+@command("calendar", "events", "list", render=lambda payload, args: _render_stream(payload, args.sort_keys))
+def _calendar_events_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    calendar_ids = _calendar_ids(args.calendar_id)
+    if args.all_calendars:
+        calendar_ids.extend(item.calendar_id for item in Calendar.list(auth))
+    elif len(calendar_ids) == 1:
+        return calendar_api.list_events(auth, calendar_ids[0], params=params)
+    if not calendar_ids:
+        message = "Pass --calendar-id or --all-calendars"
+        raise ValueError(message)
+    return calendar_api.list_events_merged(auth, calendar_ids, params=params, max_workers=args.workers)
+
+
+@command("calendar", "events", "get", passthrough=True)
+def _calendar_events_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    return calendar_api.get_event(auth, args.calendar_id, args.event_id, params=params)
+
+
+@command(
+    "calendar",
+    "events",
+    "export",
+    render=lambda payload, args: _render_counted(payload, args, "written"),
+)
+def _calendar_events_export(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    job = PagedJob(
+        _job_name("calendar.events", args.calendar_id, params),
+        lambda token: endpoints.stream(
+            auth,
+            "calendar.events.list",
+            _with_page_token(params, token),
+            calendarId=args.calendar_id,
+        ),
+        _items_key("calendar.events.list"),
+        args.output,
+        args.state,
+    )
+    return job.run(resume=args.resume).to_payload()
+
+
+@command("calendar", "events", "expand", render=lambda payload, args: _render_stream(payload, args.sort_keys))
+def _calendar_events_expand(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.expand_events(
+        auth,
+        args.calendar_id,
+        args.time_min,
+        args.time_max,
+        params=_parse_params(args.param),
+    )
+
+
+@command("calendar", "events", "watch")
+def _calendar_events_watch(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.watch_events(
+        auth,
+        args.calendar_id,
+        args.channel_id or str(uuid.uuid4()),
+        args.address,
+        token=args.token,
+        ttl_seconds=args.ttl,
+    )
+
+
+@command("calendar", "events", "instances", passthrough=True)
+def _calendar_events_instances(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.list_event_instances(
+        auth,
+        args.calendar_id,
+        args.event_id,
+        params=_parse_params(args.param),
+    )
+
+
+@command("calendar", "channels", "stop")
+def _calendar_channels_stop(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.stop_channel(auth, args.channel_id, args.resource_id)
+
+
+@command("calendar", "colors", "get", passthrough=True)
+def _calendar_colors_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.get_colors(auth)
+
+
+@command("calendar", "settings", "list", passthrough=True)
+def _calendar_settings_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.list_settings(auth)
+
+
+@command("calendar", "settings", "get", passthrough=True)
+def _calendar_settings_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return calendar_api.get_setting(auth, args.setting)
+
+
+@command(
+    "gmail",
+    "list",
+    render=lambda payload, args: _render_mailbox_list(payload, args.raw, args.sort_keys, args.counts),
+)
+def _gmail_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    if not args.counts:
+        return gmail_api.list_labels(auth, user_id=args.user_id)
+    return {"labels": label_counts(auth, user_id=args.user_id, max_workers=args.workers)}
+
+
+@command(
+    "gmail",
+    "labels",
+    "list",
+    render=lambda payload, args: _render_mailbox_list(payload, args.raw, args.sort_keys),
+)
+def _gmail_labels_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_labels(auth, user_id=args.user_id)
+
 
+@command("gmail", "labels", "get", passthrough=True)
+def _gmail_labels_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_label(auth, args.label_id, user_id=args.user_id)
 
-def _extract_global_flags(
-    argv: Sequence[str] | None,
-) -> tuple[str | None, bool, list[str] | None]:
-    if argv is None:
-        return None, None, None
 
-    auth_file: str | None = None
-    raw_mode = False
+@command("gmail", "drafts", "list")
+def _gmail_drafts_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    payload = gmail_api.list_drafts(auth, user_id=args.user_id, params=_parse_params(args.param))
+    if not args.hydrate:
+        return payload
+    params = gmail_api.payload_params(args.hydrate, args.headers)
+    return _hydrate_listing(
+        payload,
+        "drafts",
+        lambda item_id: gmail_api.get_draft(auth, item_id, user_id=args.user_id, params=params),
+        args.workers,
+        args.on_error,
+    )
+
+
+@command("gmail", "drafts", "get", passthrough=True)
+def _gmail_drafts_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    return gmail_api.get_draft(auth, args.draft_id, user_id=args.user_id, params=params)
+
+
+@command("gmail", "history", "list", passthrough=True)
+def _gmail_history_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_history(
+        auth,
+        start_history_id=args.start_history_id,
+        user_id=args.user_id,
+        params=_parse_params(args.param),
+    )
+
+
+@command("gmail", "messages", "list", passthrough=True)
+def _gmail_messages_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return _gmail_search(auth, args, "messages")
+
+
+@command("gmail", "messages", "get", passthrough=True)
+def _gmail_messages_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_message(
+        auth,
+        args.message_id,
+        user_id=args.user_id,
+        params=_parse_params(args.param),
+    )
+
+
+@command(
+    "gmail",
+    "messages",
+    "export",
+    render=lambda payload, args: _render_counted(payload, args, "written"),
+)
+def _gmail_messages_export(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    message_params = {"format": args.message_format}
+    job = PagedJob(
+        _job_name("gmail.messages", args.user_id, params, args.message_format),
+        lambda token: gmail_api.list_messages(
+            auth,
+            user_id=args.user_id,
+            params=_with_page_token(params, token),
+        ),
+        _items_key("gmail.users.messages.list"),
+        args.output,
+        args.state,
+        hydrate=lambda items: fan_out(
+            lambda item: gmail_api.get_message(
+                auth,
+                str(item["id"]),
+                user_id=args.user_id,
+                params=message_params,
+            ),
+            items,
+            max_workers=args.workers,
+            on_error=args.on_error,
+        ),
+    )
+    return job.run(resume=args.resume).to_payload()
+
+
+@command(
+    "gmail",
+    "messages",
+    "headers",
+    render=lambda rows, args: _render_headers(
+        rows,
+        args.headers or TRIAGE_HEADERS,
+        args.raw,
+        args.sort_keys,
+    ),
+)
+def _gmail_messages_headers(auth: AuthConfig, args: argparse.Namespace) -> object:
+    message_ids = args.message_ids
+    if not message_ids:
+        params = _parse_params(args.param)
+        listing = gmail_api.list_messages(auth, user_id=args.user_id, params=params)
+        message_ids = _message_ids(listing)
+    headers = args.headers or TRIAGE_HEADERS
+    return fan_out(
+        lambda message_id: gmail_api.get_message_headers(auth, message_id, headers, user_id=args.user_id),
+        message_ids,
+        max_workers=args.workers,
+        on_error=args.on_error,
+    )
+
+
+@command("gmail", "attachments", "get", passthrough=True)
+def _gmail_attachments_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_message_attachment(
+        auth,
+        args.message_id,
+        args.attachment_id,
+        user_id=args.user_id,
+    )
+
+
+@command("gmail", "profile", "get", passthrough=True)
+def _gmail_profile_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_profile(auth, user_id=args.user_id)
+
+
+@command(
+    "gmail",
+    "stats",
+    render=lambda payload, args: _render_counted(payload, args, "messages"),
+)
+def _gmail_stats(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return mailbox_stats(
+        auth,
+        user_id=args.user_id,
+        params=_parse_params(args.param),
+        max_messages=args.max_messages,
+        top=args.top,
+        bucket=args.bucket,
+        include_labels=args.include_labels,
+        max_workers=args.workers,
+    ).to_payload()
+
+
+@command("gmail", "settings", "auto-forwarding", "get", passthrough=True)
+def _gmail_settings_auto_forwarding_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_auto_forwarding(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "filters", "list", passthrough=True)
+def _gmail_settings_filters_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_settings_filters(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "filters", "get", passthrough=True)
+def _gmail_settings_filters_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_filter(auth, args.filter_id, user_id=args.user_id)
+
+
+@command("gmail", "settings", "forwarding-addresses", "list", passthrough=True)
+def _gmail_settings_forwarding_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_settings_forwarding_addresses(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "forwarding-addresses", "get", passthrough=True)
+def _gmail_settings_forwarding_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_forwarding_address(
+        auth,
+        args.forwarding_email,
+        user_id=args.user_id,
+    )
+
+
+@command("gmail", "settings", "imap", "get", passthrough=True)
+def _gmail_settings_imap_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_imap(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "pop", "get", passthrough=True)
+def _gmail_settings_pop_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_pop(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "send-as", "list", passthrough=True)
+def _gmail_settings_send_as_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_settings_send_as(auth, user_id=args.user_id)
+
+
+@command("gmail", "settings", "send-as", "get", passthrough=True)
+def _gmail_settings_send_as_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_send_as(auth, args.send_as_email, user_id=args.user_id)
+
+
+@command("gmail", "settings", "smime", "list", passthrough=True)
+def _gmail_settings_smime_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.list_settings_smime_info(auth, args.send_as_email, user_id=args.user_id)
+
+
+@command("gmail", "settings", "smime", "get", passthrough=True)
+def _gmail_settings_smime_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_smime_info(
+        auth,
+        args.send_as_email,
+        args.smime_id,
+        user_id=args.user_id,
+    )
+
+
+@command("gmail", "settings", "vacation", "get", passthrough=True)
+def _gmail_settings_vacation_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.get_settings_vacation(auth, user_id=args.user_id)
+
+
+@command("gmail", "watch", "start")
+def _gmail_watch_start(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.watch(
+        auth,
+        args.topic_name,
+        label_ids=args.label_ids,
+        label_filter_behavior=args.label_filter_behavior,
+        user_id=args.user_id,
+    )
+
+
+@command("gmail", "watch", "stop")
+def _gmail_watch_stop(auth: AuthConfig, args: argparse.Namespace) -> object:
+    return gmail_api.stop_watch(auth, user_id=args.user_id)
+
+
+@command("gmail", "threads", "list")
+def _gmail_threads_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    payload = _gmail_search(auth, args, "threads")
+    if not args.hydrate:
+        return payload
+    params = gmail_api.payload_params(args.hydrate, args.headers)
+    return _hydrate_listing(
+        payload,
+        "threads",
+        lambda item_id: gmail_api.get_thread(auth, item_id, user_id=args.user_id, params=params),
+        args.workers,
+        args.on_error,
+    )
+
+
+def _gmail_search(auth: AuthConfig, args: argparse.Namespace, resource: str) -> Mapping[str, object]:
+    params = _parse_params(args.param)
+    if not args.search_cache:
+        fetch = gmail_api.list_messages if resource == "messages" else gmail_api.list_threads
+        return fetch(auth, user_id=args.user_id, params=params)
+    with _open_cache(args, SearchCache, args.search_cache) as cache:
+        cache.ttl = args.search_ttl
+        return cache.search(auth, resource, user_id=args.user_id, params=params)
+
+
+@command("gmail", "threads", "get")
+def _gmail_threads_get(auth: AuthConfig, args: argparse.Namespace) -> object:
+    params = _parse_params(args.param)
+    if args.cache_file:
+        with _open_cache(args, ThreadCache, args.cache_file) as cache:
+            return cache.refresh(auth, args.thread_id, user_id=args.user_id, params=params).to_payload()
+    return gmail_api.get_thread(auth, args.thread_id, user_id=args.user_id, params=params)
+
+
+@command("api", "list", render=lambda selected, args: _render_endpoints(selected, args.raw, args.sort_keys))
+def _api_list(auth: AuthConfig, args: argparse.Namespace) -> object:
+    if args.service_filter:
+        return list(endpoints.for_service(args.service_filter))
+    return list(endpoints.ENDPOINTS.values())
+
+
+@command("api", "call", passthrough=True)
+def _api_call(auth: AuthConfig, args: argparse.Namespace) -> object:
+    path_values = _parse_params(args.path_values) or {}
+    return endpoints.call(
+        auth,
+        args.endpoint,
+        params=_parse_params(args.param),
+        body=json.loads(args.body) if args.body else None,
+        **{key: str(value) for key, value in path_values.items()},
+    )
+
+
+@command("listen", render=lambda payload, args: 0)
+def _listen(auth: AuthConfig, args: argparse.Namespace) -> object:
+    sync = IncrementalSync(
+        auth,
+        lambda change: print(json.dumps(change), flush=True),
+        start_history_id=args.start_history_id,
+        channels=_parse_params(args.channels),
+        user_id=args.user_id,
+    )
+    server = NotificationServer(sync, host=args.host, port=args.port, verify_token=args.verify_token)
+    print(f"Listening on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return None
+
+
+BATCH_ORDERS = ("input", "completion")
+BATCH_EXCLUDED = frozenset({("batch",), ("listen",)})
+CacheT = TypeVar("CacheT", SearchCache, ThreadCache)
+
+
+@command("batch", render=lambda results, args: _render_batch(results, args.sort_keys))
+def _batch(auth: AuthConfig, args: argparse.Namespace) -> object:
+    entries = [_batch_entry(index, argv) for index, argv in enumerate(_read_batch(args.file))]
+    caches = _SharedCaches()
+    for entry in entries:
+        if isinstance(entry.get("args"), argparse.Namespace):
+            entry["args"].shared_caches = caches
+    with background(args.workers) as submit:
+        futures = [submit(_run_batch_entry, auth, entry) for entry in entries]
+        done = as_completed(futures) if args.order == "completion" else futures
+        for future in done:
+            yield future.result()
+
+
+class _SharedCaches:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._caches: dict[tuple[type, Path], tuple[object, threading.Lock]] = {}
+
+    def get(self, factory: Callable[[Path], CacheT], path: str) -> tuple[CacheT, threading.Lock]:
+        key = (factory, Path(path).expanduser().resolve())
+        with self._lock:
+            if key not in self._caches:
+                self._caches[key] = (factory(key[1]), threading.Lock())
+            return self._caches[key]  # type: ignore[return-value]
+
+
+@contextmanager
+def _open_cache(
+    args: argparse.Namespace,
+    factory: Callable[[Path], CacheT],
+    path: str,
+) -> Iterator[CacheT]:
+    shared = getattr(args, "shared_caches", None)
+    if shared is None:
+        cache = factory(Path(path))
+        yield cache
+        cache.save()
+        return
+    cache, lock = shared.get(factory, path)
+    with lock:
+        yield cache
+        cache.save()
+
+
+def _read_batch(source: str) -> list[list[str]]:
+    text = sys.stdin.read() if source == "-" else Path(source).expanduser().read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        commands = json.loads(text)
+        if not isinstance(commands, list):
+            message = "Batch input must be a JSON array"
+            raise ValueError(message)
+        return [
+            shlex.split(command) if isinstance(command, str) else [str(arg) for arg in command]
+            for command in commands
+        ]
+    return [
+        shlex.split(line)
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _batch_entry(index: int, argv: list[str]) -> dict[str, object]:
+    entry: dict[str, object] = {"index": index, "command": argv}
+    global_argv, cleaned_argv = _extract_global_flags(argv)
+    if global_argv:
+        flags = dict.fromkeys(flag.split("=", 1)[0] for flag in global_argv if flag.startswith("--"))
+        message = f"Global flags are not allowed in a batch line: {' '.join(flags)}"
+        entry["error"] = {"type": "UsageError", "message": message}
+        return entry
+    try:
+        args = _batch_parser().parse_args(cleaned_argv)
+    except ValueError as exc:
+        entry["error"] = {"type": "UsageError", "message": str(exc)}
+        return entry
+    except SystemExit:
+        entry["error"] = {"type": "UsageError", "message": "Invalid arguments"}
+        return entry
+    if args.command_path in BATCH_EXCLUDED:
+        entry["error"] = {"type": "UsageError", "message": "Command is not allowed in a batch"}
+        return entry
+    entry["args"] = args
+    return entry
+
+
+def _run_batch_entry(auth: AuthConfig, entry: dict[str, object]) -> dict[str, object]:
+    args = entry.pop("args", None)
+    if not isinstance(args, argparse.Namespace):
+        return {**entry, "ok": False}
+    try:
+        result = _jsonable(COMMANDS[args.command_path].handler(auth, args))
+    except Exception as exc:  # noqa: BLE001
+        error = ItemError.from_exception(exc)
+        return {**entry, "ok": False, "error": {"type": type(exc).__name__, **error.to_payload()}}
+    return {**entry, "ok": True, "result": result}
+
+
+def _jsonable(value: object) -> object:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, Mapping):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Iterable):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+EXIT_PARTIAL_FAILURE = 3
+JSON_STREAM_DEPTH = 2
+LABEL_TABLE_FIELDS = ("messagesTotal", "messagesUnread", "threadsUnread")
+GLOBAL_VALUE_FLAGS = (
+    "--auth-file",
+    "--connect-timeout",
+    "--read-timeout",
+    "--timeout",
+    "--deadline",
+    "--record",
+    "--replay",
+    "--replay-latency",
+    "--profile-out",
+)
+GLOBAL_SWITCH_FLAGS = ("--raw", "--sort-keys", "--http2")
+GLOBAL_OPTIONAL_VALUE_FLAGS = {"--profile": profiling.PROFILE_MODES}
+
+
+def _extract_global_flags(argv: Sequence[str]) -> tuple[list[str], list[str]]:
+    hoisted: list[str] = []
     cleaned: list[str] = []
     i = 0
     while i < len(argv):
         arg = argv[i]
-        if arg == "--auth-file":
+        if arg in GLOBAL_VALUE_FLAGS:
             if i + 1 < len(argv):
-                auth_file = argv[i + 1]
+                hoisted.extend([arg, argv[i + 1]])
                 i += 2
                 continue
-        if arg.startswith("--auth-file="):
-            auth_file = arg.split("=", 1)[1]
+        if arg.split("=", 1)[0] in GLOBAL_VALUE_FLAGS and "=" in arg:
+            hoisted.append(arg)
+            i += 1
+            continue
+        if arg in GLOBAL_OPTIONAL_VALUE_FLAGS:
+            choices = GLOBAL_OPTIONAL_VALUE_FLAGS[arg]
+            if i + 1 < len(argv) and argv[i + 1] in choices:
+                hoisted.append(f"{arg}={argv[i + 1]}")
+                i += 2
+                continue
+            hoisted.append(f"{arg}={choices[0]}")
+            i += 1
+            continue
+        if arg.split("=", 1)[0] in GLOBAL_OPTIONAL_VALUE_FLAGS:
+            hoisted.append(arg)
             i += 1
             continue
-        if arg == "--raw":
-            raw_mode = True
+        if arg in GLOBAL_SWITCH_FLAGS:
+            hoisted.append(arg)
             i += 1
             continue
         cleaned.append(arg)
         i += 1
-    return auth_file, raw_mode, cleaned
-
-
-def _parse_params(pairs: Sequence[str] | None) -> dict[str, list[str] | str] | None:
+    return hoisted, cleaned
+
+
+def _latency(value: str) -> str | float | None:
+    if value in ("recorded", "none"):
+        return value if value == "recorded" else None
+    return float(value)
+
+
+def _profiling(global_argv: Sequence[str]) -> ContextManager[object]:
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--profile", choices=profiling.PROFILE_MODES, default=None)
+    options.add_argument("--profile-out", dest="profile_out", default=None)
+    args, _ = options.parse_known_args(global_argv)
+    if args.profile is None:
+        return nullcontext()
+    output = args.profile_out
+    if output is None:
+        output = profiling.DEFAULT_OUTPUT[args.profile]
+        print(f"Writing profile to {Path(output).resolve()}", file=sys.stderr)
+    return profiling.profile(args.profile, output=output)
+
+
+def _cassette(args: argparse.Namespace) -> ContextManager[object]:
+    if args.record_path and args.replay_path:
+        message = "--record and --replay cannot be combined"
+        raise ValueError(message)
+    if args.record_path:
+        return use_cassette(args.record_path, mode="record")
+    if args.replay_path:
+        return use_cassette(args.replay_path, mode="replay", latency=args.replay_latency)
+    return nullcontext()
+
+
+def _parse_params(
+    pairs: Sequence[str] | Mapping[str, Sequence[str] | str] | None,
+) -> dict[str, list[str] | str] | None:
     if not pairs:
         return None
+    if isinstance(pairs, Mapping):
+        return {
+            key: value if isinstance(value, str) else list(value) for key, value in pairs.items()
+        }
     params: dict[str, list[str] | str] = {}
     for pair in pairs:
         if "=" not in pair:
@@ -584,6 +1410,15 @@ def _parse_params(pairs: Sequence[str] | None) -> dict[str, list[str] | str] | N
     return params
 
 
+def _parse_datetime(value: str) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        message = f"Invalid datetime: {value}"
+        raise argparse.ArgumentTypeError(message) from exc
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
 def _add_param_argument(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--param",
@@ -592,23 +1427,320 @@ def _add_param_argument(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def _render_calendar_list(payload: Mapping[str, object], raw: bool) -> int:
+def _add_workers_argument(parser: argparse.ArgumentParser, default: int = DEFAULT_MAX_WORKERS) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default,
+        help=f"Parallel requests (default: {default})",
+    )
+
+
+def _add_search_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--search-cache",
+        default=None,
+        help="Search cache file; repeated equivalent queries are served from it until the mailbox changes",
+    )
+    parser.add_argument(
+        "--search-ttl",
+        type=float,
+        default=DEFAULT_SEARCH_TTL,
+        help=f"Seconds before the cache re-checks mailbox history (default: {DEFAULT_SEARCH_TTL:g})",
+    )
+
+
+def _add_hydrate_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--hydrate",
+        choices=gmail_api.PAYLOAD_FORMATS,
+        default=None,
+        help="Fetch every listed item in parallel with this format",
+    )
+    parser.add_argument(
+        "--header",
+        dest="headers",
+        action="append",
+        help="metadataHeaders for --hydrate metadata. Repeatable.",
+    )
+    _add_workers_argument(parser)
+    _add_on_error_argument(parser)
+
+
+def _add_on_error_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--on-error",
+        choices=ON_ERROR_POLICIES,
+        default="continue",
+        help="continue: report failed items and keep going; fail-fast: stop at the first error",
+    )
+
+
+def _hydrate_listing(
+    payload: Mapping[str, object],
+    items_key: str,
+    fetch: Callable[[str], Mapping[str, object]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_error: str = "continue",
+) -> Mapping[str, object]:
+    items = payload.get(items_key, [])
+    if not isinstance(items, list):
+        message = f"Invalid gmail {items_key} response"
+        raise ValueError(message)
+    ids = [item["id"] for item in items if isinstance(item, dict) and isinstance(item.get("id"), str)]
+    results = fan_out(fetch, ids, max_workers=max_workers, on_error=on_error)
+    hydrated = {
+        **payload,
+        items_key: [result.value if result.error is None else _failed_item(result) for result in results],
+    }
+    summary = FanOutSummary.of(results)
+    if summary.failed:
+        hydrated["summary"] = summary.to_payload()
+    return hydrated
+
+
+def _failed_item(result: ItemResult[str, object]) -> dict[str, object]:
+    error = result.error.to_payload() if result.error is not None else {}
+    return {"id": result.item, "error": error}
+
+
+def _add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", required=True, help="NDJSON output file")
+    parser.add_argument("--state", required=True, help="Checkpoint state file")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the checkpoint in --state",
+    )
+
+
+def _items_key(endpoint_name: str) -> str:
+    items_key = endpoints.get(endpoint_name).items_key
+    if items_key is None:
+        message = f"Endpoint {endpoint_name} does not return a list"
+        raise ValueError(message)
+    return items_key
+
+
+def _job_name(*parts: object) -> str:
+    return json.dumps(parts, sort_keys=True)
+
+
+def _with_page_token(
+    params: Mapping[str, Sequence[str] | str] | None,
+    page_token: str | None,
+) -> dict[str, Sequence[str] | str] | None:
+    if page_token is None:
+        return dict(params) if params else None
+    merged: dict[str, Sequence[str] | str] = dict(params or {})
+    merged["pageToken"] = page_token
+    return merged
+
+
+def _message_ids(payload: Mapping[str, object]) -> list[str]:
+    messages = payload.get("messages", [])
+    if not isinstance(messages, list):
+        message = "Invalid gmail messages response"
+        raise ValueError(message)
+    return [
+        item["id"] for item in messages if isinstance(item, dict) and isinstance(item.get("id"), str)
+    ]
+
+
+def _calendar_ids(value: Sequence[str] | str | None) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _render_stream(payload: object, sort_keys: bool = False) -> int:
+    if isinstance(payload, Mapping):
+        _print_json(payload, sort_keys)
+        return 0
+    for item in payload:
+        print(json.dumps(item, sort_keys=sort_keys), flush=True)
+    return 0
+
+
+def _render_batch(entries: Iterable[Mapping[str, object]], sort_keys: bool = False) -> int:
+    total = failed = 0
+    for entry in entries:
+        print(json.dumps(entry, sort_keys=sort_keys), flush=True)
+        total += 1
+        failed += entry.get("ok") is not True
+    return _failure_status(failed, total)
+
+
+def _render_calendar_list(payload: Mapping[str, object], raw: bool, sort_keys: bool = False) -> int:
     if raw:
-        _print_json(payload)
+        _print_json(payload, sort_keys)
         return 0
     for item in Calendar.list_from_payload(payload):
         print(f"{item.calendar_id}\t{item.summary}")
     return 0
 
 
-def _render_mailbox_list(payload: Mapping[str, object], raw: bool) -> int:
+def _render_mailbox_list(
+    payload: Mapping[str, object],
+    raw: bool,
+    sort_keys: bool = False,
+    counts: bool = False,
+) -> int:
+    results = [_label_result(label) for label in _labels(payload)] if counts else []
+    summary = FanOutSummary.of(results)
     if raw:
-        _print_json(payload)
-        return 0
+        _print_json(payload, sort_keys)
+        return _failure_status(summary.failed, summary.total)
+    if counts:
+        for result in results:
+            if result.value is None:
+                continue
+            label = result.value
+            columns = [label.get(name, 0) for name in LABEL_TABLE_FIELDS]
+            print("\t".join(str(value) for value in [label.get("id", ""), label.get("name", ""), *columns]))
+        _report_failures(results, summary)
+        return _failure_status(summary.failed, summary.total)
     for item in Mailbox.list_from_payload(payload):
         print(f"{item.mailbox_id}\t{item.name}")
     return 0
 
 
-def _print_json(payload: Mapping[str, object]) -> None:
-    print(json.dumps(payload, sort_keys=True))
+def _render_endpoints(
+    selected: Sequence[endpoints.Endpoint],
+    raw: bool,
+    sort_keys: bool = False,
+) -> int:
+    if raw:
+        _print_json({"endpoints": [asdict(endpoint) for endpoint in selected]}, sort_keys)
+        return 0
+    for endpoint in selected:
+        print(f"{endpoint.name}\t{endpoint.method}\t{endpoint.path}")
+    return 0
+
+
+def _render_headers(
+    results: Sequence[ItemResult[str, MessageHeaders]],
+    headers: Sequence[str],
+    raw: bool,
+    sort_keys: bool = False,
+) -> int:
+    summary = FanOutSummary.of(results)
+    if raw:
+        messages: list[dict[str, object]] = []
+        for result in results:
+            row = result.value
+            if row is None:
+                messages.append(_failed_item(result))
+            else:
+                messages.append({"id": row.message_id, "threadId": row.thread_id, "headers": dict(row.headers)})
+        payload: dict[str, object] = {"messages": messages}
+        if summary.failed:
+            payload["summary"] = summary.to_payload()
+        _print_json(payload, sort_keys)
+        return _failure_status(summary.failed, summary.total)
+    for result in results:
+        if result.value is None:
+            continue
+        values = [_table_cell(result.value.headers.get(name, "")) for name in headers]
+        print("\t".join([result.value.message_id, *values]))
+    _report_failures(results, summary)
+    return _failure_status(summary.failed, summary.total)
+
+
+def _report_failures(results: Sequence[ItemResult[str, object]], summary: FanOutSummary) -> None:
+    for result in results:
+        if result.error is not None:
+            error = result.error
+            print(f"{result.item}\t{error.status or '-'}\t{error.reason}\t{error.message}", file=sys.stderr)
+    if summary.failed:
+        print(
+            f"{summary.failed} of {summary.total} failed ({summary.retryable} retryable)",
+            file=sys.stderr,
+        )
+
+
+def _table_cell(value: str) -> str:
+    return " ".join(value.split())
+
+
+def _failure_status(failed: int, total: int) -> int:
+    if not failed:
+        return 0
+    return 1 if failed >= total else EXIT_PARTIAL_FAILURE
+
+
+def _render_json(payload: object, args: argparse.Namespace) -> int:
+    _print_json(payload, args.sort_keys)
+    summary = payload.get("summary") if isinstance(payload, Mapping) else None
+    if isinstance(summary, Mapping):
+        return _failure_status(int(summary.get("failed", 0)), int(summary.get("total", 0)))
+    return 0
+
+
+def _render_counted(payload: Mapping[str, object], args: argparse.Namespace, done_key: str) -> int:
+    _print_json(payload, args.sort_keys)
+    labels = FanOutSummary.of([_label_result(label) for label in _labels(payload)])
+    failed = int(payload.get("failed", 0))
+    total = failed + int(payload.get(done_key, 0)) + labels.total
+    return _failure_status(failed + labels.failed, total)
+
+
+def _labels(payload: Mapping[str, object]) -> list[Mapping[str, object]]:
+    labels = payload.get("labels", [])
+    return [label for label in labels if isinstance(label, Mapping)] if isinstance(labels, list) else []
+
+
+def _label_result(label: Mapping[str, object]) -> ItemResult[str, Mapping[str, object]]:
+    error = label.get("error")
+    if isinstance(error, Mapping):
+        return ItemResult(str(label.get("id", "")), error=ItemError(**error))
+    return ItemResult(str(label.get("id", "")), value=label)
+
+
+def _print_json(payload: object, sort_keys: bool = False) -> None:
+    if isinstance(payload, http.RawJSON):
+        if not sort_keys:
+            _write_bytes(payload.body)
+            return
+        payload = payload.decode()
+    write = sys.stdout.write
+    for chunk in _iter_json(payload, sort_keys, JSON_STREAM_DEPTH):
+        write(chunk)
+    write("\n")
+
+
+def _write_bytes(body: bytes) -> None:
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        text = body.decode("utf-8")
+        sys.stdout.write(text if text.endswith("\n") else f"{text}\n")
+        return
+    sys.stdout.flush()
+    buffer.write(body)
+    if not body.endswith(b"\n"):
+        buffer.write(b"\n")
+    buffer.flush()
+
+
+def _iter_json(value: object, sort_keys: bool, depth: int) -> Iterator[str]:
+    if depth and isinstance(value, Mapping) and value and all(isinstance(key, str) for key in value):
+        yield "{"
+        for index, key in enumerate(sorted(value) if sort_keys else value):
+            yield f"{', ' if index else ''}{json.dumps(key)}: "
+            yield from _iter_json(value[key], sort_keys, depth - 1)
+        yield "}"
+    elif depth and isinstance(value, list) and value:
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from _iter_json(item, sort_keys, depth - 1)
+        yield "]"
+    else:
+        yield json.dumps(value, sort_keys=sort_keys)
+
+
+if __name__ == "__main__":
+    cli()
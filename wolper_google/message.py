@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Iterator, Mapping
+from email.message import Message
+
+from wolper_google.auth import AuthConfig
+from wolper_google import gmail
+
+
+class MessagePart:
+    def __init__(self, payload: Mapping[str, object], message: MessageView) -> None:
+        self._payload = payload
+        self._message = message
+        self._parts: list[MessagePart] | None = None
+        self._headers: dict[str, str] | None = None
+        self._data: bytes | None = None
+
+    @property
+    def part_id(self) -> str:
+        part_id = self._payload.get("partId", "")
+        return part_id if isinstance(part_id, str) else ""
+
+    @property
+    def mime_type(self) -> str:
+        mime_type = self._payload.get("mimeType", "")
+        return mime_type.lower() if isinstance(mime_type, str) else ""
+
+    @property
+    def filename(self) -> str:
+        filename = self._payload.get("filename", "")
+        return filename if isinstance(filename, str) else ""
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        if self._headers is None:
+            self._headers = _header_map(self._payload.get("headers"))
+        return self._headers
+
+    @property
+    def size(self) -> int:
+        size = self._body().get("size", 0)
+        return size if isinstance(size, int) else 0
+
+    @property
+    def attachment_id(self) -> str | None:
+        attachment_id = self._body().get("attachmentId")
+        return attachment_id if isinstance(attachment_id, str) else None
+
+    @property
+    def is_attachment(self) -> bool:
+        return bool(self.filename) or self.attachment_id is not None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def parts(self) -> list[MessagePart]:
+        if self._parts is None:
+            raw_parts = self._payload.get("parts", [])
+            if not isinstance(raw_parts, list):
+                message = "Invalid message part list"
+                raise ValueError(message)
+            self._parts = [
+                MessagePart(item, self._message) for item in raw_parts if isinstance(item, dict)
+            ]
+        return self._parts
+
+    def walk(self) -> Iterator[MessagePart]:
+        yield self
+        for part in self.parts:
+            yield from part.walk()
+
+    def data(self) -> bytes:
+        if self._data is None:
+            raw = self._body().get("data")
+            if isinstance(raw, str):
+                self._data = decode_base64url(raw)
+            elif self.attachment_id is not None:
+                self._data = self._message.fetch_attachment(self.attachment_id)
+            else:
+                self._data = b""
+        return self._data
+
+    def text(self) -> str:
+        charset = _content_charset(self.headers.get("content-type", "")) or "utf-8"
+        try:
+            return self.data().decode(charset, errors="replace")
+        except LookupError:
+            return self.data().decode("utf-8", errors="replace")
+
+    def _body(self) -> Mapping[str, object]:
+        body = self._payload.get("body", {})
+        return body if isinstance(body, dict) else {}
+
+
+class MessageView:
+    def __init__(
+        self,
+        payload: Mapping[str, object],
+        auth: AuthConfig | None = None,
+        user_id: str = "me",
+    ) -> None:
+        root = payload.get("payload")
+        if not isinstance(root, dict):
+            message = "Message has no payload; fetch it with format=full"
+            raise ValueError(message)
+        self._raw = payload
+        self._auth = auth
+        self._user_id = user_id
+        self._root = MessagePart(root, self)
+        self._by_id: dict[str, MessagePart] = {}
+
+    @classmethod
+    def fetch(cls, auth: AuthConfig, message_id: str, user_id: str = "me") -> MessageView:
+        payload = gmail.get_message(auth, message_id, user_id=user_id, params={"format": "full"})
+        return cls(payload, auth=auth, user_id=user_id)
+
+    @property
+    def message_id(self) -> str:
+        message_id = self._raw.get("id", "")
+        return message_id if isinstance(message_id, str) else ""
+
+    @property
+    def thread_id(self) -> str:
+        thread_id = self._raw.get("threadId", "")
+        return thread_id if isinstance(thread_id, str) else ""
+
+    @property
+    def snippet(self) -> str:
+        snippet = self._raw.get("snippet", "")
+        return snippet if isinstance(snippet, str) else ""
+
+    @property
+    def root(self) -> MessagePart:
+        return self._root
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._root.headers
+
+    def walk(self) -> Iterator[MessagePart]:
+        return self._root.walk()
+
+    def part(self, part_id: str) -> MessagePart | None:
+        cached = self._by_id.get(part_id)
+        if cached is not None:
+            return cached
+        for part in self.walk():
+            self._by_id.setdefault(part.part_id, part)
+            if part.part_id == part_id:
+                return part
+        return None
+
+    def find(self, mime_type: str) -> MessagePart | None:
+        wanted = mime_type.lower()
+        for part in self.walk():
+            if part.mime_type == wanted and not part.is_attachment:
+                return part
+        return None
+
+    def plain_text(self) -> str | None:
+        part = self.find("text/plain")
+        return part.text() if part is not None else None
+
+    def html(self) -> str | None:
+        part = self.find("text/html")
+        return part.text() if part is not None else None
+
+    def attachments(self) -> Iterator[MessagePart]:
+        for part in self.walk():
+            if part.is_attachment:
+                yield part
+
+    def fetch_attachment(self, attachment_id: str) -> bytes:
+        if self._auth is None:
+            message = "Auth is required to fetch attachment bodies"
+            raise ValueError(message)
+        payload = gmail.get_message_attachment(
+            self._auth,
+            self.message_id,
+            attachment_id,
+            user_id=self._user_id,
+        )
+        data = payload.get("data")
+        if not isinstance(data, str):
+            message = "Invalid gmail attachment response"
+            raise ValueError(message)
+        return decode_base64url(data)
+
+
+def decode_base64url(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _header_map(headers: object) -> dict[str, str]:
+    mapped: dict[str, str] = {}
+    if not isinstance(headers, list):
+        return mapped
+    for header in headers:
+        if not isinstance(header, dict):
+            continue
+        name = header.get("name")
+        value = header.get("value")
+        if isinstance(name, str) and isinstance(value, str):
+            mapped.setdefault(name.lower(), value)
+    return mapped
+
+
+def _content_charset(content_type: str) -> str | None:
+    if not content_type:
+        return None
+    parsed = Message()
+    parsed["Content-Type"] = content_type
+    return parsed.get_content_charset()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+import cProfile
+from dataclasses import dataclass
+import io
+from pathlib import Path
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import ContextManager, TextIO
+
+PROFILE_MODES = ("cpu", "mem")
+PHASES = ("startup", "auth", "request", "decode", "render")
+DEFAULT_OUTPUT = {"cpu": "wolper-google.prof", "mem": "wolper-google.folded"}
+REPORT_LIMIT = 15
+TRACEMALLOC_FRAMES = 32
+
+_NO_PHASE = nullcontext()
+_active: Profile | None = None
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0
+    allocated: int = 0
+
+
+class Profile:
+    def __init__(self, mode: str = "cpu") -> None:
+        if mode not in PROFILE_MODES:
+            message = f"Unknown profile mode: {mode}"
+            raise ValueError(message)
+        self.mode = mode
+        self.phases: dict[str, PhaseStats] = {name: PhaseStats() for name in PHASES}
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self._lock = threading.Lock()
+        self._profiler: cProfile.Profile | None = None
+        self._thread_profilers: list[cProfile.Profile] = []
+        self._stats: pstats.Stats | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.mode == "cpu":
+            self._profiler = cProfile.Profile()
+            threading.setprofile(self._profile_thread)
+            self._profiler.enable()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def stop(self) -> None:
+        if self.mode == "cpu" and self._profiler is not None:
+            self._profiler.disable()
+            threading.setprofile(None)
+            with self._lock:
+                workers = list(self._thread_profilers)
+                self._thread_profilers.clear()
+            self._stats = _merge_stats(self._profiler, workers)
+        elif tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.seconds = time.perf_counter() - self._started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tracing = self.mode == "mem" and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = tracemalloc.get_traced_memory()[0] - before if tracing else 0
+            with self._lock:
+                stats = self.phases.setdefault(name, PhaseStats())
+                stats.calls += 1
+                stats.seconds += elapsed
+                stats.allocated += allocated
+
+    def write(self, path: str | Path) -> Path:
+        output = Path(path).expanduser()
+        if self.mode == "cpu":
+            if self._stats is None:
+                message = "Profile has not been stopped"
+                raise ValueError(message)
+            self._stats.dump_stats(output)
+            return output
+        output.write_text("".join(f"{line}\n" for line in self.collapsed_stacks()), encoding="utf-8")
+        return output
+
+    def collapsed_stacks(self) -> list[str]:
+        if self._snapshot is None:
+            return []
+        stacks: dict[str, int] = {}
+        for trace in self._snapshot.traces:
+            frames = ";".join(
+                f"{Path(frame.filename).name}:{frame.lineno}" for frame in reversed(trace.traceback)
+            )
+            stacks[frames] = stacks.get(frames, 0) + trace.size
+        return [f"{frames} {size}" for frames, size in sorted(stacks.items())]
+
+    def report(self, stream: TextIO | None = None, limit: int = REPORT_LIMIT) -> None:
+        stream = stream or sys.stderr
+        memory = self.mode == "mem"
+        header = f"{'phase':<10}{'calls':>8}{'seconds':>12}"
+        print(f"profile ({self.mode}) {self.seconds:.3f}s", file=stream)
+        print(header + (f"{'allocated':>14}" if memory else ""), file=stream)
+        for name, stats in self.phases.items():
+            line = f"{name:<10}{stats.calls:>8}{stats.seconds:>12.4f}"
+            print(line + (f"{_size(stats.allocated):>14}" if memory else ""), file=stream)
+        if memory:
+            print(f"peak traced memory {_size(self.peak_bytes)}", file=stream)
+            if self._snapshot is not None:
+                for stat in self._snapshot.statistics("lineno")[:limit]:
+                    frame = stat.traceback[0]
+                    print(f"{_size(stat.size):>10}  {frame.filename}:{frame.lineno}", file=stream)
+            return
+        if self._stats is not None:
+            text = io.StringIO()
+            self._stats.stream = text
+            self._stats.sort_stats("cumulative").print_stats(limit)
+            stream.write(text.getvalue())
+
+    def _profile_thread(self, frame: object, event: str, arg: object) -> None:
+        profiler = cProfile.Profile()
+        with self._lock:
+            if self._stats is not None:
+                sys.setprofile(None)
+                return
+            self._thread_profilers.append(profiler)
+        profiler.enable()
+
+
+def phase(name: str) -> ContextManager[None]:
+    profile = _active
+    if profile is None:
+        return _NO_PHASE
+    return profile.phase(name)
+
+
+def active() -> Profile | None:
+    return _active
+
+
+@contextmanager
+def profile(
+    mode: str = "cpu",
+    output: str | Path | None = None,
+    report: bool = True,
+    stream: TextIO | None = None,
+) -> Iterator[Profile]:
+    global _active
+    if _active is not None:
+        message = "A profile is already running"
+        raise RuntimeError(message)
+    current = Profile(mode)
+    _active = current
+    current.start()
+    try:
+        yield current
+    finally:
+        current.stop()
+        _active = None
+        if output is not None:
+            current.write(output)
+        if report:
+            current.report(stream)
+
+
+def _merge_stats(profiler: cProfile.Profile, workers: list[cProfile.Profile]) -> pstats.Stats:
+    merged = pstats.Stats(profiler)
+    for worker in workers:
+        worker.create_stats()
+        if worker.stats:
+            merged.add(worker)
+    return merged
+
+
+def _size(value: int) -> str:
+    if abs(value) < 1024:
+        return f"{value} B"
+    if abs(value) < 1024 * 1024:
+        return f"{value / 1024:.1f} KiB"
+    return f"{value / (1024 * 1024):.1f} MiB"
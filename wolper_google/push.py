@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import queue
+import sys
+import threading
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlsplit
+
+from wolper_google.auth import AuthConfig
+from wolper_google import calendar, gmail
+
+
+@dataclass(frozen=True)
+class GmailNotification:
+    email_address: str
+    history_id: str
+
+
+@dataclass(frozen=True)
+class CalendarNotification:
+    channel_id: str
+    resource_id: str
+    resource_state: str
+    message_number: str
+    resource_uri: str
+
+
+Notification = GmailNotification | CalendarNotification
+NotificationHandler = Callable[[Notification], None]
+
+
+def parse_pubsub_push(payload: Mapping[str, object]) -> GmailNotification:
+    message = payload.get("message")
+    data = message.get("data") if isinstance(message, dict) else None
+    if not isinstance(data, str):
+        error = "Invalid Pub/Sub push payload"
+        raise ValueError(error)
+    decoded = json.loads(base64.b64decode(data + "=" * (-len(data) % 4)))
+    email_address = decoded.get("emailAddress") if isinstance(decoded, dict) else None
+    history_id = decoded.get("historyId") if isinstance(decoded, dict) else None
+    if not isinstance(email_address, str) or history_id is None:
+        error = "Invalid Gmail notification data"
+        raise ValueError(error)
+    return GmailNotification(email_address=email_address, history_id=str(history_id))
+
+
+def parse_channel_headers(headers: Mapping[str, str] | Message) -> CalendarNotification:
+    channel_id = headers.get("X-Goog-Channel-ID")
+    resource_id = headers.get("X-Goog-Resource-ID")
+    if not channel_id or not resource_id:
+        message = "Missing channel headers"
+        raise ValueError(message)
+    return CalendarNotification(
+        channel_id=channel_id,
+        resource_id=resource_id,
+        resource_state=headers.get("X-Goog-Resource-State", ""),
+        message_number=headers.get("X-Goog-Message-Number", ""),
+        resource_uri=headers.get("X-Goog-Resource-URI", ""),
+    )
+
+
+class NotificationServer:
+    def __init__(
+        self,
+        handler: NotificationHandler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        verify_token: str | None = None,
+    ) -> None:
+        self._handler = handler
+        self._verify_token = verify_token
+        self._queue: queue.Queue[Notification | None] = queue.Queue()
+        self._server = ThreadingHTTPServer((host, port), self._request_handler())
+        self._server.daemon_threads = True
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        for target in (self._server.serve_forever, self._drain):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def serve_forever(self) -> None:
+        worker = threading.Thread(target=self._drain, daemon=True)
+        worker.start()
+        self._threads.append(worker)
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._queue.put(None)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+        self._threads.clear()
+
+    def _drain(self) -> None:
+        while True:
+            notification = self._queue.get()
+            if notification is None:
+                return
+            try:
+                self._handler(notification)
+            except Exception as exc:  # noqa: BLE001
+                print(f"Notification handler failed: {exc}", file=sys.stderr)
+
+    def _accept(self, notification: Notification) -> None:
+        self._queue.put(notification)
+
+    def _request_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                try:
+                    notification = server._parse(self.path, self.headers, body)
+                except PermissionError:
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+                except ValueError:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                server._accept(notification)
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        return Handler
+
+    def _parse(self, path: str, headers: Message, body: bytes) -> Notification:
+        if headers.get("X-Goog-Channel-ID") is not None:
+            self._check_token(headers.get("X-Goog-Channel-Token"))
+            return parse_channel_headers(headers)
+        query = parse_qs(urlsplit(path).query)
+        self._check_token(query.get("token", [None])[0])
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            message = "Invalid notification body"
+            raise ValueError(message) from exc
+        if not isinstance(payload, dict):
+            message = "Invalid notification body"
+            raise ValueError(message)
+        return parse_pubsub_push(payload)
+
+    def _check_token(self, token: str | None) -> None:
+        if self._verify_token is not None and token != self._verify_token:
+            message = "Notification token mismatch"
+            raise PermissionError(message)
+
+
+class IncrementalSync:
+    def __init__(
+        self,
+        auth: AuthConfig,
+        emit: Callable[[Mapping[str, object]], None],
+        start_history_id: str | None = None,
+        channels: Mapping[str, str] | None = None,
+        user_id: str = "me",
+    ) -> None:
+        self._auth = auth
+        self._emit = emit
+        self._history_id = start_history_id
+        self._channels = dict(channels or {})
+        self._sync_tokens: dict[str, str] = {}
+        self._user_id = user_id
+        self._lock = threading.Lock()
+
+    def __call__(self, notification: Notification) -> None:
+        with self._lock:
+            if isinstance(notification, GmailNotification):
+                self._sync_gmail(notification)
+            else:
+                self._sync_calendar(notification)
+
+    def _sync_gmail(self, notification: GmailNotification) -> None:
+        start_history_id = self._history_id
+        if start_history_id is None:
+            self._history_id = notification.history_id
+            return
+        try:
+            self._list_history(start_history_id)
+        except HTTPError as exc:
+            if exc.code != 404:
+                raise
+            profile = gmail.get_profile(self._auth, user_id=self._user_id)
+            history_id = profile.get("historyId", notification.history_id)
+            self._history_id = str(history_id)
+
+    def _list_history(self, start_history_id: str) -> None:
+        latest = ""
+        for page in _pages(
+            lambda params: gmail.list_history(
+                self._auth,
+                start_history_id=start_history_id,
+                user_id=self._user_id,
+                params=params,
+            )
+        ):
+            for record in page.get("history", []) or []:
+                self._emit({"source": "gmail", "history": record})
+            history_id = page.get("historyId")
+            if isinstance(history_id, str):
+                latest = history_id
+        if latest:
+            self._history_id = latest
+
+    def _sync_calendar(self, notification: CalendarNotification) -> None:
+        calendar_id = self._channels.get(notification.channel_id)
+        if calendar_id is None or notification.resource_state not in ("sync", "exists"):
+            return
+        sync_token = self._sync_tokens.get(calendar_id)
+        if notification.resource_state == "sync" and sync_token is not None:
+            return
+        try:
+            self._list_events(calendar_id, sync_token, emit=sync_token is not None)
+        except HTTPError as exc:
+            if exc.code != 410:
+                raise
+            self._sync_tokens.pop(calendar_id, None)
+            self._list_events(calendar_id, None, emit=False)
+
+    def _list_events(self, calendar_id: str, sync_token: str | None, emit: bool) -> None:
+        base: dict[str, str] = {"syncToken": sync_token} if sync_token else {}
+        for page in _pages(
+            lambda params: calendar.list_events(self._auth, calendar_id, params={**base, **params})
+        ):
+            if emit:
+                for item in page.get("items", []) or []:
+                    self._emit({"source": "calendar", "calendarId": calendar_id, "event": item})
+            next_sync_token = page.get("nextSyncToken")
+            if isinstance(next_sync_token, str):
+                self._sync_tokens[calendar_id] = next_sync_token
+
+
+def _pages(
+    fetch: Callable[[dict[str, str]], Mapping[str, object]],
+) -> Iterator[Mapping[str, object]]:
+    params: dict[str, str] = {}
+    while True:
+        page = fetch(params)
+        yield page
+        token = page.get("nextPageToken")
+        if not isinstance(token, str) or not token:
+            return
+        params = {"pageToken": token}
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import calendar as calendar_days
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+import heapq
+from itertools import count as counter
+from zoneinfo import ZoneInfo
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+UNSUPPORTED_PARTS = frozenset({"BYWEEKNO", "BYHOUR", "BYMINUTE", "BYSECOND"})
+MAX_EMPTY_PERIODS = 4000
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    freq: str
+    interval: int = 1
+    count: int | None = None
+    until: datetime | date | None = None
+    by_day: tuple[tuple[int, int], ...] = ()
+    by_month_day: tuple[int, ...] = ()
+    by_month: tuple[int, ...] = ()
+    by_year_day: tuple[int, ...] = ()
+    by_set_pos: tuple[int, ...] = ()
+    week_start: int = 0
+
+    @classmethod
+    def parse(cls, text: str) -> RecurrenceRule:
+        body = text.split(":", 1)[1] if text.upper().startswith("RRULE:") else text
+        parts: dict[str, str] = {}
+        for item in body.split(";"):
+            name, _, value = item.partition("=")
+            if name:
+                parts[name.strip().upper()] = value.strip().upper()
+        unsupported = sorted(UNSUPPORTED_PARTS & set(parts))
+        freq = parts.get("FREQ", "")
+        if freq not in FREQUENCIES or unsupported:
+            message = f"Unsupported recurrence rule: {text}"
+            raise ValueError(message)
+        return cls(
+            freq=freq,
+            interval=max(1, int(parts.get("INTERVAL", "1"))),
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+            until=_parse_until(parts["UNTIL"]) if "UNTIL" in parts else None,
+            by_day=tuple(_weekday(value) for value in _split(parts.get("BYDAY"))),
+            by_month_day=tuple(int(value) for value in _split(parts.get("BYMONTHDAY"))),
+            by_month=tuple(int(value) for value in _split(parts.get("BYMONTH"))),
+            by_year_day=tuple(int(value) for value in _split(parts.get("BYYEARDAY"))),
+            by_set_pos=tuple(int(value) for value in _split(parts.get("BYSETPOS"))),
+            week_start=WEEKDAYS.index(parts.get("WKST", "MO")),
+        )
+
+    def dates(self, start: date, after: date | None = None) -> Iterator[date]:
+        first = self._period_before(start, after) if self.count is None and after is not None else 0
+        produced = 0
+        empty = 0
+        for period in counter(first):
+            try:
+                candidates = sorted(self._candidates(start, period))
+            except (OverflowError, ValueError):
+                return
+            if self.by_set_pos:
+                candidates = _select_positions(candidates, self.by_set_pos)
+            found = False
+            for candidate in candidates:
+                if candidate < start:
+                    continue
+                if self.count is not None and produced >= self.count:
+                    return
+                found = True
+                produced += 1
+                yield candidate
+            empty = 0 if found else empty + 1
+            if empty > MAX_EMPTY_PERIODS:
+                return
+
+    def _period_before(self, start: date, target: date) -> int:
+        if target <= start:
+            return 0
+        if self.freq == "DAILY":
+            elapsed = (target - start).days
+        elif self.freq == "WEEKLY":
+            first_week = _week_start(start, self.week_start)
+            elapsed = (_week_start(target, self.week_start) - first_week).days // 7
+        elif self.freq == "MONTHLY":
+            elapsed = (target.year - start.year) * 12 + target.month - start.month
+        else:
+            elapsed = target.year - start.year
+        return max(0, elapsed // self.interval - 1)
+
+    def _candidates(self, start: date, period: int) -> Iterable[date]:
+        step = period * self.interval
+        if self.freq == "DAILY":
+            day = start + timedelta(days=step)
+            return [day] if self._matches_daily(day) else []
+        if self.freq == "WEEKLY":
+            week = _week_start(start, self.week_start) + timedelta(weeks=step)
+            weekdays = {weekday for _, weekday in self.by_day} or {start.weekday()}
+            days = [week + timedelta(days=offset) for offset in range(7)]
+            return [
+                day
+                for day in days
+                if day.weekday() in weekdays and (not self.by_month or day.month in self.by_month)
+            ]
+        if self.freq == "MONTHLY":
+            year, month = divmod(start.year * 12 + start.month - 1 + step, 12)
+            month += 1
+            if self.by_month and month not in self.by_month:
+                return []
+            return self._month_candidates(year, month, start)
+        year = start.year + step
+        if self.by_year_day:
+            days_in_year = 366 if calendar_days.isleap(year) else 365
+            return [
+                date(year, 1, 1) + timedelta(days=(value if value > 0 else days_in_year + value + 1) - 1)
+                for value in self.by_year_day
+                if 0 < abs(value) <= days_in_year
+            ]
+        if self.by_day and not self.by_month and not self.by_month_day:
+            return _nth_weekdays(date(year, 1, 1), date(year, 12, 31), self.by_day)
+        months = self.by_month or (range(1, 13) if self.by_month_day or self.by_day else (start.month,))
+        return [day for month in months for day in self._month_candidates(year, month, start)]
+
+    def _month_candidates(self, year: int, month: int, start: date) -> list[date]:
+        length = calendar_days.monthrange(year, month)[1]
+        if self.by_month_day:
+            days = [
+                date(year, month, value if value > 0 else length + value + 1)
+                for value in self.by_month_day
+                if 0 < abs(value) <= length
+            ]
+            if self.by_day:
+                weekdays = {weekday for _, weekday in self.by_day}
+                days = [day for day in days if day.weekday() in weekdays]
+            return days
+        if self.by_day:
+            return _nth_weekdays(date(year, month, 1), date(year, month, length), self.by_day)
+        return [date(year, month, start.day)] if start.day <= length else []
+
+    def _matches_daily(self, day: date) -> bool:
+        if self.by_month and day.month not in self.by_month:
+            return False
+        if self.by_month_day:
+            length = calendar_days.monthrange(day.year, day.month)[1]
+            if day.day not in self.by_month_day and day.day - length - 1 not in self.by_month_day:
+                return False
+        return not self.by_day or day.weekday() in {weekday for _, weekday in self.by_day}
+
+
+class EventSeries:
+    def __init__(
+        self,
+        master: Mapping[str, object],
+        exceptions: Iterable[Mapping[str, object]] = (),
+        default_tz: str = "UTC",
+    ) -> None:
+        self.master = master
+        self.event_id = str(master.get("id", ""))
+        start = master.get("start")
+        end = master.get("end")
+        if not isinstance(start, Mapping) or not isinstance(end, Mapping):
+            message = f"Event {self.event_id} has no start or end"
+            raise ValueError(message)
+        self.all_day = "date" in start
+        self.zone_name = str(start.get("timeZone") or default_tz)
+        self.zone = _zone(self.zone_name)
+        self.start = _event_time(start, self.zone)
+        self.duration = _event_time(end, self.zone) - self.start
+        self.rules: list[RecurrenceRule] = []
+        self.excluded: set[object] = set()
+        rdates: list[datetime] = []
+        for line in master.get("recurrence", []) or []:
+            name, _, value = str(line).partition(":")
+            kind, _, parameters = name.partition(";")
+            kind = kind.upper()
+            if kind == "RRULE":
+                self.rules.append(RecurrenceRule.parse(value))
+            elif kind in ("EXDATE", "RDATE"):
+                zone = _parameter_zone(parameters) or self.zone
+                stamps = [self._localize(_parse_stamp(item, zone)) for item in _split(value)]
+                if kind == "EXDATE":
+                    self.excluded.update(self._key(stamp) for stamp in stamps)
+                else:
+                    rdates.extend(stamps)
+        self.rdates = sorted(set(rdates))
+        self.overrides: dict[object, Mapping[str, object]] = {}
+        for exception in exceptions:
+            original = exception.get("originalStartTime")
+            if isinstance(original, Mapping):
+                self.overrides[self._key(_event_time(original, self.zone))] = exception
+
+    def occurrences(self, time_min: datetime, time_max: datetime) -> Iterator[dict[str, object]]:
+        lower = _aware(time_min)
+        upper = _aware(time_max)
+        moved = sorted(
+            (
+                (_sort_key(self._localize(_event_time(event["start"], self.zone))), index, dict(event))
+                for index, event in enumerate(self.overrides.values())
+                if event.get("status") != "cancelled" and _overlaps(event, self.zone, lower, upper)
+            ),
+            key=lambda item: item[:2],
+        )
+        generated = (
+            (_sort_key(start), index, self._instance(start))
+            for index, start in enumerate(self._starts(lower - self.duration, upper))
+            if start + self.duration > lower and self._key(start) not in self.overrides
+        )
+        for _, _, event in heapq.merge(generated, moved, key=lambda item: item[:2]):
+            yield event
+
+    def _starts(self, after: datetime, before: datetime) -> Iterator[datetime]:
+        streams = [self._rule_starts(rule, after) for rule in self.rules]
+        streams.append(iter(self.rdates[bisect_left(self.rdates, self._localize(after)) :]))
+        if not self.rules and not self.rdates:
+            streams.append(iter([self.start]))
+        previous: object = None
+        for start in heapq.merge(*streams):
+            if start >= before:
+                return
+            key = self._key(start)
+            if key == previous or key in self.excluded:
+                continue
+            previous = key
+            yield start
+
+    def _rule_starts(self, rule: RecurrenceRule, after: datetime) -> Iterator[datetime]:
+        start_date = self.start.date()
+        local_time = self.start.timetz().replace(tzinfo=None)
+        after_date = after.astimezone(self.zone).date() if isinstance(after, datetime) else after
+        for day in rule.dates(start_date, after_date):
+            start = datetime.combine(day, local_time, tzinfo=self.zone)
+            if rule.until is not None and not _before_until(start, day, rule.until, self.all_day):
+                return
+            yield start
+
+    def _instance(self, start: datetime) -> dict[str, object]:
+        instance = {key: value for key, value in self.master.items() if key != "recurrence"}
+        stamp = self._event_time_payload(start)
+        instance.update(
+            {
+                "id": f"{self.event_id}_{self._stamp(start)}",
+                "recurringEventId": self.event_id,
+                "originalStartTime": stamp,
+                "start": stamp,
+                "end": self._event_time_payload(start + self.duration),
+            }
+        )
+        return instance
+
+    def _event_time_payload(self, value: datetime) -> dict[str, object]:
+        if self.all_day:
+            return {"date": value.date().isoformat()}
+        return {"dateTime": value.isoformat(), "timeZone": self.zone_name}
+
+    def _localize(self, value: datetime) -> datetime:
+        return value.astimezone(self.zone)
+
+    def _key(self, value: datetime) -> object:
+        return value.date() if self.all_day else value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def _stamp(self, value: datetime) -> str:
+        if self.all_day:
+            return value.strftime("%Y%m%d")
+        return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+class EventSet:
+    def __init__(self, events: Iterable[Mapping[str, object]], default_tz: str = "UTC") -> None:
+        self.default_tz = default_tz
+        self.single: list[Mapping[str, object]] = []
+        masters: dict[str, Mapping[str, object]] = {}
+        exceptions: dict[str, list[Mapping[str, object]]] = {}
+        for event in events:
+            parent = event.get("recurringEventId")
+            if isinstance(parent, str) and parent:
+                exceptions.setdefault(parent, []).append(event)
+            elif event.get("recurrence"):
+                masters[str(event.get("id", ""))] = event
+            elif event.get("status") != "cancelled":
+                self.single.append(event)
+        self.series = [
+            EventSeries(master, exceptions.pop(event_id, ()), default_tz)
+            for event_id, master in masters.items()
+        ]
+        self.single.extend(
+            event
+            for orphans in exceptions.values()
+            for event in orphans
+            if event.get("status") != "cancelled"
+        )
+
+    def between(self, time_min: datetime, time_max: datetime) -> Iterator[dict[str, object]]:
+        zone = _zone(self.default_tz)
+        lower = _aware(time_min)
+        upper = _aware(time_max)
+        single = sorted(
+            (
+                (_sort_key(_event_time(event["start"], zone)), -1, dict(event))
+                for event in self.single
+                if isinstance(event.get("start"), Mapping) and _overlaps(event, zone, lower, upper)
+            ),
+            key=lambda item: item[:2],
+        )
+        streams = [_keyed(series, index, lower, upper) for index, series in enumerate(self.series)]
+        for _, _, event in heapq.merge(single, *streams, key=lambda item: item[:2]):
+            yield event
+
+
+def expand_events(
+    events: Iterable[Mapping[str, object]],
+    time_min: datetime,
+    time_max: datetime,
+    default_tz: str = "UTC",
+) -> Iterator[dict[str, object]]:
+    return EventSet(events, default_tz).between(time_min, time_max)
+
+
+def _keyed(
+    series: EventSeries,
+    index: int,
+    lower: datetime,
+    upper: datetime,
+) -> Iterator[tuple[float, int, dict[str, object]]]:
+    for event in series.occurrences(lower, upper):
+        yield _sort_key(_event_time(event["start"], series.zone)), index, event
+
+
+def _split(value: str | None) -> list[str]:
+    return [item for item in (value or "").split(",") if item]
+
+
+def _weekday(value: str) -> tuple[int, int]:
+    code = value[-2:]
+    if code not in WEEKDAYS:
+        message = f"Invalid BYDAY value: {value}"
+        raise ValueError(message)
+    ordinal = value[:-2]
+    return (int(ordinal) if ordinal not in ("", "+") else 0), WEEKDAYS.index(code)
+
+
+def _week_start(day: date, week_start: int) -> date:
+    return day - timedelta(days=(day.weekday() - week_start) % 7)
+
+
+def _nth_weekdays(first: date, last: date, by_day: tuple[tuple[int, int], ...]) -> list[date]:
+    days: list[date] = []
+    for ordinal, weekday in by_day:
+        day = first + timedelta(days=(weekday - first.weekday()) % 7)
+        matches: list[date] = []
+        while day <= last:
+            matches.append(day)
+            day += timedelta(weeks=1)
+        if ordinal == 0:
+            days.extend(matches)
+        elif -len(matches) <= ordinal <= len(matches):
+            days.append(matches[ordinal - 1 if ordinal > 0 else ordinal])
+    return days
+
+
+def _select_positions(candidates: list[date], positions: tuple[int, ...]) -> list[date]:
+    selected = {
+        candidates[position - 1 if position > 0 else position]
+        for position in positions
+        if position and -len(candidates) <= position <= len(candidates)
+    }
+    return sorted(selected)
+
+
+def _parse_until(value: str) -> datetime | date:
+    if "T" not in value:
+        return datetime.strptime(value, "%Y%m%d").date()
+    return _parse_stamp(value, timezone.utc)
+
+
+def _parse_stamp(value: str, zone: tzinfo) -> datetime:
+    text = value.strip()
+    if "T" not in text:
+        return datetime.strptime(text, "%Y%m%d").replace(tzinfo=zone)
+    if text.endswith("Z"):
+        return datetime.strptime(text[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+    return datetime.strptime(text, "%Y%m%dT%H%M%S").replace(tzinfo=zone)
+
+
+def _parameter_zone(parameters: str) -> tzinfo | None:
+    for parameter in parameters.split(";"):
+        name, _, value = parameter.partition("=")
+        if name.upper() == "TZID" and value:
+            return _zone(value)
+    return None
+
+
+def _zone(name: str) -> tzinfo:
+    if name.upper() in ("UTC", "Z", "ETC/UTC"):
+        return timezone.utc
+    return ZoneInfo(name)
+
+
+def _event_time(value: object, zone: tzinfo) -> datetime:
+    if not isinstance(value, Mapping):
+        message = "Invalid event time"
+        raise ValueError(message)
+    date_time = value.get("dateTime")
+    if isinstance(date_time, str):
+        parsed = datetime.fromisoformat(date_time.replace("Z", "+00:00"))
+        return parsed.astimezone(zone) if parsed.tzinfo else parsed.replace(tzinfo=zone)
+    day = value.get("date")
+    if isinstance(day, str):
+        return datetime.combine(date.fromisoformat(day), time(), tzinfo=zone)
+    message = "Invalid event time"
+    raise ValueError(message)
+
+
+def _overlaps(event: Mapping[str, object], zone: tzinfo, lower: datetime, upper: datetime) -> bool:
+    start = _event_time(event.get("start"), zone)
+    end = _event_time(event.get("end", event.get("start")), zone)
+    return start < upper and (end > lower or (start == end and start >= lower))
+
+
+def _before_until(start: datetime, day: date, until: datetime | date, all_day: bool) -> bool:
+    if isinstance(until, datetime):
+        return (day <= until.date()) if all_day else start <= until
+    return day <= until
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _sort_key(value: datetime) -> float:
+    return value.timestamp()
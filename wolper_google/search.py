@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+import copy
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import time
+from urllib.error import HTTPError
+
+from wolper_google.auth import AuthConfig
+from wolper_google import gmail
+
+SEARCH_RESOURCES = ("messages", "threads")
+DEFAULT_SEARCH_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 256
+OPERATOR_ALIASES = {"older": "before", "newer": "after"}
+DATE_OPERATORS = frozenset({"after", "before"})
+RELATIVE_OPERATORS = frozenset({"newer_than", "older_than"})
+OR_TOKENS = frozenset({"OR", "|"})
+_DATE = re.compile(r"^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$")
+
+
+def normalize_query(query: str) -> str:
+    tokens = list(_tokens(query))
+    try:
+        clauses, _ = _expression(tokens, 0, None)
+    except IndexError:
+        return " ".join(query.split())
+    return " ".join(_unique(clauses))
+
+
+def is_relative(query: str) -> bool:
+    return any(
+        token.lstrip("-").split(":", 1)[0].lower() in RELATIVE_OPERATORS for token in _tokens(query)
+    )
+
+
+@dataclass
+class SearchStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class AccountState:
+    email_address: str
+    history_id: str
+    checked: float = 0.0
+    entries: OrderedDict[str, dict[str, object]] = field(default_factory=OrderedDict)
+
+
+class SearchCache:
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float = DEFAULT_SEARCH_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = Path(path).expanduser() if path is not None else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = SearchStats()
+        self._clock = clock
+        self._accounts: dict[str, AccountState] = {}
+        self._aliases: dict[str, str] = {}
+        if self._path is not None and self._path.exists():
+            self._load(self._path)
+
+    def list_messages(
+        self,
+        auth: AuthConfig,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self.search(auth, "messages", user_id=user_id, params=params)
+
+    def list_threads(
+        self,
+        auth: AuthConfig,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        return self.search(auth, "threads", user_id=user_id, params=params)
+
+    def search(
+        self,
+        auth: AuthConfig,
+        resource: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+    ) -> Mapping[str, object]:
+        if resource not in SEARCH_RESOURCES:
+            message = f"Unknown search resource: {resource}"
+            raise ValueError(message)
+        state = self._account(auth, user_id)
+        now = self._clock()
+        if now - state.checked >= self.ttl:
+            self._validate(auth, user_id, state)
+        key, relative = _cache_key(resource, params)
+        entry = state.entries.get(key)
+        stored = entry.get("stored") if entry is not None else None
+        expired = relative and isinstance(stored, (int, float)) and now - stored >= self.ttl
+        if entry is not None and not expired:
+            state.entries.move_to_end(key)
+            self.stats.hits += 1
+            return copy.deepcopy(entry["payload"])
+        self.stats.misses += 1
+        fetch = gmail.list_messages if resource == "messages" else gmail.list_threads
+        payload = dict(fetch(auth, user_id=user_id, params=params))
+        state.entries[key] = {"stored": now, "payload": payload}
+        state.entries.move_to_end(key)
+        while len(state.entries) > self.max_entries:
+            state.entries.popitem(last=False)
+        return copy.deepcopy(payload)
+
+    def invalidate(self, email_address: str | None = None) -> None:
+        for address, state in self._accounts.items():
+            if email_address is None or address == email_address:
+                state.entries.clear()
+
+    def save(self) -> None:
+        if self._path is None:
+            return
+        payload = {
+            "aliases": self._aliases,
+            "accounts": {
+                address: {
+                    "historyId": state.history_id,
+                    "checked": state.checked,
+                    "entries": state.entries,
+                }
+                for address, state in self._accounts.items()
+            },
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_name(f"{self._path.name}.tmp")
+        temp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temp_path, self._path)
+
+    def _account(self, auth: AuthConfig, user_id: str) -> AccountState:
+        alias = f"{user_id}:{hashlib.sha256(auth.access_token.encode()).hexdigest()[:16]}"
+        address = self._aliases.get(alias)
+        if address is not None and address in self._accounts:
+            return self._accounts[address]
+        profile = gmail.get_profile(auth, user_id=user_id)
+        address = str(profile.get("emailAddress") or user_id)
+        self._aliases[alias] = address
+        state = self._accounts.get(address)
+        if state is None:
+            state = AccountState(address, str(profile.get("historyId", "")), checked=self._clock())
+            self._accounts[address] = state
+        return state
+
+    def _validate(self, auth: AuthConfig, user_id: str, state: AccountState) -> None:
+        try:
+            changed, history_id = _history_delta(auth, state.history_id, user_id)
+        except HTTPError as exc:
+            if exc.code != 404:
+                raise
+            profile = gmail.get_profile(auth, user_id=user_id)
+            changed, history_id = True, str(profile.get("historyId", ""))
+        if changed and state.entries:
+            state.entries.clear()
+            self.stats.invalidations += 1
+        if history_id:
+            state.history_id = history_id
+        state.checked = self._clock()
+
+    def _load(self, path: Path) -> None:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        accounts = payload.get("accounts", {}) if isinstance(payload, dict) else None
+        if not isinstance(accounts, dict):
+            message = f"Invalid search cache file: {path}"
+            raise ValueError(message)
+        aliases = payload.get("aliases", {})
+        if isinstance(aliases, dict):
+            self._aliases = {str(alias): str(address) for alias, address in aliases.items()}
+        for address, entry in accounts.items():
+            if not isinstance(entry, dict):
+                continue
+            entries = entry.get("entries", {})
+            checked = entry.get("checked", 0.0)
+            self._accounts[address] = AccountState(
+                email_address=address,
+                history_id=str(entry.get("historyId", "")),
+                checked=float(checked) if isinstance(checked, (int, float)) else 0.0,
+                entries=OrderedDict(entries if isinstance(entries, dict) else {}),
+            )
+
+
+def _history_delta(auth: AuthConfig, start_history_id: str, user_id: str) -> tuple[bool, str]:
+    changed = False
+    history_id = ""
+    params: dict[str, Sequence[str] | str] = {}
+    while True:
+        page = gmail.list_history(auth, start_history_id=start_history_id, user_id=user_id, params=params)
+        history = page.get("history")
+        changed = changed or (isinstance(history, list) and bool(history))
+        page_history_id = page.get("historyId")
+        if isinstance(page_history_id, str):
+            history_id = page_history_id
+        token = page.get("nextPageToken")
+        if changed or not isinstance(token, str) or not token:
+            return changed, history_id
+        params = {"pageToken": token}
+
+
+def _cache_key(resource: str, params: Mapping[str, Sequence[str] | str] | None) -> tuple[str, bool]:
+    rest: dict[str, list[str] | str] = {}
+    query = ""
+    page_token = ""
+    for name, value in (params or {}).items():
+        if name == "q":
+            query = value if isinstance(value, str) else " ".join(value)
+        elif name == "pageToken":
+            page_token = value if isinstance(value, str) else "".join(value)
+        else:
+            rest[name] = value if isinstance(value, str) else sorted(value)
+    key = json.dumps([resource, normalize_query(query), page_token, rest], sort_keys=True)
+    return key, is_relative(query)
+
+
+def _tokens(text: str) -> Iterator[str]:
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char.isspace():
+            index += 1
+        elif char in "(){}":
+            yield char
+            index += 1
+        elif char == '"':
+            end = text.find('"', index + 1)
+            end = len(text) if end < 0 else end
+            yield f'"{text[index + 1:end]}"'
+            index = end + 1
+        else:
+            end = index
+            while end < len(text) and not text[end].isspace() and text[end] not in '(){}"':
+                end += 1
+            word = text[index:end]
+            if word.endswith(":") and end < len(text) and text[end] in '("':
+                close = ")" if text[end] == "(" else '"'
+                stop = text.find(close, end + 1)
+                stop = len(text) - 1 if stop < 0 else stop
+                word += text[end:stop + 1]
+                end = stop + 1
+            yield word
+            index = end
+
+
+def _expression(tokens: list[str], position: int, closing: str | None) -> tuple[list[str], int]:
+    clauses: list[str] = []
+    while position < len(tokens) and tokens[position] != closing:
+        if tokens[position] in (")", "}", "AND") or tokens[position] in OR_TOKENS:
+            position += 1
+            continue
+        term, position = _term(tokens, position)
+        options = [term]
+        while position < len(tokens) and tokens[position] in OR_TOKENS:
+            position += 1
+            if position >= len(tokens) or tokens[position] == closing:
+                break
+            option, position = _term(tokens, position)
+            options.append(option)
+        clauses.append(" OR ".join(_unique(options)))
+    return clauses, position
+
+
+def _term(tokens: list[str], position: int) -> tuple[str, int]:
+    token = tokens[position]
+    negated = ""
+    if token == "-":
+        negated = "-"
+        position += 1
+        token = tokens[position]
+    elif token.startswith("-") and len(token) > 1:
+        negated = "-"
+        token = token[1:]
+    if token == "(":
+        clauses, position = _expression(tokens, position + 1, ")")
+        inner = _unique(clauses)
+        if len(inner) == 1 and (not negated or " " not in inner[0]):
+            return negated + inner[0], position + 1
+        return f"{negated}({' '.join(inner)})", position + 1
+    if token == "{":
+        position += 1
+        options: list[str] = []
+        while tokens[position] != "}":
+            option, position = _term(tokens, position)
+            options.append(option)
+        return f"{negated}{{{' '.join(_unique(options))}}}", position + 1
+    return negated + _atom(token), position + 1
+
+
+def _atom(token: str) -> str:
+    if token.startswith('"'):
+        return _phrase(token)
+    if ":" not in token:
+        return token.lower()
+    operator, value = token.split(":", 1)
+    operator = OPERATOR_ALIASES.get(operator.lower(), operator.lower())
+    if value.startswith("(") and value.endswith(")"):
+        return f"{operator}:({normalize_query(value[1:-1])})"
+    if value.startswith('"'):
+        return f"{operator}:{_phrase(value)}"
+    date = _DATE.match(value) if operator in DATE_OPERATORS else None
+    if date is not None:
+        year, month, day = (int(part) for part in date.groups())
+        return f"{operator}:{year:04d}/{month:02d}/{day:02d}"
+    return f"{operator}:{value.lower()}"
+
+
+def _phrase(token: str) -> str:
+    return '"' + " ".join(token.strip('"').lower().split()) + '"'
+
+
+def _unique(values: list[str]) -> list[str]:
+    return sorted(set(values))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import nullcontext
+import copy
+from dataclasses import dataclass, replace
+import threading
+import time
+from typing import Any, ContextManager, Union
+
+from wolper_google import endpoints, http
+from wolper_google.auth import AuthConfig
+
+AuthSource = Union[AuthConfig, Callable[[], AuthConfig]]
+DEFAULT_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class SessionStats:
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    quota_units: int = 0
+    seconds: float = 0.0
+
+
+class Session:
+    def __init__(
+        self,
+        timeouts: http.Timeouts | None = None,
+        max_in_flight: int | None = None,
+        cache_ttl: float | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.timeouts = timeouts
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._stats = SessionStats()
+        self._cache: OrderedDict[tuple[str, str], tuple[float, Mapping[str, Any]]] = OrderedDict()
+        self._slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+    def get_json(
+        self,
+        name: str,
+        auth: AuthSource,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        **path_values: str,
+    ) -> Mapping[str, Any]:
+        endpoint = endpoints.get(name)
+        url = endpoint.url(**path_values)
+        token = resolve_auth(auth).access_token
+        key = (http.build_url(url, params), token)
+        cacheable = self.cache_ttl is not None and endpoint.cacheable
+        if cacheable:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        options: dict[str, object] = {}
+        if params is not None:
+            options["params"] = params
+        if self.timeouts is not None:
+            options["timeouts"] = self.timeouts
+        payload = self._call(lambda: http.get_json(url, token, **options), endpoint.quota_cost)
+        if cacheable:
+            self._store(key, payload)
+        return payload
+
+    def post_json(
+        self,
+        name: str,
+        auth: AuthSource,
+        body: Mapping[str, object] | None = None,
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        **path_values: str,
+    ) -> Mapping[str, Any]:
+        endpoint = endpoints.get(name)
+        url = endpoint.url(**path_values)
+        token = resolve_auth(auth).access_token
+        if self.timeouts is not None:
+            return self._call(
+                lambda: http.post_json(url, token, body, params=params, timeouts=self.timeouts),
+                endpoint.quota_cost,
+            )
+        return self._call(lambda: http.post_json(url, token, body, params=params), endpoint.quota_cost)
+
+    def stats(self) -> SessionStats:
+        with self._lock:
+            return self._stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = SessionStats()
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _call(self, func: Callable[[], Mapping[str, Any]], quota_cost: int) -> Mapping[str, Any]:
+        slot: ContextManager[object] = self._slots if self._slots is not None else nullcontext()
+        with slot:
+            started = time.perf_counter()
+            try:
+                payload = func()
+            except Exception:
+                self._record(time.perf_counter() - started, error=True, quota_units=quota_cost)
+                raise
+        self._record(time.perf_counter() - started, quota_units=quota_cost)
+        return payload
+
+    def _record(
+        self,
+        seconds: float,
+        error: bool = False,
+        cache_hit: bool = False,
+        quota_units: int = 0,
+    ) -> None:
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats,
+                requests=stats.requests + (not cache_hit),
+                errors=stats.errors + error,
+                cache_hits=stats.cache_hits + cache_hit,
+                quota_units=stats.quota_units + quota_units,
+                seconds=stats.seconds + seconds,
+            )
+
+    def _cached(self, key: tuple[str, str]) -> Mapping[str, Any] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        self._record(0.0, cache_hit=True)
+        return copy.deepcopy(entry[1])
+
+    def _store(self, key: tuple[str, str], payload: Mapping[str, Any]) -> None:
+        expires = time.monotonic() + (self.cache_ttl or 0.0)
+        with self._lock:
+            self._cache[key] = (expires, copy.deepcopy(payload))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+_default_session = Session()
+
+
+def default_session() -> Session:
+    return _default_session
+
+
+def set_default_session(session: Session) -> Session:
+    global _default_session
+    previous = _default_session
+    _default_session = session
+    return previous
+
+
+def resolve_auth(auth: AuthSource) -> AuthConfig:
+    return auth if isinstance(auth, AuthConfig) else auth()
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parseaddr
+import heapq
+
+from wolper_google.auth import AuthConfig
+from wolper_google import gmail
+from wolper_google.concurrency import DEFAULT_MAX_WORKERS, ItemResult, fan_out
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+DATE_BUCKETS = ("day", "month", "year")
+DEFAULT_TOP = 10
+LIST_PAGE_SIZE = "500"
+LABEL_COUNT_FIELDS = ("messagesTotal", "messagesUnread", "threadsTotal", "threadsUnread")
+LABEL_COUNT_WORKERS = 64
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class MessageColumns:
+    senders: array = field(default_factory=lambda: array("I"))
+    days: array = field(default_factory=lambda: array("q"))
+    sender_names: list[str] = field(default_factory=list)
+    failed: int = 0
+    _sender_codes: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.senders)
+
+    def append(self, sender: str, timestamp_ms: int) -> None:
+        code = self._sender_codes.get(sender)
+        if code is None:
+            code = len(self.sender_names)
+            self._sender_codes[sender] = code
+            self.sender_names.append(sender)
+        self.senders.append(code)
+        self.days.append(timestamp_ms // 1000 // SECONDS_PER_DAY)
+
+    def extend(self, messages: Iterable[Mapping[str, object]]) -> None:
+        for message in messages:
+            self.append(_sender(message), _internal_date(message))
+
+
+@dataclass(frozen=True)
+class MailboxStats:
+    messages: int
+    labels: list[dict[str, object]]
+    senders: list[tuple[str, int]]
+    domains: list[tuple[str, int]]
+    dates: list[tuple[str, int]]
+    failed: int = 0
+
+    def to_payload(self) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "messages": self.messages,
+            "labels": self.labels,
+            "senders": [{"sender": name, "count": count} for name, count in self.senders],
+            "domains": [{"domain": name, "count": count} for name, count in self.domains],
+            "dates": [{"date": name, "count": count} for name, count in self.dates],
+        }
+        if self.failed:
+            payload["failed"] = self.failed
+        return payload
+
+
+def label_counts(
+    auth: AuthConfig,
+    user_id: str = "me",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[dict[str, object]]:
+    listing = gmail.list_labels(auth, user_id=user_id)
+    labels = listing.get("labels", [])
+    if not isinstance(labels, list):
+        message = "Invalid gmail labels response"
+        raise ValueError(message)
+    names = {
+        item["id"]: item.get("name", "")
+        for item in labels
+        if isinstance(item, dict) and isinstance(item.get("id"), str)
+    }
+    results = fan_out(
+        lambda label_id: gmail.get_label(auth, label_id, user_id=user_id),
+        list(names),
+        max_workers=max_workers,
+    )
+    return [_label_row(result, names[result.item]) for result in results]
+
+
+def _label_row(result: ItemResult[str, Mapping[str, object]], name: object) -> dict[str, object]:
+    if result.value is None:
+        error = result.error.to_payload() if result.error is not None else {}
+        return {"id": result.item, "name": name, "error": error}
+    return {
+        "id": result.value.get("id", result.item),
+        "name": result.value.get("name", name),
+        **{key: result.value.get(key, 0) for key in LABEL_COUNT_FIELDS},
+    }
+
+
+def collect_columns(
+    auth: AuthConfig,
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    max_messages: int | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> MessageColumns:
+    columns = MessageColumns()
+    list_params: dict[str, Sequence[str] | str] = {"maxResults": LIST_PAGE_SIZE, **(params or {})}
+    metadata_params: dict[str, Sequence[str] | str] = {
+        "format": "metadata",
+        "metadataHeaders": ["From"],
+        "fields": "id,internalDate,payload/headers",
+    }
+    while max_messages is None or len(columns) < max_messages:
+        page = gmail.list_messages(auth, user_id=user_id, params=list_params)
+        message_ids = [
+            item["id"]
+            for item in page.get("messages", []) or []
+            if isinstance(item, dict) and isinstance(item.get("id"), str)
+        ]
+        if max_messages is not None:
+            message_ids = message_ids[: max_messages - len(columns)]
+        results = fan_out(
+            lambda message_id: gmail.get_message(
+                auth,
+                message_id,
+                user_id=user_id,
+                params=metadata_params,
+            ),
+            message_ids,
+            max_workers=max_workers,
+        )
+        columns.extend(result.value for result in results if result.value is not None)
+        columns.failed += sum(result.error is not None for result in results)
+        token = page.get("nextPageToken")
+        if not isinstance(token, str) or not token:
+            break
+        list_params = {**list_params, "pageToken": token}
+    return columns
+
+
+def summarize(
+    columns: MessageColumns,
+    labels: list[dict[str, object]] | None = None,
+    top: int = DEFAULT_TOP,
+    bucket: str = "day",
+) -> MailboxStats:
+    if bucket not in DATE_BUCKETS:
+        message = f"Unknown date bucket: {bucket}"
+        raise ValueError(message)
+    sender_counts = _bincount(columns.senders, len(columns.sender_names))
+    domain_names: list[str] = []
+    domain_codes: dict[str, int] = {}
+    sender_domains = array("I")
+    for sender in columns.sender_names:
+        domain = sender.rpartition("@")[2]
+        code = domain_codes.get(domain)
+        if code is None:
+            code = len(domain_names)
+            domain_codes[domain] = code
+            domain_names.append(domain)
+        sender_domains.append(code)
+    domain_counts = _bincount(_take(sender_domains, columns.senders), len(domain_names))
+    return MailboxStats(
+        messages=len(columns),
+        labels=labels or [],
+        senders=_top(columns.sender_names, sender_counts, top),
+        domains=_top(domain_names, domain_counts, top),
+        dates=_date_histogram(columns.days, bucket),
+        failed=columns.failed,
+    )
+
+
+def mailbox_stats(
+    auth: AuthConfig,
+    user_id: str = "me",
+    params: Mapping[str, Sequence[str] | str] | None = None,
+    max_messages: int | None = None,
+    top: int = DEFAULT_TOP,
+    bucket: str = "day",
+    include_labels: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> MailboxStats:
+    labels = label_counts(auth, user_id, max_workers) if include_labels else []
+    columns = collect_columns(auth, user_id, params, max_messages, max_workers)
+    return summarize(columns, labels, top=top, bucket=bucket)
+
+
+def _bincount(codes: Sequence[int], size: int) -> list[int]:
+    if numpy is not None:
+        return numpy.bincount(numpy.asarray(codes, dtype=numpy.int64), minlength=size).tolist()
+    counts = [0] * size
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def _take(table: array, codes: array) -> Sequence[int]:
+    if numpy is not None:
+        return numpy.asarray(table, dtype=numpy.int64)[numpy.asarray(codes, dtype=numpy.int64)]
+    return array("I", (table[code] for code in codes))
+
+
+def _top(names: Sequence[str], counts: Sequence[int], top: int) -> list[tuple[str, int]]:
+    ranked = heapq.nsmallest(top, range(len(names)), key=lambda index: (-counts[index], names[index]))
+    return [(names[index], counts[index]) for index in ranked if counts[index]]
+
+
+def _date_histogram(days: array, bucket: str) -> list[tuple[str, int]]:
+    if numpy is not None and len(days):
+        unique, counts = numpy.unique(numpy.asarray(days, dtype=numpy.int64), return_counts=True)
+        per_day = zip(unique.tolist(), counts.tolist())
+    else:
+        day_counts: dict[int, int] = {}
+        for day in days:
+            day_counts[day] = day_counts.get(day, 0) + 1
+        per_day = sorted(day_counts.items())
+    histogram: dict[str, int] = {}
+    for day, count in per_day:
+        label = _date_label(day, bucket)
+        histogram[label] = histogram.get(label, 0) + count
+    return sorted(histogram.items())
+
+
+def _date_label(day: int, bucket: str) -> str:
+    date = datetime.fromtimestamp(day * SECONDS_PER_DAY, tz=timezone.utc).date()
+    if bucket == "year":
+        return f"{date.year:04d}"
+    if bucket == "month":
+        return f"{date.year:04d}-{date.month:02d}"
+    return date.isoformat()
+
+
+def _sender(message: Mapping[str, object]) -> str:
+    root = message.get("payload", {})
+    headers = root.get("headers", []) if isinstance(root, dict) else []
+    for header in headers if isinstance(headers, list) else []:
+        if isinstance(header, dict) and str(header.get("name", "")).lower() == "from":
+            value = header.get("value")
+            address = parseaddr(value)[1] if isinstance(value, str) else ""
+            return address.lower()
+    return ""
+
+
+def _internal_date(message: Mapping[str, object]) -> int:
+    internal_date = message.get("internalDate", 0)
+    try:
+        return int(internal_date) if isinstance(internal_date, (str, int)) else 0
+    except ValueError:
+        return 0
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import codecs
+from collections.abc import Iterable, Iterator
+import json
+from types import TracebackType
+
+WHITESPACE = " \t\r\n"
+
+
+class ItemStream:
+    def __init__(self, chunks: Iterable[bytes], items_key: str) -> None:
+        self.items_key = items_key
+        self._chunks = iter(chunks)
+        self._parser = _Parser(self._chunks)
+        self._page: dict[str, object] | None = None
+        self._started = False
+
+    def __iter__(self) -> Iterator[object]:
+        if self._started:
+            message = "ItemStream can only be iterated once"
+            raise RuntimeError(message)
+        self._started = True
+        page: dict[str, object] = {}
+        yield from self._parser.items(self.items_key, page)
+        self._page = page
+
+    def __enter__(self) -> ItemStream:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def page(self) -> dict[str, object]:
+        if self._page is None:
+            message = "Page fields are available after every item has been read"
+            raise RuntimeError(message)
+        return self._page
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+
+class _Parser:
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def items(self, items_key: str, page: dict[str, object]) -> Iterator[object]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                message = "Expected object key in JSON response"
+                raise ValueError(message)
+            self._expect(":")
+            if key == items_key and self._peek() == "[":
+                self._pos += 1
+                yield from self._array()
+            else:
+                page[key] = self._value()
+            if self._next_separator("}"):
+                return
+
+    def _array(self) -> Iterator[object]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._next_separator("]"):
+                return
+
+    def _next_separator(self, closing: str) -> bool:
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            message = f"Expected ',' or {closing!r} in JSON response"
+            raise ValueError(message)
+        return False
+
+    def _value(self) -> object:
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            message = f"Expected {char!r} in JSON response"
+            raise ValueError(message)
+        self._pos += 1
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                message = "Unexpected end of JSON response"
+                raise ValueError(message)
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._text.decode(b"", final=True)
+        else:
+            text = self._text.decode(chunk)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return chunk is not None or bool(text)
@@ -0,0 +1,760 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from wolper_google import endpoints
+
+GMAIL_PREFIX = "/gmail/v1/users"
+CALENDAR_PREFIX = "/calendar/v3"
+DEFAULT_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+GMAIL_PAGE_SIZE = 100
+GMAIL_MAX_PAGE_SIZE = 500
+CALENDAR_PAGE_SIZE = 250
+CALENDAR_MAX_PAGE_SIZE = 2500
+LISTEN_BACKLOG = 128
+HISTORY_KEYS = {"messageAdded": "messagesAdded", "messageDeleted": "messagesDeleted"}
+SYSTEM_LABELS = ("INBOX", "UNREAD", "IMPORTANT", "SENT", "STARRED")
+RECURRENCE_RULES = (
+    "RRULE:FREQ=DAILY;COUNT=30",
+    "RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR",
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;COUNT=26",
+    "RRULE:FREQ=MONTHLY;BYMONTHDAY=15",
+)
+WORDS = (
+    "quarterly", "review", "invoice", "launch", "sync", "roadmap", "budget", "offsite",
+    "design", "hiring", "release", "incident", "customer", "contract", "update", "planning",
+)
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status: int, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class SyntheticMessage:
+    message_id: str
+    thread_id: str
+    internal_date: int
+    sender: str
+    recipient: str
+    subject: str
+    label_ids: tuple[str, ...]
+    body: str
+    attachment_size: int
+    history_id: int
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    history_id: int
+    kind: str
+    message: SyntheticMessage
+
+
+class SyntheticMailbox:
+    def __init__(self, email_address: str = "user@example.com", seed: int = 0) -> None:
+        self.email_address = email_address
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._messages: dict[str, SyntheticMessage] = {}
+        self._order: list[str] = []
+        self._threads: dict[str, list[str]] = {}
+        self._labels: dict[str, str] = {label: label for label in SYSTEM_LABELS}
+        self._history: list[HistoryRecord] = []
+        self.history_id = 1000
+        self.base_history_id = self.history_id
+
+    @classmethod
+    def generate(
+        cls,
+        messages: int = 1000,
+        thread_depth: int = 5,
+        attachment_ratio: float = 0.05,
+        attachment_size: int = 256 * 1024,
+        senders: int = 200,
+        labels: int = 20,
+        start: datetime = DEFAULT_START,
+        span_days: int = 365,
+        seed: int = 0,
+    ) -> SyntheticMailbox:
+        mailbox = cls(seed=seed)
+        rng = mailbox._random
+        for index in range(labels):
+            mailbox._labels[f"Label_{index}"] = f"Project {index}"
+        user_labels = [label for label in mailbox._labels if label.startswith("Label_")]
+        domains = ("example.com", "corp.test", "mail.test")
+        sender_pool = [f"sender{index}@{domains[index % 3]}" for index in range(senders)]
+        step_ms = max(1, span_days * 86400 * 1000 // max(1, messages))
+        timestamp = int(start.timestamp() * 1000)
+        open_threads: list[tuple[str, str, int]] = []
+        for index in range(messages):
+            timestamp += rng.randint(1, 2 * step_ms)
+            if open_threads and rng.random() < 0.6:
+                slot = rng.randrange(len(open_threads))
+                thread_id, subject, depth = open_threads[slot]
+                if depth + 1 >= thread_depth:
+                    open_threads.pop(slot)
+                else:
+                    open_threads[slot] = (thread_id, subject, depth + 1)
+                subject = f"Re: {subject}"
+            else:
+                thread_id = f"{timestamp:x}{index:05x}"
+                subject = " ".join(rng.sample(WORDS, 3)).capitalize()
+                open_threads.append((thread_id, subject, 1))
+            label_ids = ["INBOX"]
+            if rng.random() < 0.3:
+                label_ids.append("UNREAD")
+            if user_labels and rng.random() < 0.5:
+                label_ids.append(rng.choice(user_labels))
+            mailbox._insert(
+                SyntheticMessage(
+                    message_id=f"{timestamp:x}{index:06x}",
+                    thread_id=thread_id,
+                    internal_date=timestamp,
+                    sender=rng.choice(sender_pool),
+                    recipient=mailbox.email_address,
+                    subject=subject,
+                    label_ids=tuple(label_ids),
+                    body=" ".join(rng.choices(WORDS, k=rng.randint(20, 200))),
+                    attachment_size=attachment_size if rng.random() < attachment_ratio else 0,
+                    history_id=mailbox.history_id,
+                )
+            )
+        mailbox.base_history_id = mailbox.history_id
+        return mailbox
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._messages)
+
+    def add_message(
+        self,
+        sender: str,
+        subject: str,
+        body: str = "",
+        thread_id: str | None = None,
+        label_ids: Sequence[str] = ("INBOX", "UNREAD"),
+        attachment_size: int = 0,
+    ) -> SyntheticMessage:
+        with self._lock:
+            self.history_id += 1
+            timestamp = int(time.time() * 1000)
+            message_id = f"{timestamp:x}{len(self._order):06x}"
+            message = SyntheticMessage(
+                message_id=message_id,
+                thread_id=thread_id or message_id,
+                internal_date=timestamp,
+                sender=sender,
+                recipient=self.email_address,
+                subject=subject,
+                label_ids=tuple(label_ids),
+                body=body,
+                attachment_size=attachment_size,
+                history_id=self.history_id,
+            )
+            self._insert(message)
+            self._history.append(HistoryRecord(self.history_id, "messageAdded", message))
+            return message
+
+    def delete_message(self, message_id: str) -> None:
+        with self._lock:
+            message = self._messages.pop(message_id, None)
+            if message is None:
+                raise FakeHTTPError(404, "Not Found")
+            self._threads[message.thread_id].remove(message_id)
+            self.history_id += 1
+            self._history.append(HistoryRecord(self.history_id, "messageDeleted", message))
+
+    def profile(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "emailAddress": self.email_address,
+                "messagesTotal": len(self._messages),
+                "threadsTotal": sum(1 for ids in self._threads.values() if ids),
+                "historyId": str(self.history_id),
+            }
+
+    def list_labels(self) -> dict[str, object]:
+        with self._lock:
+            labels = list(self._labels.items())
+        return {
+            "labels": [
+                {"id": label_id, "name": name, "type": "system" if label_id in SYSTEM_LABELS else "user"}
+                for label_id, name in labels
+            ]
+        }
+
+    def get_label(self, label_id: str) -> dict[str, object]:
+        with self._lock:
+            if label_id not in self._labels:
+                raise FakeHTTPError(404, "Not Found")
+            messages = [item for item in self._messages.values() if label_id in item.label_ids]
+        threads = {item.thread_id for item in messages}
+        unread = [item for item in messages if "UNREAD" in item.label_ids]
+        return {
+            "id": label_id,
+            "name": self._labels[label_id],
+            "type": "system" if label_id in SYSTEM_LABELS else "user",
+            "messagesTotal": len(messages),
+            "messagesUnread": len(unread),
+            "threadsTotal": len(threads),
+            "threadsUnread": len({item.thread_id for item in unread}),
+        }
+
+    def list_messages(self, params: Mapping[str, list[str]]) -> dict[str, object]:
+        wanted = set(params.get("labelIds", []))
+        with self._lock:
+            ids, token, estimate = self._page(lambda message: wanted.issubset(message.label_ids), params)
+        payload: dict[str, object] = {
+            "messages": [{"id": item.message_id, "threadId": item.thread_id} for item in ids],
+            "resultSizeEstimate": estimate,
+        }
+        if token:
+            payload["nextPageToken"] = token
+        return payload
+
+    def list_threads(self, params: Mapping[str, list[str]]) -> dict[str, object]:
+        wanted = set(params.get("labelIds", []))
+        with self._lock:
+            ids, token, estimate = self._page(
+                lambda message: (
+                    wanted.issubset(message.label_ids)
+                    and self._threads[message.thread_id][-1] == message.message_id
+                ),
+                params,
+            )
+        payload: dict[str, object] = {
+            "threads": [
+                {"id": item.thread_id, "snippet": _snippet(item), "historyId": str(item.history_id)}
+                for item in ids
+            ],
+            "resultSizeEstimate": estimate,
+        }
+        if token:
+            payload["nextPageToken"] = token
+        return payload
+
+    def get_message(self, message_id: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        with self._lock:
+            message = self._messages.get(message_id)
+        if message is None:
+            raise FakeHTTPError(404, "Not Found")
+        return _message_payload(message, _first(params, "format", "full"), params.get("metadataHeaders"))
+
+    def get_thread(self, thread_id: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        with self._lock:
+            messages = [self._messages[message_id] for message_id in self._threads.get(thread_id, [])]
+        if not messages:
+            raise FakeHTTPError(404, "Not Found")
+        format_name = _first(params, "format", "full")
+        return {
+            "id": thread_id,
+            "historyId": str(max(item.history_id for item in messages)),
+            "messages": [
+                _message_payload(item, format_name, params.get("metadataHeaders")) for item in messages
+            ],
+        }
+
+    def get_attachment(self, message_id: str, attachment_id: str) -> dict[str, object]:
+        with self._lock:
+            message = self._messages.get(message_id)
+        if message is None or not message.attachment_size or attachment_id != _attachment_id(message):
+            raise FakeHTTPError(404, "Not Found")
+        data = _attachment_bytes(message)
+        return {"attachmentId": attachment_id, "size": len(data), "data": _b64url(data)}
+
+    def list_history(self, params: Mapping[str, list[str]]) -> dict[str, object]:
+        start = _first(params, "startHistoryId", "")
+        if not start.isdigit():
+            raise FakeHTTPError(400, "Bad Request")
+        start_id = int(start)
+        if start_id < self.base_history_id:
+            raise FakeHTTPError(404, "Not Found")
+        kinds = set(params.get("historyTypes", [])) or {"messageAdded", "messageDeleted"}
+        offset = _int_param(params, "pageToken", 0)
+        size = min(_int_param(params, "maxResults", GMAIL_PAGE_SIZE), GMAIL_MAX_PAGE_SIZE)
+        with self._lock:
+            records = [
+                record for record in self._history if record.history_id > start_id and record.kind in kinds
+            ]
+            history_id = self.history_id
+        page = records[offset : offset + size]
+        payload: dict[str, object] = {
+            "history": [_history_payload(record) for record in page],
+            "historyId": str(history_id),
+        }
+        if offset + size < len(records):
+            payload["nextPageToken"] = str(offset + size)
+        return payload
+
+    def _insert(self, message: SyntheticMessage) -> None:
+        self._messages[message.message_id] = message
+        self._order.append(message.message_id)
+        self._threads.setdefault(message.thread_id, []).append(message.message_id)
+
+    def _page(
+        self,
+        keep: Callable[[SyntheticMessage], bool],
+        params: Mapping[str, list[str]],
+    ) -> tuple[list[SyntheticMessage], str | None, int]:
+        offset = _int_param(params, "pageToken", 0)
+        size = min(_int_param(params, "maxResults", GMAIL_PAGE_SIZE), GMAIL_MAX_PAGE_SIZE)
+        selected: list[SyntheticMessage] = []
+        newest = len(self._order) - 1
+        for position in range(offset, len(self._order)):
+            message = self._messages.get(self._order[newest - position])
+            if message is None or not keep(message):
+                continue
+            if len(selected) == size:
+                return selected, str(position), len(self._messages)
+            selected.append(message)
+        return selected, None, len(self._messages)
+
+
+@dataclass(frozen=True)
+class SyntheticEvent:
+    event_id: str
+    calendar_id: str
+    summary: str
+    start: datetime
+    duration: timedelta
+    recurrence: str | None
+    updated: datetime
+    sequence: int = 0
+    status: str = "confirmed"
+    change: int = 0
+
+
+@dataclass
+class SyntheticCalendar:
+    calendars: dict[str, dict[str, SyntheticEvent]] = field(default_factory=dict)
+    time_zone: str = "UTC"
+    change: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self.base_change = self.change
+
+    @classmethod
+    def generate(
+        cls,
+        calendars: int = 3,
+        events: int = 1000,
+        recurring_ratio: float = 0.2,
+        start: datetime = DEFAULT_START,
+        span_days: int = 365,
+        seed: int = 0,
+    ) -> SyntheticCalendar:
+        rng = random.Random(seed)
+        store = cls()
+        for calendar_index in range(calendars):
+            calendar_id = "primary" if calendar_index == 0 else f"team{calendar_index}@group.calendar.test"
+            entries: dict[str, SyntheticEvent] = {}
+            for index in range(events):
+                event_start = start + timedelta(
+                    days=rng.randrange(span_days),
+                    hours=rng.randrange(8, 18),
+                    minutes=rng.choice((0, 15, 30, 45)),
+                )
+                store.change += 1
+                event_id = f"ev{calendar_index:02d}{index:07d}"
+                entries[event_id] = SyntheticEvent(
+                    event_id=event_id,
+                    calendar_id=calendar_id,
+                    summary=" ".join(rng.sample(WORDS, 2)).capitalize(),
+                    start=event_start,
+                    duration=timedelta(minutes=rng.choice((15, 30, 45, 60, 90))),
+                    recurrence=rng.choice(RECURRENCE_RULES) if rng.random() < recurring_ratio else None,
+                    updated=event_start - timedelta(days=7),
+                    change=store.change,
+                )
+            store.calendars[calendar_id] = entries
+        store.base_change = store.change
+        return store
+
+    def update_event(self, calendar_id: str, event_id: str, **changes: object) -> SyntheticEvent:
+        with self._lock:
+            event = self._event(calendar_id, event_id)
+            self.change += 1
+            updated = replace(
+                event,
+                **changes,  # type: ignore[arg-type]
+                sequence=event.sequence + 1,
+                updated=datetime.now(timezone.utc),
+                change=self.change,
+            )
+            self.calendars[calendar_id][event_id] = updated
+            return updated
+
+    def cancel_event(self, calendar_id: str, event_id: str) -> SyntheticEvent:
+        return self.update_event(calendar_id, event_id, status="cancelled")
+
+    def calendar_list(self) -> dict[str, object]:
+        return {
+            "kind": "calendar#calendarList",
+            "items": [
+                {
+                    "kind": "calendar#calendarListEntry",
+                    "id": calendar_id,
+                    "summary": calendar_id,
+                    "timeZone": self.time_zone,
+                    "accessRole": "owner",
+                    "primary": calendar_id == "primary",
+                }
+                for calendar_id in self.calendars
+            ],
+        }
+
+    def get_calendar(self, calendar_id: str) -> dict[str, object]:
+        if calendar_id not in self.calendars:
+            raise FakeHTTPError(404, "Not Found")
+        return {
+            "kind": "calendar#calendar",
+            "id": calendar_id,
+            "summary": calendar_id,
+            "timeZone": self.time_zone,
+        }
+
+    def get_event(self, calendar_id: str, event_id: str) -> dict[str, object]:
+        with self._lock:
+            event = self._event(calendar_id, event_id)
+        return _event_payload(event)
+
+    def list_events(self, calendar_id: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        offset = _int_param(params, "pageToken", 0)
+        size = min(_int_param(params, "maxResults", CALENDAR_PAGE_SIZE), CALENDAR_MAX_PAGE_SIZE)
+        with self._lock:
+            if calendar_id not in self.calendars:
+                raise FakeHTTPError(404, "Not Found")
+            events = list(self.calendars[calendar_id].values())
+            change = self.change
+        sync_token = _first(params, "syncToken", "")
+        if sync_token:
+            match = re.fullmatch(r"sync-(\d+)", sync_token)
+            if match is None or int(match.group(1)) > change:
+                raise FakeHTTPError(410, "Gone")
+            events = [event for event in events if event.change > int(match.group(1))]
+        else:
+            events = [event for event in events if event.status != "cancelled"]
+            time_min = _first(params, "timeMin", "")
+            time_max = _first(params, "timeMax", "")
+            if time_min:
+                lower = datetime.fromisoformat(time_min)
+                events = [
+                    event for event in events if event.recurrence or event.start + event.duration > lower
+                ]
+            if time_max:
+                upper = datetime.fromisoformat(time_max)
+                events = [event for event in events if event.start < upper]
+            if _first(params, "orderBy", "") == "startTime":
+                events.sort(key=lambda event: (event.start, event.event_id))
+        payload: dict[str, object] = {
+            "kind": "calendar#events",
+            "summary": calendar_id,
+            "timeZone": self.time_zone,
+            "items": [_event_payload(event) for event in events[offset : offset + size]],
+        }
+        if offset + size < len(events):
+            payload["nextPageToken"] = str(offset + size)
+        else:
+            payload["nextSyncToken"] = f"sync-{change}"
+        return payload
+
+    def _event(self, calendar_id: str, event_id: str) -> SyntheticEvent:
+        event = self.calendars.get(calendar_id, {}).get(event_id)
+        if event is None:
+            raise FakeHTTPError(404, "Not Found")
+        return event
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class FakeGoogleServer:
+    def __init__(
+        self,
+        mailbox: SyntheticMailbox | None = None,
+        calendar: SyntheticCalendar | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+    ) -> None:
+        self.mailbox = mailbox or SyntheticMailbox()
+        self.calendar = calendar or SyntheticCalendar()
+        self.latency = latency
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), self._request_handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_bases(self) -> dict[str, str]:
+        return {"gmail": f"{self.url}{GMAIL_PREFIX}", "calendar": f"{self.url}{CALENDAR_PREFIX}"}
+
+    def start(self) -> FakeGoogleServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> FakeGoogleServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def route(self, path: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        if path.startswith(GMAIL_PREFIX):
+            return self._gmail(path[len(GMAIL_PREFIX) :], params)
+        if path.startswith(CALENDAR_PREFIX):
+            return self._calendar(path[len(CALENDAR_PREFIX) :], params)
+        raise FakeHTTPError(404, "Not Found")
+
+    def _gmail(self, path: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        mailbox = self.mailbox
+        match parts[1:]:
+            case ["profile"]:
+                return mailbox.profile()
+            case ["labels"]:
+                return mailbox.list_labels()
+            case ["labels", label_id]:
+                return mailbox.get_label(label_id)
+            case ["messages"]:
+                return mailbox.list_messages(params)
+            case ["messages", message_id]:
+                return mailbox.get_message(message_id, params)
+            case ["messages", message_id, "attachments", attachment_id]:
+                return mailbox.get_attachment(message_id, attachment_id)
+            case ["threads"]:
+                return mailbox.list_threads(params)
+            case ["threads", thread_id]:
+                return mailbox.get_thread(thread_id, params)
+            case ["history"]:
+                return mailbox.list_history(params)
+        raise FakeHTTPError(404, "Not Found")
+
+    def _calendar(self, path: str, params: Mapping[str, list[str]]) -> dict[str, object]:
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        calendar = self.calendar
+        match parts:
+            case ["users", "me", "calendarList"]:
+                return calendar.calendar_list()
+            case ["calendars", calendar_id]:
+                return calendar.get_calendar(calendar_id)
+            case ["calendars", calendar_id, "events"]:
+                return calendar.list_events(calendar_id, params)
+            case ["calendars", calendar_id, "events", event_id]:
+                return calendar.get_event(calendar_id, event_id)
+        raise FakeHTTPError(404, "Not Found")
+
+    def _request_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                with server._requests_lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = urlsplit(self.path)
+                try:
+                    if not self.headers.get("Authorization", "").startswith("Bearer "):
+                        raise FakeHTTPError(401, "Unauthorized")
+                    payload = server.route(parts.path, parse_qs(parts.query))
+                    status = 200
+                except FakeHTTPError as exc:
+                    payload = {"error": {"code": exc.status, "message": exc.reason}}
+                    status = exc.status
+                body = json.dumps(payload).encode("utf-8")
+                compressed = "gzip" in self.headers.get("Accept-Encoding", "")
+                if compressed:
+                    body = gzip.compress(body, compresslevel=1)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                if compressed:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        return Handler
+
+
+@contextmanager
+def serve(
+    mailbox: SyntheticMailbox | None = None,
+    calendar: SyntheticCalendar | None = None,
+    latency: float = 0.0,
+) -> Iterator[FakeGoogleServer]:
+    with FakeGoogleServer(mailbox, calendar, latency=latency) as server:
+        with endpoints.api_bases(**server.api_bases):
+            yield server
+
+
+def _message_payload(
+    message: SyntheticMessage,
+    format_name: str,
+    metadata_headers: Sequence[str] | None,
+) -> dict[str, object]:
+    payload: dict[str, object] = {
+        "id": message.message_id,
+        "threadId": message.thread_id,
+        "labelIds": list(message.label_ids),
+        "snippet": _snippet(message),
+        "historyId": str(message.history_id),
+        "internalDate": str(message.internal_date),
+        "sizeEstimate": len(message.body) + message.attachment_size + 512,
+    }
+    if format_name == "minimal":
+        return payload
+    headers = _headers(message)
+    if format_name == "raw":
+        lines = [f"{header['name']}: {header['value']}" for header in headers]
+        payload["raw"] = _b64url(("\r\n".join(lines) + "\r\n\r\n" + message.body).encode("utf-8"))
+        return payload
+    if format_name == "metadata":
+        wanted = {name.lower() for name in metadata_headers or []}
+        payload["payload"] = {
+            "mimeType": "multipart/mixed" if message.attachment_size else "text/plain",
+            "headers": [header for header in headers if not wanted or header["name"].lower() in wanted],
+        }
+        return payload
+    text_part = {
+        "partId": "0",
+        "mimeType": "text/plain",
+        "filename": "",
+        "headers": [{"name": "Content-Type", "value": "text/plain; charset=UTF-8"}],
+        "body": {"size": len(message.body), "data": _b64url(message.body.encode("utf-8"))},
+    }
+    if not message.attachment_size:
+        payload["payload"] = {**text_part, "partId": "", "headers": headers + text_part["headers"]}
+        return payload
+    payload["payload"] = {
+        "partId": "",
+        "mimeType": "multipart/mixed",
+        "filename": "",
+        "headers": headers,
+        "body": {"size": 0},
+        "parts": [
+            text_part,
+            {
+                "partId": "1",
+                "mimeType": "application/octet-stream",
+                "filename": f"{message.message_id}.bin",
+                "headers": [{"name": "Content-Type", "value": "application/octet-stream"}],
+                "body": {"size": message.attachment_size, "attachmentId": _attachment_id(message)},
+            },
+        ],
+    }
+    return payload
+
+
+def _headers(message: SyntheticMessage) -> list[dict[str, str]]:
+    sent = datetime.fromtimestamp(message.internal_date / 1000, tz=timezone.utc)
+    return [
+        {"name": "From", "value": message.sender},
+        {"name": "To", "value": message.recipient},
+        {"name": "Subject", "value": message.subject},
+        {"name": "Date", "value": format_datetime(sent)},
+        {"name": "Message-ID", "value": f"<{message.message_id}@synthetic.test>"},
+    ]
+
+
+def _history_payload(record: HistoryRecord) -> dict[str, object]:
+    reference = {
+        "id": record.message.message_id,
+        "threadId": record.message.thread_id,
+        "labelIds": list(record.message.label_ids),
+    }
+    return {
+        "id": str(record.history_id),
+        "messages": [reference],
+        HISTORY_KEYS[record.kind]: [{"message": reference}],
+    }
+
+
+def _event_payload(event: SyntheticEvent) -> dict[str, object]:
+    payload: dict[str, object] = {
+        "kind": "calendar#event",
+        "id": event.event_id,
+        "status": event.status,
+        "summary": event.summary,
+        "iCalUID": f"{event.event_id}@synthetic.test",
+        "sequence": event.sequence,
+        "updated": event.updated.isoformat().replace("+00:00", "Z"),
+        "start": {"dateTime": event.start.isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": (event.start + event.duration).isoformat(), "timeZone": "UTC"},
+        "organizer": {"email": event.calendar_id, "self": True},
+    }
+    if event.recurrence:
+        payload["recurrence"] = [event.recurrence]
+    return payload
+
+
+def _snippet(message: SyntheticMessage) -> str:
+    return message.body[:100]
+
+
+def _attachment_id(message: SyntheticMessage) -> str:
+    return f"att-{message.message_id}"
+
+
+def _attachment_bytes(message: SyntheticMessage) -> bytes:
+    seed = hashlib.sha256(message.message_id.encode("ascii")).digest()
+    return (seed * (message.attachment_size // len(seed) + 1))[: message.attachment_size]
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _first(params: Mapping[str, list[str]], name: str, default: str) -> str:
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _int_param(params: Mapping[str, list[str]], name: str, default: int) -> int:
+    value = _first(params, name, "")
+    if not value:
+        return default
+    if not value.isdigit():
+        raise FakeHTTPError(400, f"Invalid value for {name}: {value}")
+    return int(value)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+from typing import Mapping, Sequence
+from urllib.error import HTTPError
+
+from wolper_google.auth import AuthConfig
+from wolper_google import gmail
+from wolper_google.concurrency import DEFAULT_MAX_WORKERS, fan_out
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+
+@dataclass
+class CachedThread:
+    thread_id: str
+    history_id: str
+    messages: dict[str, Mapping[str, object]] = field(default_factory=dict)
+    params: dict[str, list[str]] = field(default_factory=dict)
+
+    def conversation(self) -> list[Mapping[str, object]]:
+        return sorted(self.messages.values(), key=_message_order)
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "id": self.thread_id,
+            "historyId": self.history_id,
+            "messages": self.conversation(),
+        }
+
+
+@dataclass
+class _ThreadDelta:
+    added: list[str] = field(default_factory=list)
+    deleted: set[str] = field(default_factory=set)
+    labels: list[tuple[str, list[str], list[str]]] = field(default_factory=list)
+    history_id: str = ""
+
+
+class ThreadCache:
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._path = Path(path).expanduser() if path is not None else None
+        self._threads: dict[str, CachedThread] = {}
+        if self._path is not None and self._path.exists():
+            self._load(self._path)
+
+    def get(self, thread_id: str) -> CachedThread | None:
+        return self._threads.get(thread_id)
+
+    def refresh(
+        self,
+        auth: AuthConfig,
+        thread_id: str,
+        user_id: str = "me",
+        params: Mapping[str, Sequence[str] | str] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> CachedThread:
+        cached = self._threads.get(thread_id)
+        if cached is None or cached.params != _request_params(params):
+            return self._fetch_full(auth, thread_id, user_id, params)
+        try:
+            delta = _thread_delta(auth, cached, user_id)
+        except HTTPError as exc:
+            if exc.code != 404:
+                raise
+            return self._fetch_full(auth, thread_id, user_id, params)
+        for message_id in delta.deleted:
+            cached.messages.pop(message_id, None)
+        for message_id, added_labels, removed_labels in delta.labels:
+            message = cached.messages.get(message_id)
+            if message is not None:
+                cached.messages[message_id] = _relabel(message, added_labels, removed_labels)
+        missing = [message_id for message_id in delta.added if message_id not in cached.messages]
+        results = fan_out(
+            lambda message_id: gmail.get_message(auth, message_id, user_id=user_id, params=params),
+            missing,
+            max_workers=max_workers,
+        )
+        incomplete = False
+        for result in results:
+            if result.error is not None:
+                incomplete = incomplete or result.error.status != 404
+            elif result.value is not None:
+                cached.messages[result.item] = result.value
+        if delta.history_id and not incomplete:
+            cached.history_id = delta.history_id
+        return cached
+
+    def save(self) -> None:
+        if self._path is None:
+            return
+        payload = {
+            "threads": {
+                thread_id: {
+                    "historyId": cached.history_id,
+                    "messages": list(cached.messages.values()),
+                    "params": cached.params,
+                }
+                for thread_id, cached in self._threads.items()
+            }
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_name(f"{self._path.name}.tmp")
+        temp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temp_path, self._path)
+
+    def _fetch_full(
+        self,
+        auth: AuthConfig,
+        thread_id: str,
+        user_id: str,
+        params: Mapping[str, Sequence[str] | str] | None,
+    ) -> CachedThread:
+        payload = gmail.get_thread(auth, thread_id, user_id=user_id, params=params)
+        history_id = payload.get("historyId", "")
+        cached = CachedThread(
+            thread_id=thread_id,
+            history_id=history_id if isinstance(history_id, str) else "",
+            params=_request_params(params),
+        )
+        for message in _messages(payload):
+            cached.messages[message["id"]] = message
+        self._threads[thread_id] = cached
+        return cached
+
+    def _load(self, path: Path) -> None:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        threads = payload.get("threads", {}) if isinstance(payload, dict) else {}
+        if not isinstance(threads, dict):
+            message = f"Invalid thread cache file: {path}"
+            raise ValueError(message)
+        for thread_id, entry in threads.items():
+            if not isinstance(entry, dict):
+                continue
+            history_id = entry.get("historyId", "")
+            params = entry.get("params", {})
+            cached = CachedThread(
+                thread_id=thread_id,
+                history_id=history_id if isinstance(history_id, str) else "",
+                params=_request_params(params if isinstance(params, dict) else {}),
+            )
+            for message in _messages(entry):
+                cached.messages[message["id"]] = message
+            self._threads[thread_id] = cached
+
+
+def _request_params(params: Mapping[str, Sequence[str] | str] | None) -> dict[str, list[str]]:
+    return {
+        name: [value] if isinstance(value, str) else sorted(str(item) for item in value)
+        for name, value in sorted((params or {}).items())
+    }
+
+
+def _thread_delta(
+    auth: AuthConfig,
+    cached: CachedThread,
+    user_id: str,
+) -> _ThreadDelta:
+    delta = _ThreadDelta()
+    params: dict[str, Sequence[str] | str] = {"historyTypes": HISTORY_TYPES}
+    while True:
+        page = gmail.list_history(
+            auth,
+            start_history_id=cached.history_id,
+            user_id=user_id,
+            params=params,
+        )
+        for record in _records(page):
+            thread_id = cached.thread_id
+            delta.added.extend(_thread_message_ids(record.get("messagesAdded"), thread_id))
+            delta.deleted.update(_thread_message_ids(record.get("messagesDeleted"), thread_id))
+            for message_id, labels in _thread_label_changes(record.get("labelsAdded"), thread_id):
+                delta.labels.append((message_id, labels, []))
+            for message_id, labels in _thread_label_changes(record.get("labelsRemoved"), thread_id):
+                delta.labels.append((message_id, [], labels))
+        page_history_id = page.get("historyId")
+        if isinstance(page_history_id, str):
+            delta.history_id = page_history_id
+        token = page.get("nextPageToken")
+        if not isinstance(token, str) or not token:
+            break
+        params = {"historyTypes": HISTORY_TYPES, "pageToken": token}
+    delta.added = [message_id for message_id in delta.added if message_id not in delta.deleted]
+    return delta
+
+
+def _records(page: Mapping[str, object]) -> list[Mapping[str, object]]:
+    history = page.get("history", [])
+    if not isinstance(history, list):
+        message = "Invalid gmail history response"
+        raise ValueError(message)
+    return [record for record in history if isinstance(record, dict)]
+
+
+def _thread_message_ids(changes: object, thread_id: str) -> list[str]:
+    message_ids: list[str] = []
+    if not isinstance(changes, list):
+        return message_ids
+    for change in changes:
+        message = change.get("message") if isinstance(change, dict) else None
+        if not isinstance(message, dict) or message.get("threadId") != thread_id:
+            continue
+        message_id = message.get("id")
+        if isinstance(message_id, str):
+            message_ids.append(message_id)
+    return message_ids
+
+
+def _thread_label_changes(changes: object, thread_id: str) -> list[tuple[str, list[str]]]:
+    label_changes: list[tuple[str, list[str]]] = []
+    if not isinstance(changes, list):
+        return label_changes
+    for change in changes:
+        if not isinstance(change, dict):
+            continue
+        label_ids = change.get("labelIds")
+        if not isinstance(label_ids, list):
+            continue
+        labels = [label for label in label_ids if isinstance(label, str)]
+        for message_id in _thread_message_ids([change], thread_id):
+            label_changes.append((message_id, labels))
+    return label_changes
+
+
+def _relabel(
+    message: Mapping[str, object],
+    added: Sequence[str],
+    removed: Sequence[str],
+) -> Mapping[str, object]:
+    current = message.get("labelIds", [])
+    label_ids = [label for label in current or [] if label not in removed]
+    label_ids.extend(label for label in added if label not in label_ids)
+    return {**message, "labelIds": label_ids}
+
+
+def _messages(payload: Mapping[str, object]) -> list[Mapping[str, object]]:
+    messages = payload.get("messages", [])
+    if not isinstance(messages, list):
+        message = "Invalid gmail thread response"
+        raise ValueError(message)
+    return [
+        item for item in messages if isinstance(item, dict) and isinstance(item.get("id"), str)
+    ]
+
+
+def _message_order(message: Mapping[str, object]) -> tuple[int, str]:
+    internal_date = message.get("internalDate", "0")
+    try:
+        timestamp = int(internal_date) if isinstance(internal_date, (str, int)) else 0
+    except ValueError:
+        timestamp = 0
+    message_id = message.get("id", "")
+    return timestamp, message_id if isinstance(message_id, str) else ""